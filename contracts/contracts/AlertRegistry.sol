@@ -25,6 +25,13 @@ contract AlertRegistry {
         bool verified;         // Whether alert was reviewed
     }
 
+    struct AlertBatch {
+        bytes32 merkleRoot;    // Root over keccak256(txHash, riskScore) leaves
+        address reporter;      // Backend / system address
+        uint32 alertCount;     // Alerts covered by the root
+        uint64 timestamp;      // When the batch was anchored
+    }
+
     /*//////////////////////////////////////////////////////////////
                                 STORAGE
     //////////////////////////////////////////////////////////////*/
@@ -38,6 +45,15 @@ contract AlertRegistry {
     // Total number of alerts
     uint256 public alertCount;
 
+    // Anchored alert batches (one Merkle root per window of alerts)
+    mapping(uint256 => AlertBatch) public alertBatches;
+
+    // Root => batchId + 1 (0 = not anchored)
+    mapping(bytes32 => uint256) public batchOfRoot;
+
+    // Total number of anchored batches
+    uint256 public batchCount;
+
     // Admin who can verify alerts
     address public owner;
 
@@ -52,6 +68,13 @@ contract AlertRegistry {
         address indexed reporter
     );
 
+    event AlertBatchAnchored(
+        uint256 indexed batchId,
+        bytes32 indexed merkleRoot,
+        uint32 alertCount,
+        address indexed reporter
+    );
+
     event AlertVerified(
         uint256 indexed alertId,
         bool isAttack
@@ -109,6 +132,39 @@ contract AlertRegistry {
         return alertId;
     }
 
+    /**
+     * @notice Anchor a whole window of alerts with one Merkle root
+     * @dev Leaves are keccak256(abi.encodePacked(txHash, riskScore)) with
+     *      txHash / riskScore encoded exactly as for createAlert; pairs are
+     *      hashed in sorted order, so proofs need no position bits
+     * @param _merkleRoot Root of the window's alert tree
+     * @param _alertCount Number of alerts (leaves) in the tree
+     */
+    function anchorAlertBatch(
+        bytes32 _merkleRoot,
+        uint32 _alertCount
+    ) external returns (uint256) {
+        require(_merkleRoot != bytes32(0), "Empty root");
+        require(_alertCount > 0, "Empty batch");
+        require(batchOfRoot[_merkleRoot] == 0, "Batch already anchored");
+
+        uint256 batchId = batchCount;
+
+        alertBatches[batchId] = AlertBatch({
+            merkleRoot: _merkleRoot,
+            reporter: msg.sender,
+            alertCount: _alertCount,
+            timestamp: uint64(block.timestamp)
+        });
+
+        batchOfRoot[_merkleRoot] = batchId + 1;
+        batchCount++;
+
+        emit AlertBatchAnchored(batchId, _merkleRoot, _alertCount, msg.sender);
+
+        return batchId;
+    }
+
     /**
      * @notice Verify an existing alert
      * @dev Only trusted authority can verify
@@ -137,6 +193,34 @@ contract AlertRegistry {
         return isFlagged[_txHash];
     }
 
+    /**
+     * @notice Check that an alert is included in an anchored batch
+     * @param _merkleRoot Root the alert was anchored under
+     * @param _txHash Transaction hash (as passed to createAlert)
+     * @param _riskScore Risk score (0–100)
+     * @param _proof Sibling hashes from leaf to root
+     */
+    function verifyBatchedAlert(
+        bytes32 _merkleRoot,
+        bytes32 _txHash,
+        uint8 _riskScore,
+        bytes32[] calldata _proof
+    ) external view returns (bool) {
+        if (batchOfRoot[_merkleRoot] == 0) {
+            return false;
+        }
+
+        bytes32 node = keccak256(abi.encodePacked(_txHash, _riskScore));
+        for (uint256 i = 0; i < _proof.length; i++) {
+            bytes32 sibling = _proof[i];
+            node = node < sibling
+                ? keccak256(abi.encodePacked(node, sibling))
+                : keccak256(abi.encodePacked(sibling, node));
+        }
+
+        return node == _merkleRoot;
+    }
+
     /**
      * @notice Transfer verification authority
      */
@@ -1,37 +1,57 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
 
+from web3 import Web3
+
 from app.db.database import DatabaseService
 from app.schemas.models import RiskLevel
+from app.web3.merkle import alert_leaf, contract_risk_score, verify_proof
 
 router = APIRouter(prefix="/alerts", tags=["Alerts"])
 
 db_service = DatabaseService()
 
+MAX_PAGE_SIZE = 1000
+
 
 @router.get("")
 def get_alerts(
-    page: int = 1,
-    page_size: int = 100,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
     wallet_address: Optional[str] = None,
     risk_level: Optional[RiskLevel] = None,
+    cursor: Optional[str] = None,
 ):
-    skip = (page - 1) * page_size
+    """
+    List alerts, newest first
 
-    alerts = db_service.get_alerts(
-        skip=skip,
-        limit=page_size,
-        wallet_address=wallet_address,
-        risk_level=risk_level,
-    )
+    Pass `next_cursor` from the previous response as `cursor` to page
+    with keyset pagination (flat cost at any depth). `page` is kept for
+    backwards compatibility and falls back to OFFSET when > 1.
+    """
+    next_cursor = None
 
-    total = len(
-        db_service.get_alerts(
-            skip=0,
-            limit=10_000,
+    if cursor or page == 1:
+        try:
+            alerts, next_cursor = db_service.get_alerts_page(
+                limit=page_size,
+                wallet_address=wallet_address,
+                risk_level=risk_level,
+                cursor=cursor,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        alerts = db_service.get_alerts(
+            skip=(page - 1) * page_size,
+            limit=page_size,
             wallet_address=wallet_address,
             risk_level=risk_level,
         )
+
+    total = db_service.count_alerts(
+        wallet_address=wallet_address,
+        risk_level=risk_level,
     )
 
     return {
@@ -39,6 +59,7 @@ def get_alerts(
         "total": total,
         "page": page,
         "page_size": page_size,
+        "next_cursor": next_cursor,
     }
 
 
@@ -57,3 +78,40 @@ def get_alert_stats():
             status_code=500,
             detail=f"Failed to fetch stats: {str(e)}",
         )
+
+
+@router.get("/{alert_id}/proof")
+def get_alert_proof(alert_id: int):
+    """
+    Merkle inclusion proof of an alert anchored in a batch, verified
+    offline: the leaf is recomputed from the stored alert and folded
+    with the proof up to the anchored root (no RPC involved)
+    `valid` only checks the proof against its root; `anchored` says the
+    root's anchorAlertBatch transaction was mined
+    """
+    alert = db_service.get_alert_by_id(alert_id)
+    if alert is None:
+        raise HTTPException(status_code=404, detail="Alert not found")
+
+    proof = db_service.get_alert_proof(alert_id)
+    if proof is None:
+        raise HTTPException(status_code=404, detail="Alert was not anchored in a Merkle batch")
+
+    leaf = alert_leaf(alert.tx_hash or "unknown", alert.risk_score)
+    valid = verify_proof(
+        leaf,
+        [Web3.to_bytes(hexstr=h) for h in proof["proof"]],
+        Web3.to_bytes(hexstr=proof["merkle_root"]),
+    )
+
+    return {
+        "alert_id": alert_id,
+        "tx_hash": alert.tx_hash,
+        "risk_score": contract_risk_score(alert.risk_score),
+        "leaf": Web3.to_hex(leaf),
+        **proof,
+        "valid": valid,
+        # Set once the anchorAlertBatch transaction is mined
+        "anchored": alert.on_chain_tx_hash is not None,
+        "on_chain_tx_hash": alert.on_chain_tx_hash,
+    }
@@ -0,0 +1,148 @@
+"""
+Columnar Batch Format
+Binary /predict/batch: a .npy feature matrix in, .npz score columns out
+No JSON objects or pydantic models per row on either side
+"""
+import io
+from typing import Optional
+
+import numpy as np
+
+from app.ml.model_loader import FEATURES
+from app.services.scoring import RISK_LEVELS, ScoredBatch
+
+NPY_CONTENT_TYPE = "application/x-npy"
+NPZ_CONTENT_TYPE = "application/x-npz"
+
+# Accepted matrix dtypes (little-endian, as np.save writes them)
+MATRIX_DTYPES = (np.dtype("<f4"), np.dtype("<f8"))
+
+# Column positions in the matrix (FEATURES order)
+AMOUNT_USD = FEATURES.index("amount_usd")
+TX_COUNT_USER = FEATURES.index("tx_count_user")
+ROLLING_VOLUME_USER = FEATURES.index("rolling_volume_user")
+RELATIVE_AMOUNT = FEATURES.index("relative_amount")
+
+
+def decode_feature_matrix(body: bytes, max_rows: int) -> np.ndarray:
+    """
+    .npy bytes -> (n, len(FEATURES)) matrix viewing the request body (no copy)
+
+    Columns in FEATURES order, float32 or float64, C order. Raises
+    ValueError for anything else and for values a PredictRequest rejects.
+    """
+    stream = io.BytesIO(body)
+    try:
+        version = np.lib.format.read_magic(stream)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(stream)
+        elif version == (2, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(stream)
+        else:
+            raise ValueError(f"unsupported .npy version {version}")
+    except ValueError as e:
+        raise ValueError(f"Invalid .npy body: {e}")
+
+    if dtype not in MATRIX_DTYPES:
+        raise ValueError(f"Feature matrix must be float32 or float64, got {dtype}")
+    if fortran_order:
+        raise ValueError("Feature matrix must be C-ordered")
+    if len(shape) != 2 or shape[1] != len(FEATURES):
+        raise ValueError(
+            f"Feature matrix must have shape (n, {len(FEATURES)}) "
+            f"[{', '.join(FEATURES)}], got {shape}"
+        )
+    n_rows = shape[0]
+    if not 0 < n_rows <= max_rows:
+        raise ValueError(f"Feature matrix must have 1 to {max_rows} rows, got {n_rows}")
+
+    offset = stream.tell()
+    size = n_rows * len(FEATURES)
+    if len(body) != offset + size * dtype.itemsize:
+        raise ValueError("Feature matrix body is truncated or has trailing bytes")
+
+    X = np.frombuffer(body, dtype=dtype, count=size, offset=offset).reshape(shape)
+    _validate_features(X)
+    return X
+
+
+def _validate_features(X: np.ndarray):
+    """
+    The PredictRequest field constraints, checked column-wise
+    """
+    invalid = ~np.isfinite(X).all(axis=1) | (X < 0).any(axis=1)
+    amount = X[:, AMOUNT_USD]
+    invalid |= (amount <= 0) | (amount > 1e12)
+    # An int in PredictRequest: scored and stored as the same whole number
+    tx_count = X[:, TX_COUNT_USER]
+    invalid |= tx_count != np.floor(tx_count)
+    if invalid.any():
+        row = int(np.argmax(invalid))
+        raise ValueError(
+            f"Row {row}: features must be finite and >= 0, "
+            f"amount_usd in (0, 1e12], tx_count_user a whole number "
+            f"- got {X[row].tolist()}"
+        )
+
+
+def encode_columns(
+    batch: ScoredBatch,
+    processing_time_ms: float,
+    contributions: Optional[np.ndarray] = None,
+) -> bytes:
+    """
+    ScoredBatch -> uncompressed .npz, one array per response column
+
+    risk_level holds indices into the risk_levels array; risk_percentile
+    is NaN when no calibration table is loaded. With contributions, adds
+    feature_contributions (n, n_features) and its column names
+    """
+    percentiles: Optional[np.ndarray] = batch.percentiles
+    if percentiles is None:
+        percentiles = np.full(len(batch), np.nan)
+
+    explained = (
+        {"feature_contributions": contributions, "feature_names": np.array(FEATURES)}
+        if contributions is not None else {}
+    )
+
+    buffer = io.BytesIO()
+    np.savez(
+        buffer,
+        risk_score=batch.risk_scores,
+        risk_level=batch.level_index.astype(np.uint8),
+        is_alert=batch.is_alert,
+        confidence=batch.confidence,
+        risk_percentile=percentiles,
+        risk_levels=np.array([level.value for level in RISK_LEVELS]),
+        threshold=batch.threshold,
+        total_processed=len(batch),
+        alerts_triggered=batch.alerts_count,
+        processing_time_ms=processing_time_ms,
+        **explained,
+    )
+    return buffer.getvalue()
+
+
+def transaction_values(X: np.ndarray) -> list:
+    """
+    DatabaseService.transaction_values() for each matrix row
+    (no hash / wallet in the columnar format)
+    """
+    return [
+        {
+            "tx_hash": None,
+            "wallet_address": None,
+            "amount_usd": amount_usd,
+            "whale_tx": 0,
+            "tx_count_user": int(tx_count_user),
+            "rolling_volume_user": rolling_volume_user,
+            "relative_amount": relative_amount,
+        }
+        for amount_usd, tx_count_user, rolling_volume_user, relative_amount in zip(
+            X[:, AMOUNT_USD].tolist(),
+            X[:, TX_COUNT_USER].tolist(),
+            X[:, ROLLING_VOLUME_USER].tolist(),
+            X[:, RELATIVE_AMOUNT].tolist(),
+        )
+    ]
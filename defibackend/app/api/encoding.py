@@ -0,0 +1,105 @@
+"""
+Response Encoding
+JSON bytes for /predict and /predict/batch straight from score arrays
+Same documents as PredictResponse / BatchPredictResponse, without a
+pydantic model per row or FastAPI's response_model re-validation
+"""
+import json
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from fastapi import Response
+
+from app.schemas.models import PredictResponse
+from app.services.scoring import ScoredBatch
+
+try:
+    import orjson
+except ImportError:  # Optional: stdlib json produces the same documents, slower
+    orjson = None
+
+
+def dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
+def encode_prediction(response: PredictResponse) -> bytes:
+    """
+    PredictResponse -> JSON (the /predict body)
+    """
+    return dumps({
+        "risk_score": response.risk_score,
+        "risk_level": response.risk_level.value,
+        "is_alert": response.is_alert,
+        "threshold": response.threshold,
+        "confidence": response.confidence,
+        "risk_percentile": response.risk_percentile,
+        "feature_contributions": response.feature_contributions,
+        "timestamp": response.timestamp.isoformat(),
+        "alert_tx_hash": response.alert_tx_hash,
+    })
+
+
+def prediction_documents(
+    batch: ScoredBatch,
+    timestamp: datetime,
+    contributions: Optional[List[Dict[str, float]]] = None,
+) -> List[dict]:
+    """
+    One PredictResponse-shaped dict per score (columns -> rows once)
+    """
+    # Shared by every row: formatted once
+    stamp = timestamp.isoformat()
+    threshold = batch.threshold
+    levels = [level.value for level in batch.risk_levels()]
+    percentiles = (
+        batch.percentiles.tolist() if batch.percentiles is not None
+        else [None] * len(batch)
+    )
+    if contributions is None:
+        contributions = [None] * len(batch)
+
+    return [
+        {
+            "risk_score": risk_score,
+            "risk_level": level,
+            "is_alert": is_alert,
+            "threshold": threshold,
+            "confidence": confidence,
+            "risk_percentile": percentile,
+            "feature_contributions": contribution,
+            "timestamp": stamp,
+            "alert_tx_hash": None,
+        }
+        for risk_score, level, is_alert, confidence, percentile, contribution in zip(
+            batch.risk_scores.tolist(),
+            levels,
+            batch.is_alert.tolist(),
+            batch.confidence.tolist(),
+            percentiles,
+            contributions,
+        )
+    ]
+
+
+def encode_batch_response(
+    batch: ScoredBatch,
+    timestamp: datetime,
+    processing_time_ms: float,
+    contributions: Optional[List[Dict[str, float]]] = None,
+) -> bytes:
+    """
+    ScoredBatch -> JSON (the /predict/batch body)
+    """
+    return dumps({
+        "predictions": prediction_documents(batch, timestamp, contributions),
+        "total_processed": len(batch),
+        "alerts_triggered": batch.alerts_count,
+        "processing_time_ms": processing_time_ms,
+    })
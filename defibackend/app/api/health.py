@@ -36,8 +36,9 @@ async def readiness_check():
     try:
         # Check ML components
         model_loader = ModelLoader()
-        checks["model_loaded"] = model_loader.model is not None
-        checks["scaler_loaded"] = model_loader.scaler is not None
+        # The compiled forest carries the scaler (pickles or mmap artifact)
+        checks["model_loaded"] = model_loader.engine is not None
+        checks["scaler_loaded"] = model_loader.engine.scale is not None
         
         # Check Web3 connection
         web3_client = Web3Client()
@@ -0,0 +1,40 @@
+"""
+Chain Ingestion Routes
+Status of the block / mempool follower that feeds scoring
+"""
+from fastapi import APIRouter
+
+from app.api.predict import db_service, score_requests
+from app.services.ingestion import ChainIngestor
+from app.web3.client import Web3Client
+from config.settings import settings
+
+router = APIRouter()
+
+chain_ingestor = None
+if settings.INGEST_ENABLED:
+    chain_ingestor = ChainIngestor(
+        Web3Client(settings.INGEST_RPC_URL or None),
+        score_batch=score_requests,
+        load_cursor=db_service.get_ingestion_cursor,
+        save_cursor=db_service.save_ingestion_cursor,
+        workers=settings.INGEST_WORKERS,
+        queue_size=settings.INGEST_QUEUE_SIZE,
+        batch_size=settings.INGEST_BATCH_SIZE,
+        batch_wait_ms=settings.INGEST_BATCH_WAIT_MS,
+        poll_interval=settings.INGEST_POLL_INTERVAL_SECONDS,
+        confirmations=settings.INGEST_CONFIRMATIONS,
+        start_block=settings.INGEST_START_BLOCK,
+        include_pending=settings.INGEST_PENDING_TX,
+        eth_price_usd=settings.INGEST_ETH_PRICE_USD,
+    )
+
+
+@router.get("/ingestion/status")
+async def get_ingestion_status():
+    """
+    Ingestion position (head, cursor, lag), queue depths and counters
+    """
+    if chain_ingestor is None:
+        return {"enabled": False}
+    return {"enabled": True, **chain_ingestor.get_metrics()}
@@ -4,8 +4,14 @@ ONLY HTTP logic - no ML here
 Orchestrates calls to inference and scoring services
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from datetime import datetime
+from typing import List, Union
+import asyncio
+import json
 import time
 
 from app.schemas.models import (
@@ -15,13 +21,33 @@ from app.schemas.models import (
     BatchPredictResponse,
     RiskLevel,
 )
+from app.api.columnar import (
+    NPY_CONTENT_TYPE,
+    NPZ_CONTENT_TYPE,
+    decode_feature_matrix,
+    encode_columns,
+    transaction_values,
+)
+from app.api.encoding import (
+    encode_batch_response,
+    encode_prediction,
+    json_response,
+)
 from app.services.inference import InferenceService
-from app.services.scoring import ScoringService
+from app.services.batcher import InferenceBatcher
+from app.services.feature_store import WalletFeatureStore
+from app.services.stream import StreamRegistry
+from app.services.calibration import CalibrationTable
+from app.services.prediction_cache import PredictionCache
+from app.services.scoring import ScoredBatch, ScoringService
+from app.db.chat_cache import MISSING
 from app.db.database import DatabaseService
+from app.ml.model_loader import CALIBRATION_PATH
 from app.web3.alert_registry import AlertRegistry
+from config.settings import settings
 
 # 🔔 Telegram notification service
-from app.notifications.telegram_service import notify_telegram
+from app.notifications.telegram_service import dispatcher as telegram_dispatcher, notify_telegram
 
 router = APIRouter()
 
@@ -29,10 +55,108 @@ router = APIRouter()
 # SERVICE INITIALIZATION
 # ============================
 
-inference_service = InferenceService()
 scoring_service = ScoringService()
-db_service = DatabaseService()
-alert_registry = AlertRegistry()
+prediction_cache = PredictionCache(
+    max_size=settings.PREDICT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PREDICT_CACHE_TTL_SECONDS,
+)
+
+
+def on_model_change():
+    """
+    A registry hot-swap: results and cutoffs of the previous model are dropped
+    """
+    prediction_cache.invalidate()
+    scoring_service.set_model_version(inference_service.model_loader.version)
+
+
+# Shadow scoring compares alert decisions at the live alert cutoff
+inference_service = InferenceService(
+    alert_cutoff=scoring_service.alert_threshold,
+    on_model_change=on_model_change,
+)
+# Calibration tables, live cutoffs and stored predictions follow the serving model
+scoring_service.set_model_version(inference_service.model_loader.version)
+db_service = DatabaseService(model_version=lambda: inference_service.model_loader.version)
+alert_registry = AlertRegistry(
+    on_confirmed=db_service.set_on_chain_tx_hashes,
+    store_proofs=db_service.store_alert_proofs,
+)
+inference_batcher = InferenceBatcher(
+    inference_service,
+    max_batch_size=settings.PREDICT_BATCH_MAX_SIZE,
+    max_wait_ms=settings.PREDICT_BATCH_MAX_WAIT_MS,
+)
+feature_store = WalletFeatureStore(
+    window_seconds=settings.FEATURE_STORE_WINDOW_SECONDS,
+    n_buckets=settings.FEATURE_STORE_BUCKETS,
+    max_wallets=settings.FEATURE_STORE_MAX_WALLETS,
+    ttl_seconds=settings.FEATURE_STORE_TTL_SECONDS,
+)
+stream_registry = StreamRegistry()
+
+
+def record_wallet_activity(transactions):
+    """
+    Feed scored transactions back into the wallet feature store
+    """
+    for tx in transactions:
+        if tx.wallet_address:
+            feature_store.record(tx.wallet_address, tx.amount_usd)
+
+
+def score_batch(risk_scores: List[float]) -> ScoredBatch:
+    """
+    Levels / alerts / confidences for a batch in array operations
+    Scores also feed the live threshold sketch
+    """
+    scoring_service.observe(risk_scores)
+    return scoring_service.score_batch(risk_scores)
+
+
+def build_predictions(risk_scores: List[float]) -> List[PredictResponse]:
+    return score_batch(risk_scores).to_responses()
+
+
+def store_scored(stored):
+    """
+    Persist (request, prediction) pairs and their alerts in bulk
+    No Telegram / on-chain fan-out for bulk paths to avoid spam
+    """
+    db_service.store_predictions(stored)
+    db_service.store_alerts([(tx, p) for tx, p in stored if p.is_alert])
+
+
+async def score_requests(
+    requests: List[PredictRequest],
+) -> List[Union[PredictResponse, str]]:
+    """
+    Score and persist a batch for the bulk paths (streams, chain ingestion)
+    A record the feature store cannot complete is answered with an error,
+    the rest of the batch is still scored
+    """
+    results: List[Union[PredictResponse, str]] = [None] * len(requests)
+    ready = []
+    for i, request in enumerate(requests):
+        try:
+            ready.append((i, feature_store.complete_request(request)))
+        except ValueError as e:
+            results[i] = str(e)
+
+    if ready:
+        transactions = [tx for _, tx in ready]
+        risk_scores = await inference_service.batch_inference_async(transactions)
+        record_wallet_activity(transactions)
+
+        stored = []
+        for (i, tx), prediction in zip(ready, build_predictions(risk_scores)):
+            results[i] = prediction
+            stored.append((tx, prediction))
+
+        # Awaited so a backed-up DB writer also slows the producer down
+        await asyncio.to_thread(store_scored, stored)
+
+    return results
 
 
 # ============================
@@ -43,136 +167,234 @@ alert_registry = AlertRegistry()
 async def predict_transaction(
     request: PredictRequest,
     background_tasks: BackgroundTasks,
+    explain: bool = False,
 ):
     """
     Predict risk score for a single transaction
+    ?explain=true adds per-feature contributions to the score
     """
     try:
-        # ================== 1. ML INFERENCE ==================
-        risk_score = inference_service.run_inference(request)
+        # Retries / re-submissions of a tx_hash get the first answer back
+        if settings.PREDICT_CACHE_ENABLED and request.tx_hash:
+            key = PredictionCache.key(
+                request, inference_service.model_loader.version, explain
+            )
+            response = await prediction_cache.get_or_compute(
+                key, lambda: predict_one(request, background_tasks, explain)
+            )
+        else:
+            response = await predict_one(request, background_tasks, explain)
 
-        # ================== 2. SCORING ==================
-        risk_level = scoring_service.classify_risk_level(risk_score)
-        is_alert = scoring_service.should_alert(risk_score)
-        confidence = scoring_service.calculate_confidence(risk_score)
-        threshold = scoring_service.threshold
+        if settings.PREDICT_FAST_JSON:
+            return json_response(encode_prediction(response))
+        return response
 
-        response = PredictResponse(
-            risk_score=risk_score,
-            risk_level=risk_level,
-            is_alert=is_alert,
-            threshold=threshold,
-            confidence=confidence,
-            timestamp=datetime.utcnow(),
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Prediction failed: {str(e)}",
         )
 
-        # ================== 3. STORE PREDICTION ==================
-        background_tasks.add_task(
-            db_service.store_prediction,
+
+async def predict_one(
+    request: PredictRequest,
+    background_tasks: BackgroundTasks,
+    explain: bool = False,
+) -> PredictResponse:
+    """
+    Score, store and fan out one transaction
+    """
+    # ================== 0. WALLET FEATURES ==================
+    # Missing tx_count / rolling volume / relative amount come from the store
+    request = feature_store.complete_request(request)
+
+    # ================== 1. ML INFERENCE ==================
+    # Concurrent requests are coalesced into one batch_inference call
+    feature_contributions = None
+    if explain:
+        # Attribution traversal: scored on its own, not micro-batched
+        risk_scores, contributions = await inference_service.batch_explain_async([request])
+        risk_score, feature_contributions = risk_scores[0], contributions[0]
+    elif settings.PREDICT_BATCHING_ENABLED:
+        risk_score = await inference_batcher.submit(request)
+    else:
+        risk_score = await inference_service.run_inference_async(request)
+
+    record_wallet_activity([request])
+
+    # ================== 2. SCORING ==================
+    scoring_service.observe_one(risk_score)
+    # Cutoffs read once: level, is_alert and threshold come from the same set
+    response = scoring_service.score_batch([risk_score]).to_responses()[0]
+    response.feature_contributions = feature_contributions
+    risk_level, is_alert = response.risk_level, response.is_alert
+
+    # ================== 3. STORE PREDICTION ==================
+    background_tasks.add_task(
+        db_service.store_prediction,
+        request=request,
+        response=response,
+    )
+
+    # ================== 4. STORE ALERT (DB FIRST) ==================
+    if is_alert:
+        # Waits for the bulk writer's next flush - keep it off the event loop
+        alert_id = await run_in_threadpool(
+            db_service.store_alert,
             request=request,
             response=response,
+            on_chain_tx_hash=None,
         )
 
-        # ================== 4. STORE ALERT (DB FIRST) ==================
-        if is_alert:
-            alert_id = db_service.store_alert(
-                request=request,
-                response=response,
-                on_chain_tx_hash=None,
+        # ================== 5. TELEGRAM NOTIFICATION ==================
+        # Cached wallet -> chat id; only a cache miss goes to the DB
+        chat_id = db_service.cached_telegram_chat_id(request.wallet_address)
+        if chat_id is MISSING:
+            chat_id = await run_in_threadpool(
+                db_service.load_telegram_chat_id,
+                request.wallet_address,
             )
 
-            # ================== 5. TELEGRAM NOTIFICATION ==================
-            chat_id = db_service.get_telegram_chat_id(
-                request.wallet_address
-            )
-
-            if chat_id and alert_id != -1:
-                alert_record = db_service.get_alert_by_id(alert_id)
-                if alert_record:
-                    background_tasks.add_task(
-                        notify_telegram,
-                        chat_id,
-                        alert_record,
-                    )
-
-        # ================== 6. ON-CHAIN ALERT ==================
-        if is_alert and risk_level in [RiskLevel.HIGH, RiskLevel.CRITICAL]:
+        if chat_id and alert_id != -1:
+            # Built from what was just stored - no read-back
             background_tasks.add_task(
-                alert_registry.create_alert,
-                wallet_address=request.wallet_address or "unknown",
-                risk_score=risk_score,
-                tx_hash=request.tx_hash or "unknown",
+                notify_telegram,
+                chat_id,
+                db_service.build_alert_record(request, response, alert_id),
             )
 
-        return response
-
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Prediction failed: {str(e)}",
+    # ================== 6. ON-CHAIN ALERT ==================
+    if is_alert and risk_level in [RiskLevel.HIGH, RiskLevel.CRITICAL]:
+        background_tasks.add_task(
+            alert_registry.create_alert,
+            wallet_address=request.wallet_address or "unknown",
+            risk_score=risk_score,
+            tx_hash=request.tx_hash or "unknown",
+            alert_id=alert_id if alert_id != -1 else None,
         )
 
+    return response
+
 
 # ============================
 # BATCH PREDICTION
 # ============================
 
-@router.post("/predict/batch", response_model=BatchPredictResponse)
+def parse_json_body(model, body: bytes):
+    """
+    What FastAPI does for a JSON body parameter (same 422 documents)
+    """
+    try:
+        data = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise RequestValidationError([{
+            "type": "json_invalid",
+            "loc": ("body", e.pos),
+            "msg": "JSON decode error",
+            "input": {},
+            "ctx": {"error": e.msg},
+        }])
+    try:
+        return model.model_validate(data)
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])} for error in e.errors()
+        ])
+
+
+# Body read by hand to dispatch on Content-Type; documented here instead
+BATCH_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": BatchPredictRequest.model_json_schema(
+                    ref_template="#/components/schemas/{model}"
+                ),
+            },
+            NPY_CONTENT_TYPE: {
+                "schema": {"type": "string", "format": "binary"},
+            },
+        },
+    },
+}
+
+
+@router.post(
+    "/predict/batch",
+    response_model=BatchPredictResponse,
+    openapi_extra=BATCH_REQUEST_BODY,
+)
 async def predict_batch(
-    request: BatchPredictRequest,
+    http_request: Request,
     background_tasks: BackgroundTasks,
+    explain: bool = False,
 ):
     """
     Batch prediction for multiple transactions
+
+    Content-Type application/json: BatchPredictRequest (up to 100 rows)
+    Content-Type application/x-npy: a float32/float64 (n, 4) matrix of
+    amount_usd, tx_count_user, rolling_volume_user, relative_amount
+    (up to PREDICT_BATCH_BINARY_MAX_ROWS rows), answered with .npz columns
+    ?explain=true adds per-feature contributions for every row
     """
+    body = await http_request.body()
+    content_type = http_request.headers.get("content-type", "")
+    if content_type.split(";")[0].strip() == NPY_CONTENT_TYPE:
+        return await predict_batch_columnar(body, background_tasks, explain)
+
+    request = parse_json_body(BatchPredictRequest, body)
+
     start_time = time.time()
 
     try:
-        risk_scores = inference_service.batch_inference(
-            request.transactions
-        )
-
-        predictions = []
-        alerts_triggered = 0
-
-        for tx, risk_score in zip(
-            request.transactions, risk_scores
-        ):
-            risk_level = scoring_service.classify_risk_level(risk_score)
-            is_alert = scoring_service.should_alert(risk_score)
-            confidence = scoring_service.calculate_confidence(risk_score)
-
-            if is_alert:
-                alerts_triggered += 1
-
-            prediction = PredictResponse(
-                risk_score=risk_score,
-                risk_level=risk_level,
-                is_alert=is_alert,
-                threshold=scoring_service.threshold,
-                confidence=confidence,
-                timestamp=datetime.utcnow(),
+        transactions = [
+            feature_store.complete_request(tx) for tx in request.transactions
+        ]
+
+        contributions = None
+        if explain:
+            risk_scores, contributions = await inference_service.batch_explain_async(
+                transactions
+            )
+        else:
+            risk_scores = await inference_service.batch_inference_async(
+                transactions
             )
+        record_wallet_activity(transactions)
 
-            predictions.append(prediction)
+        batch = score_batch(risk_scores)
 
-            # Store prediction
+        if settings.PREDICT_FAST_JSON:
+            # Rows + response body straight from the score arrays
+            timestamp = datetime.utcnow()
             background_tasks.add_task(
-                db_service.store_prediction,
-                request=tx,
-                response=prediction,
+                db_service.store_scored_batch,
+                [db_service.transaction_values(tx) for tx in transactions],
+                batch.risk_scores.tolist(),
+                batch.risk_levels(),
+                batch.is_alert.tolist(),
+                batch.confidence.tolist(),
+                timestamp,
+            )
+            processing_time_ms = (time.time() - start_time) * 1000
+            return json_response(
+                encode_batch_response(batch, timestamp, processing_time_ms, contributions)
             )
 
-            # Store alert ONLY (no Telegram in batch to avoid spam)
-            if is_alert:
-                background_tasks.add_task(
-                    db_service.store_alert,
-                    request=tx,
-                    response=prediction,
-                    on_chain_tx_hash=None,
-                )
+        predictions = batch.to_responses()
+        if contributions is not None:
+            for prediction, feature_contributions in zip(predictions, contributions):
+                prediction.feature_contributions = feature_contributions
+        alerts_triggered = batch.alerts_count
+
+        # Store predictions + alerts in bulk (no Telegram in batch to avoid spam)
+        background_tasks.add_task(
+            store_scored, list(zip(transactions, predictions))
+        )
 
         processing_time_ms = (
             time.time() - start_time
@@ -185,8 +407,214 @@ async def predict_batch(
             processing_time_ms=processing_time_ms,
         )
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Batch prediction failed: {str(e)}",
+        )
+
+
+async def predict_batch_columnar(
+    body: bytes,
+    background_tasks: BackgroundTasks,
+    explain: bool = False,
+):
+    """
+    Columnar /predict/batch: the matrix is scored as sent (no wallet
+    feature completion) and the response is one array per field
+    """
+    start_time = time.time()
+
+    try:
+        X = decode_feature_matrix(body, settings.PREDICT_BATCH_BINARY_MAX_ROWS)
+        contributions = None
+        if explain:
+            risk_scores, contributions = await inference_service.matrix_explain_async(X)
+        else:
+            risk_scores = await inference_service.matrix_inference_async(X)
+        batch = score_batch(risk_scores)
+
+        background_tasks.add_task(
+            db_service.store_scored_batch,
+            transaction_values(X),
+            batch.risk_scores.tolist(),
+            batch.risk_levels(),
+            batch.is_alert.tolist(),
+            batch.confidence.tolist(),
+            datetime.utcnow(),
+        )
+
+        processing_time_ms = (time.time() - start_time) * 1000
+        return Response(
+            content=encode_columns(batch, processing_time_ms, contributions),
+            media_type=NPZ_CONTENT_TYPE,
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Batch prediction failed: {str(e)}",
         )
+
+
+# ============================
+# MODEL
+# ============================
+
+@router.get("/predict/model-info")
+async def get_model_info():
+    """
+    Loaded model: features, format (pickle / mmap artifact), load time
+    """
+    return inference_service.model_loader.get_info()
+
+
+@router.get("/predict/models")
+async def get_models():
+    """
+    Registry versions, the one serving, and the shadow comparison
+    """
+    return await run_in_threadpool(inference_service.get_registry_info)
+
+
+async def set_registry_pointer(update, version):
+    """
+    Move a registry pointer, then pick it up in this worker right away
+    (the others follow on their next poll)
+    """
+    try:
+        await run_in_threadpool(update, version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await run_in_threadpool(inference_service.reload_if_changed)
+    return await run_in_threadpool(inference_service.get_registry_info)
+
+
+@router.post("/predict/models/{version}/activate")
+async def activate_model(version: str):
+    """
+    Serve a registry version (zero downtime: in-flight batches finish on the old one)
+    """
+    return await set_registry_pointer(inference_service.model_loader.registry.activate, version)
+
+
+@router.post("/predict/models/{version}/shadow")
+async def shadow_model(version: str):
+    """
+    Score MODEL_SHADOW_FRACTION of traffic with a registry version in the background
+    """
+    return await set_registry_pointer(inference_service.model_loader.registry.set_candidate, version)
+
+
+@router.delete("/predict/models/shadow")
+async def stop_shadow():
+    """
+    Stop shadow scoring
+    """
+    return await set_registry_pointer(inference_service.model_loader.registry.set_candidate, None)
+
+
+# ============================
+# THRESHOLDS
+# ============================
+
+@router.get("/predict/threshold")
+async def get_threshold():
+    """
+    Cutoffs in use, where they come from, and the live sketch's state
+    """
+    return scoring_service.get_threshold_info()
+
+
+@router.post("/predict/threshold")
+async def update_threshold(new_threshold: float):
+    """
+    Set the fixed alert threshold (used without live / calibrated cutoffs)
+    """
+    try:
+        scoring_service.update_threshold(new_threshold)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return scoring_service.get_threshold_info()
+
+
+# ============================
+# CALIBRATION
+# ============================
+
+@router.get("/predict/calibration")
+async def get_calibration():
+    """
+    Loaded calibration table and the cutoffs derived from it
+    """
+    return {
+        "calibration": scoring_service.calibration.get_metrics(),
+        "live_threshold": scoring_service.live.get_info(),
+        "thresholds": scoring_service.get_threshold_info(),
+    }
+
+
+@router.post("/predict/calibration/rebuild")
+async def rebuild_calibration(limit: int = 1_000_000):
+    """
+    Rebuild the calibration table from the latest `limit` predictions
+    of the serving model version
+    Saved next to the model artifacts: every worker picks it up on its
+    next reload poll, this one right away
+    """
+    model_version = inference_service.model_loader.version
+    scores = await run_in_threadpool(db_service.load_risk_scores, limit, model_version)
+    if len(scores) < settings.CALIBRATION_MIN_SAMPLES:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Need {settings.CALIBRATION_MIN_SAMPLES} stored predictions "
+                   f"of model {model_version} to calibrate, have {len(scores)}",
+        )
+
+    def build_and_save():
+        table = CalibrationTable.from_scores(
+            scores, settings.CALIBRATION_KNOTS, model_version
+        )
+        table.save(CALIBRATION_PATH)
+        scoring_service.calibration.reload_if_changed()
+        return table
+
+    table = await run_in_threadpool(build_and_save)
+    return {
+        "calibration": table.get_info(),
+        "thresholds": scoring_service.get_threshold_info(),
+    }
+
+
+# ============================
+# METRICS
+# ============================
+
+@router.get("/predict/metrics")
+async def get_prediction_metrics():
+    """
+    Serving metrics: executor mode, micro-batching (queue depth, batch sizes, waits),
+    streaming connections, /predict result cache hit rate
+    """
+    return {
+        "inference_executor": inference_service.executor.mode,
+        "batching_enabled": settings.PREDICT_BATCHING_ENABLED,
+        "batcher": inference_batcher.get_metrics(),
+        "streams": stream_registry.get_metrics(),
+        "feature_store": feature_store.get_metrics(),
+        "prediction_cache": prediction_cache.get_metrics(),
+        "alert_sender": alert_registry.get_metrics(),
+        "notifications": telegram_dispatcher.get_metrics(),
+        "telegram_chat_cache": db_service.chat_cache.get_metrics(),
+        "calibration": scoring_service.calibration.get_metrics(),
+        "live_threshold": scoring_service.live.get_info(),
+        "db_writer": (
+            db_service.writer.get_metrics() if db_service.writer else None
+        ),
+    }
@@ -0,0 +1,168 @@
+"""
+Streaming Prediction Routes
+Long-lived ingest for high-volume feeds: WebSocket or chunked NDJSON POST
+One PredictRequest per line in, one PredictResponse per line out, in order
+"""
+import asyncio
+
+from fastapi import APIRouter, Request, WebSocket
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive, Scope, Send
+
+from app.api.predict import stream_registry, score_requests
+from app.services.stream import StreamSession, encode_results
+from config.settings import settings
+
+router = APIRouter()
+
+
+def open_session(transport: str) -> StreamSession:
+    return stream_registry.open(StreamSession(
+        score_requests,
+        transport=transport,
+        max_batch_size=settings.STREAM_BATCH_MAX_SIZE,
+        max_wait_ms=settings.STREAM_BATCH_MAX_WAIT_MS,
+        max_in_flight=settings.STREAM_MAX_IN_FLIGHT,
+        max_batches_in_flight=settings.STREAM_MAX_BATCHES_IN_FLIGHT,
+    ))
+
+
+class FullDuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that leaves receive() to the request body reader
+
+    The stock response listens for disconnects by calling receive() itself,
+    which would swallow request body chunks that are still arriving.
+    A disconnect surfaces in the body reader instead.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+
+
+# ============================
+# NDJSON
+# ============================
+
+@router.post("/predict/stream")
+async def predict_stream_ndjson(request: Request):
+    """
+    Chunked NDJSON stream: POST one PredictRequest JSON object per line,
+    receive one PredictResponse per line in the same order.
+    Rejected records are answered with {"index": n, "error": "..."}, lines
+    longer than STREAM_MAX_LINE_BYTES too (the rest of the line is skipped).
+    """
+    session = open_session("ndjson")
+    max_line = settings.STREAM_MAX_LINE_BYTES
+    too_long = f"Line longer than {max_line} bytes"
+
+    async def read_body():
+        buffer = bytearray()
+        # Bytes of buffer already searched for a newline
+        searched = 0
+        # Inside a line that outgrew max_line: dropped up to its newline
+        skipping = False
+        try:
+            async for chunk in request.stream():
+                buffer += chunk
+                start = 0
+                while (end := buffer.find(b"\n", searched)) != -1:
+                    if skipping or end - start > max_line:
+                        skipping = False
+                        await session.put(too_long)
+                    else:
+                        await session.feed_line(bytes(buffer[start:end]))
+                    start = searched = end + 1
+                del buffer[:start]
+                searched = len(buffer)
+
+                if len(buffer) > max_line:
+                    skipping = True
+                    buffer.clear()
+                    searched = 0
+
+            if skipping:
+                await session.put(too_long)
+            else:
+                await session.feed_line(bytes(buffer))
+        except ClientDisconnect:
+            pass
+        except asyncio.CancelledError:
+            # Writer gone: end() could wait forever on a full queue
+            session.abort()
+            raise
+        except Exception as e:
+            print(f"⚠️ NDJSON stream read failed: {e}")
+        # Always: results() only finishes after end()
+        await session.end()
+
+    async def write_results():
+        reader = asyncio.ensure_future(read_body())
+        try:
+            async for results in session.results():
+                yield encode_results(results)
+        finally:
+            reader.cancel()
+            stream_registry.close(session)
+
+    return FullDuplexStreamingResponse(
+        write_results(), media_type="application/x-ndjson"
+    )
+
+
+# ============================
+# WEBSOCKET
+# ============================
+
+@router.websocket("/predict/stream")
+async def predict_stream_websocket(websocket: WebSocket):
+    """
+    WebSocket stream: each text (or binary) frame carries one or more
+    NDJSON PredictRequest lines. Each scored micro-batch is sent back as one
+    frame of NDJSON PredictResponse lines, in order. An empty frame ends
+    the input; remaining results are flushed and the socket is closed.
+    """
+    await websocket.accept()
+    session = open_session("websocket")
+    disconnected = False
+
+    async def read_frames():
+        nonlocal disconnected
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                disconnected = True
+                return
+
+            data = message.get("text")
+            if data is None:
+                data = (message.get("bytes") or b"").decode(errors="replace")
+            if not data:
+                return
+
+            for line in data.split("\n"):
+                await session.feed_line(line)
+
+    async def read_input():
+        try:
+            await read_frames()
+        except asyncio.CancelledError:
+            # Writer gone: end() could wait forever on a full queue
+            session.abort()
+            raise
+        except Exception as e:
+            print(f"⚠️ WebSocket stream read failed: {e}")
+        # Always: results() only finishes after end()
+        await session.end()
+
+    reader = asyncio.ensure_future(read_input())
+    try:
+        async for results in session.results():
+            if not disconnected:
+                await websocket.send_text(encode_results(results))
+        if not disconnected:
+            await websocket.close()
+    finally:
+        reader.cancel()
+        stream_registry.close(session)
@@ -1,12 +1,20 @@
-import requests
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from datetime import datetime
+from app.services.etherscan import EtherscanClient, EtherscanError, MAX_RESULT_WINDOW
 from config.settings import settings
 
 router = APIRouter(prefix="/wallet", tags=["Wallet Activity"])
 
-ETHERSCAN_URL = "https://api.etherscan.io/v2/api"
-SEPOLIA_CHAIN_ID = 11155111
+etherscan_client = EtherscanClient(
+    api_key=settings.ETHERSCAN_API_KEY,
+    base_url=settings.ETHERSCAN_URL,
+    chain_id=settings.ETHERSCAN_CHAIN_ID,
+    rate_limit_per_sec=settings.ETHERSCAN_RATE_LIMIT_PER_SEC,
+    cache_ttl_seconds=settings.ETHERSCAN_CACHE_TTL_SECONDS,
+    max_cached_wallets=settings.ETHERSCAN_CACHE_MAX_WALLETS,
+    timeout_seconds=settings.ETHERSCAN_TIMEOUT_SECONDS,
+    max_connections=settings.ETHERSCAN_MAX_CONNECTIONS,
+)
 
 
 def compute_risk(tx):
@@ -33,23 +41,18 @@ def compute_risk(tx):
 
 
 @router.get("/{wallet_address}/transactions")
-def get_wallet_transactions(wallet_address: str, limit: int = 20):
-
-    params = {
-        "chainid": SEPOLIA_CHAIN_ID,
-        "module": "account",
-        "action": "txlist",
-        "address": wallet_address,
-        "startblock": 0,
-        "endblock": 99999999,
-        "sort": "desc",
-        "apikey": settings.ETHERSCAN_API_KEY,
-    }
-
-    res = requests.get(ETHERSCAN_URL, params=params)
-    data = res.json()
-
-    if data.get("status") != "1":
+async def get_wallet_transactions(
+    wallet_address: str,
+    limit: int = Query(20, ge=1, le=MAX_RESULT_WINDOW),
+):
+
+    try:
+        transactions = await etherscan_client.get_transactions(wallet_address, limit)
+    except EtherscanError as e:
+        print(f"⚠️ {e}")
+        transactions = []
+
+    if not transactions:
         return {
             "wallet": wallet_address,
             "count": 0,
@@ -58,7 +61,7 @@ def get_wallet_transactions(wallet_address: str, limit: int = 20):
 
     enriched = []
 
-    for tx in data["result"][:limit]:
+    for tx in transactions:
         risk_score, risk_level = compute_risk(tx)
 
         enriched.append({
@@ -77,3 +80,11 @@ def get_wallet_transactions(wallet_address: str, limit: int = 20):
         "count": len(enriched),
         "transactions": enriched,
     }
+
+
+@router.get("/etherscan/metrics")
+async def get_etherscan_metrics():
+    """
+    Etherscan client cache / coalescing / rate-limit counters
+    """
+    return etherscan_client.get_metrics()
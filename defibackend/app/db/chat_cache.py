@@ -0,0 +1,71 @@
+"""
+Telegram Chat Cache
+Read-through, in-memory wallet -> chat id cache in front of TelegramMapping
+Negative results are cached too: most alerting wallets have no chat
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+# Not cached (None is a valid cached value: "no mapping")
+MISSING = object()
+
+
+class ChatIdCache:
+    """
+    LRU of wallet -> (chat id or None, cached_at)
+
+    Writes through save_telegram_chat_id invalidate their wallet right away;
+    the TTL bounds staleness for mappings written by another process.
+    Thread-safe: lookups happen on the event loop and in the threadpool.
+    """
+
+    def __init__(self, max_size: int = 100_000, ttl_seconds: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by invalidate(): a DB read that raced a write isn't cached
+        self.generation = 0
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, wallet_address: str):
+        """
+        Cached chat id (or None for "no mapping"), MISSING if not cached
+        """
+        with self._lock:
+            entry = self._entries.get(wallet_address)
+            if entry is None or time.monotonic() - entry[1] >= self.ttl:
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(wallet_address)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, wallet_address: str, chat_id: Optional[str], generation: int):
+        """
+        Cache a value read from the DB when the generation was `generation`
+        """
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[wallet_address] = (chat_id, time.monotonic())
+            self._entries.move_to_end(wallet_address)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, wallet_address: str):
+        with self._lock:
+            self._entries.pop(wallet_address, None)
+            self.generation += 1
+
+    def get_metrics(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
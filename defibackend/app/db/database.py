@@ -13,13 +13,28 @@ from sqlalchemy import (
     Float,
     Boolean,
     DateTime,
+    Index,
+    bindparam,
+    func,
+    inspect,
+    select,
+    text,
+    tuple_,
 )
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import atexit
+
+import numpy as np
 
 from config.settings import settings
+from app.db.writer import BulkWriter
+from app.db.stats import StatsAggregator
+from app.db.pagination import encode_cursor, decode_cursor
+from app.db.chat_cache import ChatIdCache, MISSING
 from app.schemas.models import (
     PredictRequest,
     PredictResponse,
@@ -48,6 +63,21 @@ class Alert(Base):
     false_positive = Column(Boolean, nullable=True)
     notes = Column(String, nullable=True)
 
+    # Keyset pagination: every filter combination of GET /alerts
+    # is served newest-first straight from one index
+    __table_args__ = (
+        Index("ix_alerts_timestamp_id", "timestamp", "id"),
+        Index("ix_alerts_wallet_timestamp_id", "wallet_address", "timestamp", "id"),
+        Index("ix_alerts_level_timestamp_id", "risk_level", "timestamp", "id"),
+        Index(
+            "ix_alerts_wallet_level_timestamp_id",
+            "wallet_address",
+            "risk_level",
+            "timestamp",
+            "id",
+        ),
+    )
+
 
 class Prediction(Base):
     __tablename__ = "predictions"
@@ -59,11 +89,32 @@ class Prediction(Base):
     whale_tx = Column(Integer)
     tx_count_user = Column(Integer)
     rolling_volume_user = Column(Float)
+    relative_amount = Column(Float)
     risk_score = Column(Float, nullable=False)
     risk_level = Column(String, nullable=False)
     is_alert = Column(Boolean, default=False)
     confidence = Column(Float)
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    # Model that produced risk_score (calibration only uses its own scores)
+    model_version = Column(String, nullable=True)
+
+
+class StatsSummary(Base):
+    """
+    Maintained aggregates behind /alerts/stats
+    Single row, updated with every prediction / alert insert
+    """
+    __tablename__ = "stats_summary"
+
+    id = Column(Integer, primary_key=True)
+    total_predictions = Column(Integer, nullable=False, default=0)
+    total_alerts = Column(Integer, nullable=False, default=0)
+    risk_score_sum = Column(Float, nullable=False, default=0.0)
+    risk_score_sumsq = Column(Float, nullable=False, default=0.0)
+    count_low = Column(Integer, nullable=False, default=0)
+    count_medium = Column(Integer, nullable=False, default=0)
+    count_high = Column(Integer, nullable=False, default=0)
+    count_critical = Column(Integer, nullable=False, default=0)
 
 
 class TelegramMapping(Base):
@@ -79,6 +130,33 @@ class TelegramMapping(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+class AlertProof(Base):
+    """
+    Merkle inclusion proof of an alert anchored in a batch
+    (AlertRegistry.anchorAlertBatch); proof is comma-separated hex
+    """
+    __tablename__ = "alert_proofs"
+
+    alert_id = Column(Integer, primary_key=True)
+    merkle_root = Column(String, index=True, nullable=False)
+    leaf_index = Column(Integer, nullable=False)
+    batch_size = Column(Integer, nullable=False)
+    proof = Column(String, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class IngestionCursor(Base):
+    """
+    Last fully processed block per ingestion source
+    Lets chain ingestion resume after a restart
+    """
+    __tablename__ = "ingestion_cursors"
+
+    name = Column(String, primary_key=True)
+    block_number = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 # ============================
 # DATABASE SERVICE
 # ============================
@@ -89,12 +167,168 @@ class DatabaseService:
     Handles all database interactions
     """
 
-    def __init__(self):
+    def __init__(self, model_version: Optional[Callable[[], str]] = None):
         self.engine = create_engine(settings.DATABASE_URL)
         Base.metadata.create_all(bind=self.engine)
+        # create_all skips indexes of tables that already exist
+        for index in Alert.__table__.indexes:
+            index.create(bind=self.engine, checkfirst=True)
+        self._add_missing_columns()
         self.SessionLocal = sessionmaker(bind=self.engine)
+
+        # Serving model version, stamped on every predictions row
+        self.model_version = model_version or (lambda: settings.MODEL_VERSION)
+
+        # Wallet -> Telegram chat id, read-through (no DB hit per alert)
+        self.chat_cache = ChatIdCache(
+            max_size=settings.TELEGRAM_CHAT_CACHE_SIZE,
+            ttl_seconds=settings.TELEGRAM_CHAT_CACHE_TTL_SECONDS,
+        )
+
+        # O(1) statistics, maintained on every insert
+        self.stats = StatsAggregator(
+            StatsSummary.__table__,
+            Prediction.__table__,
+            Alert.__table__,
+        )
+        self._ensure_stats_row()
+
+        # Buffered bulk writes for predictions / alerts
+        self.writer = None
+        if settings.DB_WRITE_BUFFERED:
+            self.writer = BulkWriter(
+                self.engine,
+                Prediction.__table__,
+                Alert.__table__,
+                batch_size=settings.DB_WRITE_BATCH_SIZE,
+                flush_interval_ms=settings.DB_WRITE_FLUSH_INTERVAL_MS,
+                max_pending=settings.DB_WRITE_MAX_PENDING,
+                max_retries=settings.DB_WRITE_MAX_RETRIES,
+                stats=self.stats,
+            )
+            atexit.register(self.close)
+
         print(f"✅ Database initialized at {settings.DATABASE_URL}")
 
+    def _add_missing_columns(self):
+        """
+        create_all doesn't alter existing tables either: add nullable
+        columns introduced since the table was created
+        """
+        existing = {c["name"] for c in inspect(self.engine).get_columns(Prediction.__tablename__)}
+        with self.engine.begin() as conn:
+            for column in Prediction.__table__.columns:
+                if column.name not in existing and column.nullable:
+                    conn.execute(text(
+                        f"ALTER TABLE {Prediction.__tablename__} "
+                        f"ADD COLUMN {column.name} {column.type.compile(self.engine.dialect)}"
+                    ))
+
+    def _ensure_stats_row(self):
+        try:
+            with self.engine.begin() as conn:
+                self.stats.ensure_row(conn)
+        except IntegrityError:
+            # Another worker created it first
+            pass
+
+    def close(self):
+        """
+        Flush buffered rows and stop the writer
+        """
+        if self.writer is not None:
+            self.writer.close()
+
+    def flush(self):
+        """
+        Block until buffered rows are written
+        """
+        if self.writer is not None:
+            self.writer.flush()
+
+    # ----------------------------
+    # ROW BUILDERS
+    # ----------------------------
+
+    @staticmethod
+    def transaction_values(request: PredictRequest) -> dict:
+        """
+        Transaction columns of a predictions row
+        """
+        return {
+            "tx_hash": request.tx_hash,
+            "wallet_address": request.wallet_address,
+            "amount_usd": request.amount_usd,
+            "whale_tx": request.whale_tx,
+            "tx_count_user": request.tx_count_user,
+            "rolling_volume_user": request.rolling_volume_user,
+            "relative_amount": request.relative_amount,
+        }
+
+    @staticmethod
+    def _prediction_values(
+        tx: dict,
+        risk_score: float,
+        risk_level: RiskLevel,
+        is_alert: bool,
+        confidence: float,
+        timestamp: datetime,
+        model_version: str,
+    ) -> dict:
+        return {
+            **tx,
+            "risk_score": risk_score,
+            "risk_level": risk_level.value,
+            "is_alert": is_alert,
+            "confidence": confidence,
+            "timestamp": timestamp,
+            "model_version": model_version,
+        }
+
+    @staticmethod
+    def _alert_values(
+        tx: dict,
+        risk_score: float,
+        risk_level: RiskLevel,
+        timestamp: datetime,
+        on_chain_tx_hash: Optional[str] = None,
+    ) -> dict:
+        return {
+            "tx_hash": tx["tx_hash"],
+            "wallet_address": tx["wallet_address"],
+            "risk_score": risk_score,
+            "risk_level": risk_level.value,
+            "amount_usd": tx["amount_usd"],
+            "timestamp": timestamp,
+            "on_chain_tx_hash": on_chain_tx_hash,
+            "verified": False,
+        }
+
+    @classmethod
+    def _prediction_row(
+        cls,
+        request: PredictRequest,
+        response: PredictResponse,
+        model_version: str,
+    ) -> dict:
+        return cls._prediction_values(
+            cls.transaction_values(request), response.risk_score,
+            response.risk_level, response.is_alert, response.confidence,
+            response.timestamp, model_version,
+        )
+
+    @classmethod
+    def _alert_row(
+        cls,
+        request: PredictRequest,
+        response: PredictResponse,
+        on_chain_tx_hash: Optional[str] = None,
+    ) -> dict:
+        return cls._alert_values(
+            cls.transaction_values(request), response.risk_score,
+            response.risk_level, response.timestamp, on_chain_tx_hash,
+        )
+
     # ----------------------------
     # PREDICTIONS
     # ----------------------------
@@ -104,22 +338,56 @@ class DatabaseService:
         request: PredictRequest,
         response: PredictResponse,
     ):
+        self.store_predictions([(request, response)])
+
+    def store_predictions(
+        self,
+        items: List[Tuple[PredictRequest, PredictResponse]],
+    ):
+        model_version = self.model_version()
+        self._write_predictions([
+            self._prediction_row(req, resp, model_version) for req, resp in items
+        ])
+
+    def store_scored_batch(
+        self,
+        transactions: List[dict],
+        risk_scores: List[float],
+        risk_levels: List[RiskLevel],
+        is_alert: List[bool],
+        confidence: List[float],
+        timestamp: datetime,
+    ):
+        """
+        store_predictions + store_alerts from score columns
+        (no PredictResponse per row)
+        Args:
+            transactions: transaction_values() per row
+        """
+        predictions, alerts = [], []
+        model_version = self.model_version()
+        for tx, risk_score, risk_level, alert, conf in zip(
+            transactions, risk_scores, risk_levels, is_alert, confidence
+        ):
+            predictions.append(self._prediction_values(
+                tx, risk_score, risk_level, alert, conf, timestamp, model_version
+            ))
+            if alert:
+                alerts.append(self._alert_values(tx, risk_score, risk_level, timestamp))
+
+        self._write_predictions(predictions)
+        if alerts:
+            self._write_alerts(alerts)
+
+    def _write_predictions(self, rows: List[dict]):
+        if self.writer is not None:
+            self.writer.add_predictions(rows)
+            return
+
         session = self.SessionLocal()
         try:
-            prediction = Prediction(
-                tx_hash=request.tx_hash,
-                wallet_address=request.wallet_address,
-                amount_usd=request.amount_usd,
-                whale_tx=request.whale_tx,
-                tx_count_user=request.tx_count_user,
-                rolling_volume_user=request.rolling_volume_user,
-                risk_score=response.risk_score,
-                risk_level=response.risk_level.value,
-                is_alert=response.is_alert,
-                confidence=response.confidence,
-                timestamp=response.timestamp,
-            )
-            session.add(prediction)
+            session.add_all([Prediction(**row) for row in rows])
+            self.stats.apply(session, self.stats.deltas(rows, []))
             session.commit()
         except Exception as e:
             session.rollback()
@@ -137,19 +405,22 @@ class DatabaseService:
         response: PredictResponse,
         on_chain_tx_hash: Optional[str] = None,
     ) -> int:
+        row = self._alert_row(request, response, on_chain_tx_hash)
+
+        if self.writer is not None:
+            # Caller needs the id: flush now, together with whatever is buffered
+            future = self.writer.add_alerts([row], urgent=True)[0]
+            try:
+                return future.result()
+            except Exception as e:
+                print(f"❌ Error storing alert: {e}")
+                return -1
+
         session = self.SessionLocal()
         try:
-            alert = Alert(
-                tx_hash=request.tx_hash,
-                wallet_address=request.wallet_address,
-                risk_score=response.risk_score,
-                risk_level=response.risk_level.value,
-                amount_usd=request.amount_usd,
-                timestamp=response.timestamp,
-                on_chain_tx_hash=on_chain_tx_hash,
-                verified=False,
-            )
+            alert = Alert(**row)
             session.add(alert)
+            self.stats.apply(session, self.stats.deltas([], [row]))
             session.commit()
             session.refresh(alert)
             return alert.id
@@ -160,6 +431,59 @@ class DatabaseService:
         finally:
             session.close()
 
+    def store_alerts(
+        self,
+        items: List[Tuple[PredictRequest, PredictResponse]],
+    ):
+        """
+        Store many alerts without waiting for their ids
+        """
+        self._write_alerts([self._alert_row(req, resp) for req, resp in items])
+
+    def _write_alerts(self, rows: List[dict]):
+        if self.writer is not None:
+            self.writer.add_alerts(rows)
+            return
+
+        session = self.SessionLocal()
+        try:
+            session.add_all([Alert(**row) for row in rows])
+            self.stats.apply(session, self.stats.deltas([], rows))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            print(f"❌ Error storing alert: {e}")
+        finally:
+            session.close()
+
+    @classmethod
+    def build_alert_record(
+        cls,
+        request: PredictRequest,
+        response: PredictResponse,
+        alert_id: int,
+    ) -> AlertRecord:
+        """
+        The record store_alert just wrote, built in memory (no read-back)
+        """
+        return AlertRecord(id=alert_id, **cls._alert_row(request, response))
+
+    @staticmethod
+    def _to_record(alert: Alert) -> AlertRecord:
+        return AlertRecord(
+            id=alert.id,
+            tx_hash=alert.tx_hash,
+            wallet_address=alert.wallet_address,
+            risk_score=alert.risk_score,
+            risk_level=RiskLevel(alert.risk_level),
+            amount_usd=alert.amount_usd,
+            timestamp=alert.timestamp,
+            on_chain_tx_hash=alert.on_chain_tx_hash,
+            verified=alert.verified,
+            false_positive=alert.false_positive,
+            notes=alert.notes,
+        )
+
     def get_alert_by_id(self, alert_id: int) -> Optional[AlertRecord]:
         session = self.SessionLocal()
         try:
@@ -167,22 +491,20 @@ class DatabaseService:
             if not alert:
                 return None
 
-            return AlertRecord(
-                id=alert.id,
-                tx_hash=alert.tx_hash,
-                wallet_address=alert.wallet_address,
-                risk_score=alert.risk_score,
-                risk_level=RiskLevel(alert.risk_level),
-                amount_usd=alert.amount_usd,
-                timestamp=alert.timestamp,
-                on_chain_tx_hash=alert.on_chain_tx_hash,
-                verified=alert.verified,
-                false_positive=alert.false_positive,
-                notes=alert.notes,
-            )
+            return self._to_record(alert)
         finally:
             session.close()
 
+    @staticmethod
+    def _filter_alerts(query, wallet_address, risk_level):
+        if wallet_address:
+            query = query.filter(Alert.wallet_address == wallet_address)
+
+        if risk_level:
+            query = query.filter(Alert.risk_level == risk_level.value)
+
+        return query
+
     def get_alerts(
         self,
         skip: int = 0,
@@ -190,39 +512,134 @@ class DatabaseService:
         wallet_address: Optional[str] = None,
         risk_level: Optional[RiskLevel] = None,
     ) -> List[AlertRecord]:
+        """
+        OFFSET pagination (cost grows with skip - prefer get_alerts_page)
+        """
         session = self.SessionLocal()
         try:
-            query = session.query(Alert)
-
-            if wallet_address:
-                query = query.filter(Alert.wallet_address == wallet_address)
-
-            if risk_level:
-                query = query.filter(Alert.risk_level == risk_level.value)
+            query = self._filter_alerts(
+                session.query(Alert), wallet_address, risk_level
+            )
 
             alerts = (
-                query.order_by(Alert.timestamp.desc())
+                query.order_by(Alert.timestamp.desc(), Alert.id.desc())
                 .offset(skip)
                 .limit(limit)
                 .all()
             )
 
-            return [
-                AlertRecord(
-                    id=a.id,
-                    tx_hash=a.tx_hash,
-                    wallet_address=a.wallet_address,
-                    risk_score=a.risk_score,
-                    risk_level=RiskLevel(a.risk_level),
-                    amount_usd=a.amount_usd,
-                    timestamp=a.timestamp,
-                    on_chain_tx_hash=a.on_chain_tx_hash,
-                    verified=a.verified,
-                    false_positive=a.false_positive,
-                    notes=a.notes,
+            return [self._to_record(a) for a in alerts]
+        finally:
+            session.close()
+
+    def get_alerts_page(
+        self,
+        limit: int = 100,
+        wallet_address: Optional[str] = None,
+        risk_level: Optional[RiskLevel] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[AlertRecord], Optional[str]]:
+        """
+        Keyset pagination on (timestamp, id), newest first
+        Cost is independent of page depth
+        Returns (alerts, next_cursor) - next_cursor is None on the last page
+        Raises ValueError for a malformed cursor
+        """
+        session = self.SessionLocal()
+        try:
+            query = self._filter_alerts(
+                session.query(Alert), wallet_address, risk_level
+            )
+
+            if cursor:
+                timestamp, alert_id = decode_cursor(cursor)
+                query = query.filter(
+                    tuple_(Alert.timestamp, Alert.id) < tuple_(timestamp, alert_id)
                 )
-                for a in alerts
-            ]
+
+            # One extra row tells us whether another page exists
+            alerts = (
+                query.order_by(Alert.timestamp.desc(), Alert.id.desc())
+                .limit(limit + 1)
+                .all()
+            )
+
+            next_cursor = None
+            if len(alerts) > limit:
+                alerts = alerts[:limit]
+                next_cursor = encode_cursor(alerts[-1].timestamp, alerts[-1].id)
+
+            return [self._to_record(a) for a in alerts], next_cursor
+        finally:
+            session.close()
+
+    def count_alerts(
+        self,
+        wallet_address: Optional[str] = None,
+        risk_level: Optional[RiskLevel] = None,
+    ) -> int:
+        """
+        Unfiltered: maintained counter (O(1))
+        Filtered: COUNT(*) answered from the composite indexes
+        """
+        if not wallet_address and not risk_level:
+            return self.get_statistics()["total_alerts"]
+
+        session = self.SessionLocal()
+        try:
+            query = self._filter_alerts(
+                session.query(func.count(Alert.id)), wallet_address, risk_level
+            )
+            return query.scalar()
+        finally:
+            session.close()
+
+    def set_on_chain_tx_hashes(self, hashes: Dict[int, str]):
+        """
+        Record mined alert transactions: {alert_id: on-chain tx hash}
+        (the createAlert, or the anchorAlertBatch covering the alert)
+        """
+        if not hashes:
+            return
+        table = Alert.__table__
+        with self.engine.begin() as conn:
+            conn.execute(
+                table.update()
+                .where(table.c.id == bindparam("alert_id"))
+                .values(on_chain_tx_hash=bindparam("chain_tx_hash")),
+                [
+                    {"alert_id": alert_id, "chain_tx_hash": chain_tx_hash}
+                    for alert_id, chain_tx_hash in hashes.items()
+                ],
+            )
+
+    def store_alert_proofs(self, proofs: List[dict]):
+        """
+        Store Merkle proofs of one anchored batch
+        (rows: alert_id, merkle_root, leaf_index, batch_size, proof)
+        A re-anchored alert's proof replaces the one of its failed batch
+        """
+        if not proofs:
+            return
+        table = AlertProof.__table__
+        with self.engine.begin() as conn:
+            conn.execute(
+                table.delete().where(table.c.alert_id.in_([p["alert_id"] for p in proofs]))
+            )
+            conn.execute(table.insert(), proofs)
+
+    def get_alert_proof(self, alert_id: int) -> Optional[dict]:
+        session = self.SessionLocal()
+        try:
+            row = session.get(AlertProof, alert_id)
+            if not row:
+                return None
+            return {
+                "merkle_root": row.merkle_root,
+                "leaf_index": row.leaf_index,
+                "batch_size": row.batch_size,
+                "proof": row.proof.split(",") if row.proof else [],
+            }
         finally:
             session.close()
 
@@ -258,11 +675,25 @@ class DatabaseService:
             print(f"❌ Error saving Telegram mapping: {e}")
         finally:
             session.close()
+            self.chat_cache.invalidate(wallet_address)
 
     def get_telegram_chat_id(
         self,
         wallet_address: str,
     ) -> Optional[str]:
+        """
+        Read-through: served from chat_cache, the DB is only hit on a miss
+        """
+        chat_id = self.chat_cache.get(wallet_address)
+        if chat_id is not MISSING:
+            return chat_id
+        return self.load_telegram_chat_id(wallet_address)
+
+    def load_telegram_chat_id(self, wallet_address: str) -> Optional[str]:
+        """
+        Cache miss: read the mapping from the DB and cache it
+        """
+        generation = self.chat_cache.generation
         session = self.SessionLocal()
         try:
             mapping = (
@@ -270,38 +701,125 @@ class DatabaseService:
                 .filter(TelegramMapping.wallet_address == wallet_address)
                 .first()
             )
-            return mapping[0] if mapping else None
+            chat_id = mapping[0] if mapping else None
         finally:
             session.close()
 
+        self.chat_cache.put(wallet_address, chat_id, generation)
+        return chat_id
+
+    def cached_telegram_chat_id(self, wallet_address: str):
+        """
+        Cache only (never touches the DB): chat id, None, or MISSING
+        """
+        return self.chat_cache.get(wallet_address)
+
     # ----------------------------
-    # STATS
+    # INGESTION CURSOR
     # ----------------------------
 
-    def get_statistics(self) -> dict:
+    def get_ingestion_cursor(self, name: str) -> Optional[int]:
         session = self.SessionLocal()
         try:
-            total_predictions = session.query(Prediction).count()
-            total_alerts = session.query(Alert).count()
-
-            alert_rate = (
-                total_alerts / total_predictions
-                if total_predictions > 0
-                else 0.0
-            )
-
-            avg_risk = session.query(Prediction.risk_score).all()
-            avg_risk_score = (
-                sum(r[0] for r in avg_risk) / len(avg_risk)
-                if avg_risk
-                else 0.0
-            )
+            cursor = session.get(IngestionCursor, name)
+            return cursor.block_number if cursor else None
+        finally:
+            session.close()
 
-            return {
-                "total_predictions": total_predictions,
-                "total_alerts": total_alerts,
-                "alert_rate": alert_rate,
-                "avg_risk_score": avg_risk_score,
-            }
+    def save_ingestion_cursor(self, name: str, block_number: int):
+        """
+        Record block_number as processed; buffered predictions / alerts
+        are flushed first so the cursor never runs ahead of stored rows
+        """
+        self.flush()
+        session = self.SessionLocal()
+        try:
+            cursor = session.get(IngestionCursor, name)
+            if cursor:
+                cursor.block_number = block_number
+            else:
+                session.add(IngestionCursor(name=name, block_number=block_number))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            print(f"❌ Error saving ingestion cursor: {e}")
         finally:
             session.close()
+
+    # ----------------------------
+    # SCORE HISTORY
+    # ----------------------------
+
+    def iter_feature_rows(
+        self,
+        features: List[str],
+        chunk_rows: int = 100_000,
+        limit: Optional[int] = None,
+    ) -> Iterator[np.ndarray]:
+        """
+        Stored transactions as (rows, len(features)) float64 chunks, oldest first
+        Keyset scan on id, so memory stays at one chunk however large the table
+        Rows missing any of the features are skipped
+        """
+        self.flush()
+        columns = [Prediction.__table__.c[name] for name in features]
+        query = (
+            select(Prediction.id, *columns)
+            .where(*(column.is_not(None) for column in columns))
+            .order_by(Prediction.id)
+        )
+
+        last_id, remaining = 0, limit
+        while remaining is None or remaining > 0:
+            size = chunk_rows if remaining is None else min(chunk_rows, remaining)
+            with self.engine.connect() as conn:
+                rows = conn.execute(query.where(Prediction.id > last_id).limit(size)).all()
+            if not rows:
+                return
+
+            chunk = np.array(rows, dtype=np.float64)
+            last_id = int(chunk[-1, 0])
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk[:, 1:]
+
+    def load_risk_scores(
+        self,
+        limit: Optional[int] = None,
+        model_version: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Risk scores of the most recent predictions (all if limit is None),
+        only those of model_version when given
+        Used to build the calibration table
+        """
+        self.flush()
+        query = select(Prediction.risk_score).order_by(Prediction.id.desc())
+        if model_version is not None:
+            query = query.where(Prediction.model_version == model_version)
+        if limit is not None:
+            query = query.limit(limit)
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(query).scalars()
+            return np.fromiter(rows, dtype=np.float64)
+
+    # ----------------------------
+    # STATS
+    # ----------------------------
+
+    def get_statistics(self) -> dict:
+        """
+        System statistics from the maintained aggregates (constant time)
+        """
+        with self.engine.connect() as conn:
+            return self.stats.read(conn)
+
+    def reconcile_statistics(self) -> dict:
+        """
+        Rebuild the aggregates from the raw predictions / alerts tables
+        """
+        self.flush()
+        with self.engine.begin() as conn:
+            self.stats.rebuild(conn)
+            return self.stats.read(conn)
@@ -0,0 +1,32 @@
+"""
+Keyset Pagination
+Opaque cursors over (timestamp, id) for newest-first listings
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """
+    Cursor pointing just after the given row
+    """
+    payload = json.dumps(
+        {"t": timestamp.isoformat(), "id": row_id},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Inverse of encode_cursor
+    Raises ValueError on malformed / tampered cursors
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"]), int(payload["id"])
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
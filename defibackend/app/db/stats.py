@@ -0,0 +1,176 @@
+"""
+Stats Aggregates
+Maintained counters for /alerts/stats - O(1) reads instead of full scans
+Updated in the same transaction as every prediction / alert insert
+"""
+import math
+from typing import List
+
+from sqlalchemy import func, insert, select, update
+
+from app.schemas.models import RiskLevel
+
+# Single summary row
+SUMMARY_ID = 1
+
+LEVEL_COLUMNS = {level.value: f"count_{level.value}" for level in RiskLevel}
+
+
+class StatsAggregator:
+    """
+    Keeps the stats summary row in sync with the raw tables
+
+    Tracks totals, risk-score sum and sum of squares (mean / std)
+    and per-risk-level prediction counts.
+    """
+
+    def __init__(self, summary_table, prediction_table, alert_table):
+        self.summary = summary_table
+        self.predictions = prediction_table
+        self.alerts = alert_table
+
+    # ----------------------------
+    # INCREMENTAL UPDATES
+    # ----------------------------
+
+    def deltas(self, predictions: List[dict], alerts: List[dict]) -> dict:
+        """
+        Counter increments for a batch of inserted rows
+        """
+        deltas = {
+            "total_predictions": len(predictions),
+            "total_alerts": len(alerts),
+            "risk_score_sum": 0.0,
+            "risk_score_sumsq": 0.0,
+        }
+        deltas.update({column: 0 for column in LEVEL_COLUMNS.values()})
+
+        for row in predictions:
+            score = row["risk_score"]
+            deltas["risk_score_sum"] += score
+            deltas["risk_score_sumsq"] += score * score
+            column = LEVEL_COLUMNS.get(row["risk_level"])
+            if column:
+                deltas[column] += 1
+
+        return deltas
+
+    def apply(self, conn, deltas: dict) -> None:
+        """
+        UPDATE summary SET col = col + delta (atomic across workers)
+        conn may be a Connection or a Session - runs in the caller's transaction
+        """
+        values = {
+            column: self.summary.c[column] + delta
+            for column, delta in deltas.items()
+            if delta
+        }
+        if values:
+            conn.execute(
+                update(self.summary)
+                .where(self.summary.c.id == SUMMARY_ID)
+                .values(values)
+            )
+
+    # ----------------------------
+    # READ / REBUILD
+    # ----------------------------
+
+    def ensure_row(self, conn) -> None:
+        """
+        Create the summary row (built from raw tables) if it does not exist
+        """
+        exists = conn.execute(
+            select(self.summary.c.id).where(self.summary.c.id == SUMMARY_ID)
+        ).first()
+        if not exists:
+            conn.execute(
+                insert(self.summary).values(id=SUMMARY_ID, **self._scan(conn))
+            )
+
+    def rebuild(self, conn) -> dict:
+        """
+        Recompute every aggregate from the raw tables (reconcile)
+        """
+        values = self._scan(conn)
+        self.ensure_row(conn)
+        conn.execute(
+            update(self.summary)
+            .where(self.summary.c.id == SUMMARY_ID)
+            .values(values)
+        )
+        return values
+
+    def _scan(self, conn) -> dict:
+        p = self.predictions.c
+
+        total, score_sum, score_sumsq = conn.execute(
+            select(
+                func.count(p.id),
+                func.coalesce(func.sum(p.risk_score), 0.0),
+                func.coalesce(func.sum(p.risk_score * p.risk_score), 0.0),
+            )
+        ).one()
+
+        values = {
+            "total_predictions": total,
+            "total_alerts": conn.execute(
+                select(func.count(self.alerts.c.id))
+            ).scalar_one(),
+            "risk_score_sum": float(score_sum),
+            "risk_score_sumsq": float(score_sumsq),
+        }
+        values.update({column: 0 for column in LEVEL_COLUMNS.values()})
+
+        for level, count in conn.execute(
+            select(p.risk_level, func.count(p.id)).group_by(p.risk_level)
+        ):
+            column = LEVEL_COLUMNS.get(level)
+            if column:
+                values[column] = count
+
+        return values
+
+    def read(self, conn) -> dict:
+        """
+        Statistics from the summary row - constant time
+        """
+        row = conn.execute(
+            select(self.summary).where(self.summary.c.id == SUMMARY_ID)
+        ).mappings().first()
+
+        if row is None:
+            return summarize({})
+        return summarize(row)
+
+
+def summarize(row) -> dict:
+    """
+    Derive the public statistics from raw counters
+    """
+    total_predictions = row.get("total_predictions") or 0
+    total_alerts = row.get("total_alerts") or 0
+    score_sum = row.get("risk_score_sum") or 0.0
+    score_sumsq = row.get("risk_score_sumsq") or 0.0
+
+    if total_predictions > 0:
+        mean = score_sum / total_predictions
+        variance = max(score_sumsq / total_predictions - mean * mean, 0.0)
+    else:
+        mean = variance = 0.0
+
+    return {
+        "total_predictions": total_predictions,
+        "total_alerts": total_alerts,
+        "alert_rate": (
+            total_alerts / total_predictions
+            if total_predictions > 0
+            else 0.0
+        ),
+        "avg_risk_score": mean,
+        "std_risk_score": math.sqrt(variance),
+        "risk_level_counts": {
+            level: row.get(column) or 0
+            for level, column in LEVEL_COLUMNS.items()
+        },
+    }
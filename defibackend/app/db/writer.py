@@ -0,0 +1,286 @@
+"""
+Bulk Writer
+Buffers prediction / alert rows and writes them in one transaction per batch
+Replaces one session + commit per row on the prediction hot path
+"""
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+
+class BulkWriter:
+    """
+    Background writer thread with size / time flush triggers
+
+    - Rows are flushed when `batch_size` rows are buffered, every
+      `flush_interval_ms`, or immediately when a caller waits for an alert id
+    - Producers block once `max_pending` rows are buffered (backpressure)
+    - A failed flush is retried `max_retries` times with backoff, then
+      written row by row so only the rows that fail are lost (and logged)
+    - `close()` drains everything before returning
+    """
+
+    def __init__(
+        self,
+        engine,
+        prediction_table,
+        alert_table,
+        batch_size: int = 500,
+        flush_interval_ms: float = 200.0,
+        max_pending: int = 10_000,
+        max_retries: int = 3,
+        retry_backoff_ms: float = 50.0,
+        stats=None,
+    ):
+        self.engine = engine
+        self.prediction_table = prediction_table
+        self.alert_table = alert_table
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff_ms / 1000
+        # Optional StatsAggregator updated in the same transaction
+        self.stats = stats
+
+        self._cond = threading.Condition()
+        self._predictions: List[dict] = []
+        self._alerts: List[Tuple[dict, Future]] = []
+        self._urgent = False
+        self._closed = False
+
+        # Rows handed in / rows whose flush finished (for flush())
+        self._enqueued = 0
+        self._written = 0
+
+        # Metrics
+        self.flushes = 0
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.flush_retries = 0
+        self.row_fallbacks = 0
+        self.backpressure_waits = 0
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name="db-bulk-writer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    # ----------------------------
+    # PRODUCERS
+    # ----------------------------
+
+    def add_predictions(self, rows: List[dict]) -> None:
+        """
+        Buffer prediction rows (fire and forget)
+        """
+        if not rows:
+            return
+        with self._cond:
+            self._wait_for_room(len(rows))
+            self._predictions.extend(rows)
+            self._enqueued += len(rows)
+            if self._pending() >= self.batch_size:
+                self._cond.notify_all()
+
+    def add_alerts(self, rows: List[dict], urgent: bool = False) -> List[Future]:
+        """
+        Buffer alert rows
+        Returns one Future per row resolving to the new alert id
+        urgent=True flushes right away (a caller is waiting for the id)
+        """
+        futures = [Future() for _ in rows]
+        if not rows:
+            return futures
+        with self._cond:
+            self._wait_for_room(len(rows))
+            self._alerts.extend(zip(rows, futures))
+            self._enqueued += len(rows)
+            if urgent:
+                self._urgent = True
+            if urgent or self._pending() >= self.batch_size:
+                self._cond.notify_all()
+        return futures
+
+    def _pending(self) -> int:
+        return len(self._predictions) + len(self._alerts)
+
+    def _wait_for_room(self, n_rows: int) -> None:
+        if self._closed:
+            raise RuntimeError("BulkWriter is closed")
+        # Always admit a batch into an empty buffer, even an oversized one
+        while self._pending() > 0 and self._pending() + n_rows > self.max_pending:
+            self.backpressure_waits += 1
+            self._urgent = True
+            self._cond.notify_all()
+            self._cond.wait()
+
+    # ----------------------------
+    # WRITER THREAD
+    # ----------------------------
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._ready():
+                    self._cond.wait(timeout=self.flush_interval)
+
+                if self._closed and not self._pending():
+                    return
+
+                predictions, self._predictions = self._predictions, []
+                alerts, self._alerts = self._alerts, []
+                self._urgent = False
+                # Wake producers blocked on backpressure
+                self._cond.notify_all()
+
+            if predictions or alerts:
+                self._write(predictions, alerts)
+
+            with self._cond:
+                self._written += len(predictions) + len(alerts)
+                self._cond.notify_all()
+
+    def _ready(self) -> bool:
+        return (
+            self._closed
+            or self._urgent
+            or self._pending() >= self.batch_size
+        )
+
+    def _write(self, predictions: List[dict], alerts: List[Tuple[dict, Future]]):
+        """
+        The whole batch in one transaction, retried with backoff on
+        transient errors (e.g. SQLite "database is locked"), then row by row
+        """
+        alert_rows = [row for row, _ in alerts]
+        backoff = self.retry_backoff
+        for attempt in range(self.max_retries + 1):
+            try:
+                alert_ids = self._write_batch(predictions, alert_rows)
+            except Exception as e:
+                print(f"⚠️ Error writing batch ({len(predictions)} predictions, "
+                      f"{len(alerts)} alerts, attempt {attempt + 1}/{self.max_retries + 1}): {e}")
+                if isinstance(e, IntegrityError):
+                    # Bad rows: retrying the batch won't help
+                    break
+                if attempt < self.max_retries:
+                    self.flush_retries += 1
+                    time.sleep(backoff)
+                    backoff *= 2
+                continue
+
+            for (_, future), alert_id in zip(alerts, alert_ids):
+                future.set_result(alert_id)
+            self.flushes += 1
+            self.rows_written += len(predictions) + len(alerts)
+            return
+
+        self.row_fallbacks += 1
+        self._write_rows(predictions, alerts)
+
+    def _write_batch(self, predictions: List[dict], alert_rows: List[dict]) -> List[int]:
+        """
+        One transaction: executemany for predictions, bulk INSERT .. RETURNING
+        for alerts, and one UPDATE of the stats aggregates
+        """
+        with self.engine.begin() as conn:
+            if predictions:
+                conn.execute(insert(self.prediction_table), predictions)
+            alert_ids = self._insert_alerts(conn, alert_rows)
+            if self.stats is not None:
+                self.stats.apply(conn, self.stats.deltas(predictions, alert_rows))
+        return alert_ids
+
+    def _write_rows(self, predictions: List[dict], alerts: List[Tuple[dict, Future]]):
+        """
+        One transaction per row: a bad row only costs itself
+        """
+        for row in predictions:
+            try:
+                self._write_batch([row], [])
+                self.rows_written += 1
+            except Exception as e:
+                self.rows_failed += 1
+                print(f"❌ Prediction not stored (tx {row.get('tx_hash')}, "
+                      f"wallet {row.get('wallet_address')}): {e}")
+
+        for row, future in alerts:
+            try:
+                alert_id = self._write_batch([], [row])[0]
+            except Exception as e:
+                self.rows_failed += 1
+                print(f"❌ Alert not stored (tx {row.get('tx_hash')}, "
+                      f"wallet {row.get('wallet_address')}): {e}")
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            self.rows_written += 1
+            future.set_result(alert_id)
+
+    def _insert_alerts(self, conn, rows: List[dict]) -> List[int]:
+        if not rows:
+            return []
+
+        table = self.alert_table
+        dialect = self.engine.dialect
+
+        if dialect.insert_executemany_returning_sort_by_parameter_order:
+            result = conn.execute(
+                insert(table).returning(table.c.id, sort_by_parameter_order=True),
+                rows,
+            )
+            return list(result.scalars())
+
+        # Drivers without ordered bulk RETURNING: still one transaction
+        return [
+            conn.execute(insert(table), row).inserted_primary_key[0]
+            for row in rows
+        ]
+
+    # ----------------------------
+    # LIFECYCLE
+    # ----------------------------
+
+    def flush(self, timeout: float = None) -> None:
+        """
+        Block until everything buffered so far has been written
+        """
+        with self._cond:
+            target = self._enqueued
+            self._urgent = True
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self._written >= target, timeout=timeout)
+
+    def close(self) -> None:
+        """
+        Drain the buffer and stop the writer thread (idempotent)
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def get_metrics(self) -> dict:
+        with self._cond:
+            pending = self._pending()
+        return {
+            "pending_rows": pending,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "rows_failed": self.rows_failed,
+            "flush_retries": self.flush_retries,
+            "row_fallbacks": self.row_fallbacks,
+            "avg_rows_per_flush": (
+                self.rows_written / self.flushes if self.flushes > 0 else 0.0
+            ),
+            "backpressure_waits": self.backpressure_waits,
+        }
@@ -0,0 +1,184 @@
+"""
+Model Artifact
+A CompiledForest on disk as one flat binary file + a small JSON manifest
+Opened with mmap: no unpickling, no sklearn import, pages shared by workers
+"""
+import hashlib
+import json
+import mmap
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+
+from app.ml.compiled_forest import ARRAY_FIELDS, CompiledForest
+from app.ml.feature_schema import FeatureSchema
+from app.ml.shared_forest import array_layout
+
+ARTIFACT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+# A superseded data file is kept this long (well above the registry poll
+# interval): a worker may have read the old manifest but not opened it yet
+DATA_RETAIN_SECONDS = 60.0
+
+
+def fingerprint(engine: CompiledForest) -> str:
+    """
+    Content hash of a compiled forest (same value whatever it was loaded from)
+    """
+    exported = engine.to_arrays()
+    digest = hashlib.sha256()
+    for name in ARRAY_FIELDS:
+        digest.update(np.ascontiguousarray(exported["arrays"][name]).tobytes())
+    digest.update(f"{exported['max_depth']}:{exported['denominator']!r}".encode())
+    return digest.hexdigest()[:16]
+
+
+def export_artifact(
+    engine: CompiledForest,
+    directory,
+    schema: FeatureSchema,
+    retain_seconds: float = DATA_RETAIN_SECONDS,
+) -> Path:
+    """
+    Write the forest's arrays to <directory>/forest-<fingerprint>.bin and
+    point manifest.json at it
+
+    Replacing the manifest is the only switch: a reader sees the old model
+    or the new one, and processes that mapped an older file keep it.
+    The previous data file stays; older ones are deleted once superseded
+    for retain_seconds.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    try:
+        previous = ModelArtifact.read_manifest(directory)["data"]
+    except (OSError, ValueError, KeyError):
+        previous = None
+
+    exported = engine.to_arrays()
+    layout, size = array_layout(exported["arrays"])
+    content_hash = fingerprint(engine)
+    data_name = f"forest-{content_hash}.bin"
+
+    tmp_path = directory / (data_name + ".tmp")
+    checksum = hashlib.sha256()
+    with open(tmp_path, "wb") as f:
+        for name, array in exported["arrays"].items():
+            offset = layout[name][0]
+            for chunk in (b"\0" * (offset - f.tell()), np.ascontiguousarray(array).tobytes()):
+                f.write(chunk)
+                checksum.update(chunk)
+    tmp_path.replace(directory / data_name)
+
+    manifest = {
+        "format": "compiled-forest",
+        "version": ARTIFACT_VERSION,
+        "fingerprint": content_hash,
+        "created_at": datetime.utcnow().isoformat(),
+        "features": list(schema.names),
+        "feature_schema": schema.to_dict(),
+        "n_trees": engine.n_trees,
+        "max_depth": exported["max_depth"],
+        "denominator": exported["denominator"],
+        "data": data_name,
+        "size": size,
+        "sha256": checksum.hexdigest(),
+        "arrays": {
+            name: {"offset": offset, "shape": list(shape), "dtype": dtype}
+            for name, (offset, shape, dtype) in layout.items()
+        },
+    }
+    tmp_path = directory / (MANIFEST_NAME + ".tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2))
+    tmp_path.replace(directory / MANIFEST_NAME)
+
+    if previous not in (None, data_name) and (directory / previous).exists():
+        # mtime = when it stopped being current
+        os.utime(directory / previous)
+    prune_data_files(directory, {data_name, previous}, retain_seconds)
+
+    return directory / MANIFEST_NAME
+
+
+def prune_data_files(directory: Path, keep: set, retain_seconds: float):
+    """
+    Delete data files of earlier exports superseded more than retain_seconds
+    ago (processes that mapped them keep their mapping)
+    """
+    now = time.time()
+    for old in directory.glob("forest-*.bin"):
+        if old.name in keep:
+            continue
+        try:
+            if now - old.stat().st_mtime > retain_seconds:
+                old.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class ModelArtifact:
+    """
+    An opened artifact: a CompiledForest whose arrays are read-only views
+    of the mapped file
+
+    The mapping lives as long as this object; the OS loads pages on first
+    touch and every process mapping the same file shares them. verify=True
+    checks the data file against the manifest's sha256 (reads every page).
+    A model trained on other features than `schema` is refused.
+    """
+
+    def __init__(self, directory, schema: FeatureSchema, verify: bool = False):
+        start = time.perf_counter()
+        self.directory = Path(directory)
+        self._read_checked_manifest(schema)
+        try:
+            data = open(self.directory / self.manifest["data"], "rb")
+        except FileNotFoundError:
+            # Superseded and pruned between the two reads: take the new manifest
+            self._read_checked_manifest(schema)
+            data = open(self.directory / self.manifest["data"], "rb")
+        with data as f:
+            self.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.mapping) != self.manifest["size"]:
+            self.mapping.close()
+            raise ValueError("Model artifact data file does not match its manifest")
+        if verify and hashlib.sha256(self.mapping).hexdigest() != self.manifest.get("sha256"):
+            self.mapping.close()
+            raise ValueError(f"Model artifact {self.directory} failed its checksum")
+
+        arrays = {
+            name: np.ndarray(
+                tuple(spec["shape"]),
+                dtype=spec["dtype"],
+                buffer=self.mapping,
+                offset=spec["offset"],
+            )
+            for name, spec in self.manifest["arrays"].items()
+        }
+        self.engine = CompiledForest.from_arrays(
+            arrays,
+            max_depth=self.manifest["max_depth"],
+            denominator=self.manifest["denominator"],
+        )
+        self.open_seconds = time.perf_counter() - start
+
+    def _read_checked_manifest(self, schema: FeatureSchema):
+        self.manifest = self.read_manifest(self.directory)
+        if self.manifest.get("version") != ARTIFACT_VERSION:
+            raise ValueError(f"Unsupported model artifact version {self.manifest.get('version')}")
+        self.schema = FeatureSchema.from_manifest(self.manifest)
+        schema.require(self.schema, f"Model artifact {self.directory}")
+
+    @staticmethod
+    def read_manifest(directory) -> dict:
+        return json.loads((Path(directory) / MANIFEST_NAME).read_text())
+
+    @property
+    def fingerprint(self) -> str:
+        return self.manifest["fingerprint"]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.mapping)
@@ -0,0 +1,382 @@
+"""
+Compiled Isolation Forest
+Flattens a fitted IsolationForest + StandardScaler into plain NumPy arrays
+Scores whole batches with array traversal - no sklearn on the hot path
+"""
+import numpy as np
+from typing import Optional, Tuple
+
+# sklearn trees compare features in float32 (sklearn.tree._tree.DTYPE)
+TREE_DTYPE = np.float32
+
+# Rows scored per traversal chunk (bounds the (n_trees, rows) temporaries)
+CHUNK_ROWS = 4096
+
+# From this many rows on, sklearn's Cython Tree.apply beats NumPy traversal
+NATIVE_MIN_ROWS = 128
+
+# Flat arrays that fully describe a compiled forest (see to_arrays / from_arrays)
+ARRAY_FIELDS = (
+    "feature",
+    "threshold",
+    "children",
+    "leaf_depth",
+    "roots",
+    "mean",
+    "scale",
+)
+
+
+class CompiledForest:
+    """
+    Isolation Forest compiled to flat node arrays
+
+    All trees are concatenated into one node table:
+        feature[node]    feature index tested at the node
+        threshold[node]  split threshold (left if x <= threshold)
+        children[2*node] / children[2*node + 1]  left / right child
+        leaf_depth[node] path length contribution of a leaf
+    Leaves point to themselves with threshold=+inf, so every row can be
+    advanced for a fixed number of steps without branching.
+
+    When compiled from sklearn, the low-level Tree objects are kept as
+    `native_trees` and used for large batches only (no input validation).
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        children: np.ndarray,
+        leaf_depth: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        denominator: float,
+        mean: np.ndarray,
+        scale: np.ndarray,
+        native_trees: Optional[list] = None,
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.leaf_depth = leaf_depth
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.denominator = float(denominator)
+        self.mean = mean
+        self.scale = scale
+        self.native_trees = native_trees
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_features(self) -> int:
+        return len(self.mean)
+
+    # ----------------------------
+    # COMPILATION
+    # ----------------------------
+
+    @classmethod
+    def from_sklearn(cls, model, scaler) -> "CompiledForest":
+        """
+        Compile a fitted IsolationForest and the StandardScaler it was trained behind
+        """
+        from sklearn.ensemble._iforest import _average_path_length
+
+        n_features = model.n_features_in_
+        subsample_features = model._max_features != n_features
+
+        features, thresholds, lefts, rights, depths, roots = [], [], [], [], [], []
+        native_trees = []
+        max_depth = 0
+        offset = 0
+
+        for tree_idx, (estimator, tree_features) in enumerate(
+            zip(model.estimators_, model.estimators_features_)
+        ):
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(n_nodes, dtype=np.intp)
+            is_leaf = tree.children_left == -1
+
+            # Leaves loop on themselves: x <= +inf always goes "left"
+            left = np.where(is_leaf, node_ids, tree.children_left) + offset
+            right = np.where(is_leaf, node_ids, tree.children_right) + offset
+
+            feature = np.where(is_leaf, 0, tree.feature)
+            if subsample_features:
+                feature = np.asarray(tree_features)[feature]
+
+            threshold = np.where(is_leaf, np.inf, tree.threshold)
+
+            # Same expression sklearn evaluates per leaf in _compute_score_samples
+            node_depths = model._decision_path_lengths[tree_idx]
+            leaf_depth = (
+                node_depths
+                + model._average_path_length_per_tree[tree_idx]
+                - 1.0
+            )
+
+            features.append(feature)
+            thresholds.append(threshold)
+            lefts.append(left)
+            rights.append(right)
+            depths.append(leaf_depth)
+            roots.append(offset)
+            native_trees.append(
+                (tree, np.asarray(tree_features) if subsample_features else None)
+            )
+
+            # compute_node_depths() counts the root as depth 1
+            max_depth = max(max_depth, int(node_depths.max()) - 1)
+            offset += n_nodes
+
+        children = np.empty(2 * offset, dtype=np.intp)
+        children[0::2] = np.concatenate(lefts)
+        children[1::2] = np.concatenate(rights)
+
+        denominator = (
+            len(model.estimators_)
+            * _average_path_length([model._max_samples])[0]
+        )
+
+        mean = (
+            np.asarray(scaler.mean_, dtype=np.float64)
+            if scaler.with_mean
+            else np.zeros(n_features)
+        )
+        scale = (
+            np.asarray(scaler.scale_, dtype=np.float64)
+            if scaler.with_std
+            else np.ones(n_features)
+        )
+
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            children=children,
+            leaf_depth=np.concatenate(depths).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            denominator=denominator,
+            mean=mean,
+            scale=scale,
+            native_trees=native_trees,
+        )
+
+    def attach_native_trees(self):
+        """
+        Rebuild sklearn's low-level Trees from the node table (for a forest
+        loaded from arrays) so large batches get Tree.apply again
+
+        Costs the sklearn import and one node copy per tree; swapped in with
+        a single assignment, so it can run while the forest is scoring
+        """
+        from sklearn.tree._tree import NODE_DTYPE, TREE_LEAF, TREE_UNDEFINED, Tree
+
+        bounds = np.append(self.roots, len(self.feature))
+        native_trees = []
+
+        for start, stop in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            node_ids = np.arange(stop - start)
+            left = self.children[2 * start:2 * stop:2] - start
+            right = self.children[2 * start + 1:2 * stop:2] - start
+            is_leaf = left == node_ids
+
+            nodes = np.zeros(stop - start, dtype=NODE_DTYPE)
+            nodes["left_child"] = np.where(is_leaf, TREE_LEAF, left)
+            nodes["right_child"] = np.where(is_leaf, TREE_LEAF, right)
+            nodes["feature"] = np.where(is_leaf, TREE_UNDEFINED, self.feature[start:stop])
+            nodes["threshold"] = np.where(is_leaf, TREE_UNDEFINED, self.threshold[start:stop])
+            nodes["n_node_samples"] = 1
+            nodes["weighted_n_node_samples"] = 1.0
+
+            tree = Tree(self.n_features, np.ones(1, dtype=np.intp), 1)
+            tree.__setstate__({
+                "max_depth": self.max_depth,
+                "node_count": stop - start,
+                "nodes": nodes,
+                "values": np.zeros((stop - start, 1, 1)),
+            })
+            # Node features are already forest-wide indices
+            native_trees.append((tree, None))
+
+        self.native_trees = native_trees
+
+    # ----------------------------
+    # SERIALIZATION
+    # ----------------------------
+
+    def to_arrays(self) -> dict:
+        """
+        Flat arrays (ARRAY_FIELDS) + scalar metadata, without sklearn objects
+        """
+        return {
+            "arrays": {name: getattr(self, name) for name in ARRAY_FIELDS},
+            "max_depth": self.max_depth,
+            "denominator": self.denominator,
+        }
+
+    @classmethod
+    def from_arrays(
+        cls,
+        arrays: dict,
+        max_depth: int,
+        denominator: float,
+    ) -> "CompiledForest":
+        """
+        Rebuild from flat arrays (no copy - arrays may be shared / mapped views)
+        Large batches use NumPy traversal since no sklearn trees are attached
+        """
+        return cls(
+            max_depth=max_depth,
+            denominator=denominator,
+            **{name: arrays[name] for name in ARRAY_FIELDS},
+        )
+
+    # ----------------------------
+    # SCORING
+    # ----------------------------
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """
+        StandardScaler.transform, then the float32 cast sklearn trees apply
+        """
+        X = np.asarray(X, dtype=np.float64)
+        return ((X - self.mean) / self.scale).astype(TREE_DTYPE)
+
+    def leaves(self, X_tree: np.ndarray) -> np.ndarray:
+        """
+        Leaf node reached in every tree, shape (n_trees, n_rows)
+        """
+        n_rows = X_tree.shape[0]
+
+        if self._use_native(n_rows):
+            return np.stack(list(self._iter_native_leaves(X_tree)))
+
+        # (n_features, n_rows) so a gather is X_t[feature, column]
+        X_t = np.ascontiguousarray(X_tree.T)
+        columns = np.arange(n_rows)
+
+        nodes = np.repeat(self.roots[:, None], n_rows, axis=1)
+        for _ in range(self.max_depth):
+            values = X_t[self.feature[nodes], columns]
+            go_right = values > self.threshold[nodes]
+            nodes = self.children[2 * nodes + go_right]
+
+        return nodes
+
+    def _use_native(self, n_rows: int) -> bool:
+        return self.native_trees is not None and n_rows >= NATIVE_MIN_ROWS
+
+    def _iter_native_leaves(self, X_tree: np.ndarray):
+        X_tree = np.ascontiguousarray(X_tree, dtype=TREE_DTYPE)
+        for root, (tree, tree_features) in zip(self.roots, self.native_trees):
+            X_subset = X_tree if tree_features is None else X_tree[:, tree_features]
+            yield tree.apply(np.ascontiguousarray(X_subset)) + root
+
+    def _depths(self, X_tree: np.ndarray) -> np.ndarray:
+        if self._use_native(X_tree.shape[0]):
+            # Tree by tree, exactly like sklearn's `depths +=` loop
+            depths = np.zeros(X_tree.shape[0])
+            for tree_leaves in self._iter_native_leaves(X_tree):
+                depths += self.leaf_depth[tree_leaves]
+            return depths
+
+        leaf_depths = self.leaf_depth[self.leaves(X_tree)]
+        # Sequential accumulation in tree order, exactly like sklearn's `depths +=`
+        return np.add.accumulate(leaf_depths, axis=0)[-1]
+
+    def score_samples(self, X_scaled: np.ndarray) -> np.ndarray:
+        """
+        Equivalent of IsolationForest.score_samples on already-scaled rows
+        """
+        return -self._score(np.asarray(X_scaled).astype(TREE_DTYPE))
+
+    def risk_scores(self, X: np.ndarray) -> np.ndarray:
+        """
+        Fused scale + score on raw feature rows
+        Returns -score_samples (higher = more anomalous)
+        """
+        return self._score(self.transform(X))
+
+    def _score(self, X_tree: np.ndarray) -> np.ndarray:
+        n_rows = X_tree.shape[0]
+        depths = np.empty(n_rows, dtype=np.float64)
+
+        for start in range(0, n_rows, CHUNK_ROWS):
+            stop = start + CHUNK_ROWS
+            depths[start:stop] = self._depths(X_tree[start:stop])
+
+        if self.denominator == 0:
+            # Single training sample: sklearn defines the score as 2 ** -1
+            return np.full(n_rows, 0.5)
+
+        return 2 ** (-np.divide(depths, self.denominator))
+
+    # ----------------------------
+    # ATTRIBUTION
+    # ----------------------------
+
+    def explain(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Risk scores + per-feature contributions, shape (n_rows, n_features),
+        from one traversal of every tree
+
+        Every node's leaf_depth is its depth + the expected remaining path
+        length c(n_node_samples), so a split that sends the row from node p
+        to child q shortens the expected path by
+            leaf_depth[p] - leaf_depth[q]
+        (positive when q holds far fewer samples than a balanced split would
+        leave). That gain goes to the feature p splits on. Along a path the
+        gains telescope to c(max_samples) - path length, so contributions
+        are additive in log2 of the score:
+            risk_score = 0.5 * 2 ** contributions.sum(axis=1)
+        Positive = the feature makes the transaction look anomalous.
+        Scores are identical to risk_scores().
+        """
+        X_tree = self.transform(X)
+        n_rows = X_tree.shape[0]
+        scores = np.empty(n_rows, dtype=np.float64)
+        contributions = np.empty((n_rows, self.n_features), dtype=np.float64)
+
+        for start in range(0, n_rows, CHUNK_ROWS):
+            stop = start + CHUNK_ROWS
+            depths, gains = self._explain_chunk(X_tree[start:stop])
+            scores[start:stop] = depths
+            contributions[start:stop] = gains
+
+        if self.denominator == 0:
+            return np.full(n_rows, 0.5), np.zeros_like(contributions)
+
+        return 2 ** (-np.divide(scores, self.denominator)), contributions / self.denominator
+
+    def _explain_chunk(self, X_tree: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        NumPy traversal (sklearn's Tree.apply only returns leaves) that sums
+        each step's depth gains per (feature, row) with one bincount
+        """
+        n_rows = X_tree.shape[0]
+        X_t = np.ascontiguousarray(X_tree.T)
+        columns = np.arange(n_rows)
+
+        gains = np.zeros(self.n_features * n_rows)
+        nodes = np.repeat(self.roots[:, None], n_rows, axis=1)
+        for _ in range(self.max_depth):
+            split_feature = self.feature[nodes]
+            values = X_t[split_feature, columns]
+            children = self.children[2 * nodes + (values > self.threshold[nodes])]
+            # Leaves loop on themselves: zero gain
+            gains += np.bincount(
+                (split_feature * n_rows + columns).ravel(),
+                weights=(self.leaf_depth[nodes] - self.leaf_depth[children]).ravel(),
+                minlength=len(gains),
+            )
+            nodes = children
+
+        # Same accumulation as _depths, so scores match risk_scores exactly
+        depths = np.add.accumulate(self.leaf_depth[nodes], axis=0)[-1]
+        return depths, gains.reshape(self.n_features, n_rows).T
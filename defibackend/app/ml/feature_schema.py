@@ -0,0 +1,154 @@
+"""
+Feature Schema
+The model's inputs, in order - one definition shared by training, model
+artifacts and every serving path
+Saved with each trained model and checked when the model is loaded
+"""
+import hashlib
+import itertools
+import json
+from operator import attrgetter
+from pathlib import Path
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+
+SCHEMA_VERSION = 1
+
+
+class FeatureSchemaMismatch(ValueError):
+    """
+    A model was trained on other features (or another order) than served
+    """
+
+
+class FeatureSchema:
+    """
+    Ordered feature names
+
+    Builds the float64 feature matrix the engine scores: one allocation,
+    filled straight from request attributes or from named columns.
+    """
+
+    def __init__(self, names: Sequence[str], version: int = SCHEMA_VERSION):
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate feature names: {list(names)}")
+        self.names = tuple(names)
+        self.version = version
+        # Always a tuple of values, even for a single feature
+        getter = attrgetter(*self.names)
+        self._values = getter if len(self.names) > 1 else lambda record: (getter(record),)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def index(self, name: str) -> int:
+        return self.names.index(name)
+
+    @property
+    def fingerprint(self) -> str:
+        return hashlib.sha256("\n".join(self.names).encode()).hexdigest()[:16]
+
+    # ----------------------------
+    # PERSISTENCE
+    # ----------------------------
+
+    def to_dict(self) -> dict:
+        return {
+            "version": self.version,
+            "names": list(self.names),
+            "fingerprint": self.fingerprint,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FeatureSchema":
+        return cls(data["names"], data.get("version", SCHEMA_VERSION))
+
+    @classmethod
+    def from_manifest(cls, manifest: dict) -> "FeatureSchema":
+        # Artifacts exported before the schema was stored only list the names
+        if "feature_schema" in manifest:
+            return cls.from_dict(manifest["feature_schema"])
+        return cls(manifest["features"])
+
+    def save(self, path):
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self.to_dict(), indent=2))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path) -> "FeatureSchema":
+        return cls.from_dict(json.loads(Path(path).read_text()))
+
+    def require(self, trained: "FeatureSchema", source: str):
+        """
+        Refuse a model trained on anything but these features in this order
+        """
+        if trained.names == self.names:
+            return
+        differences = [
+            f"#{i} {model_name} != {served_name}"
+            for i, (model_name, served_name) in enumerate(
+                itertools.zip_longest(trained.names, self.names, fillvalue="-")
+            )
+            if model_name != served_name
+        ]
+        raise FeatureSchemaMismatch(
+            f"{source} was trained on features {list(trained.names)}, "
+            f"served features are {list(self.names)} ({', '.join(differences)})"
+        )
+
+    # ----------------------------
+    # MATRICES
+    # ----------------------------
+
+    def matrix(self, records: Sequence) -> np.ndarray:
+        """
+        (n, len(self)) C-contiguous float64 from objects with one attribute
+        per feature (PredictRequest), read in one pass into one buffer
+        Missing (None) values become NaN - see check_matrix()
+        """
+        n, k = len(records), len(self.names)
+        values = np.fromiter(
+            itertools.chain.from_iterable(map(self._values, records)),
+            dtype=np.float64,
+            count=n * k,
+        )
+        return values.reshape(n, k)
+
+    def from_columns(self, columns: Mapping[str, Sequence]) -> np.ndarray:
+        """
+        (n, len(self)) float64 from one array per feature name (Parquet
+        batches, DataFrames...) - picked by name, so column order is irrelevant
+        """
+        missing = [name for name in self.names if name not in columns]
+        if missing:
+            raise FeatureSchemaMismatch(f"Missing feature columns {missing}")
+
+        n_rows = len(columns[self.names[0]])
+        X = np.empty((n_rows, len(self.names)))
+        for j, name in enumerate(self.names):
+            X[:, j] = columns[name]
+        return X
+
+    def to_dicts(self, X: np.ndarray) -> List[Dict[str, float]]:
+        """
+        One {feature: value} per matrix row (JSON responses)
+        """
+        return [dict(zip(self.names, row)) for row in X.tolist()]
+
+    def check_matrix(self, X: np.ndarray):
+        """
+        Once per batch: shape and missing (NaN) values
+        """
+        if X.ndim != 2 or X.shape[1] != len(self.names):
+            raise ValueError(
+                f"Expected a (n, {len(self.names)}) feature matrix "
+                f"[{', '.join(self.names)}], got {X.shape}"
+            )
+        missing = np.isnan(X).any(axis=1)
+        if missing.any():
+            row = int(np.argmax(missing))
+            names = [name for name, value in zip(self.names, X[row]) if np.isnan(value)]
+            raise ValueError(f"Row {row}: missing feature values {names}")
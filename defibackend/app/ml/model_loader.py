@@ -1,6 +1,15 @@
-import joblib
+import threading
+import time
 from pathlib import Path
 
+import numpy as np
+
+from app.ml.artifact import MANIFEST_NAME, ModelArtifact, fingerprint
+from app.ml.compiled_forest import CompiledForest
+from app.ml.feature_schema import FeatureSchema, FeatureSchemaMismatch
+from app.ml.registry import ModelRegistry
+from config.settings import settings
+
 # Absolute path to app/
 APP_DIR = Path(__file__).resolve().parent.parent
 
@@ -9,13 +18,29 @@ MODEL_DIR = APP_DIR / "models"
 
 MODEL_PATH = MODEL_DIR / "isolation_forest.pkl"
 SCALER_PATH = MODEL_DIR / "scaler.pkl"
+# Features the pickles were trained on (written by scripts/train_model.py)
+FEATURE_SCHEMA_PATH = MODEL_DIR / "feature_schema.json"
+# Flat-array export of the compiled forest, opened with mmap (scripts/train_model.py)
+ARTIFACT_DIR = MODEL_DIR / "forest"
+# Versioned artifacts + CURRENT / CANDIDATE pointers (scripts/model_registry.py)
+REGISTRY_DIR = (
+    Path(settings.MODEL_REGISTRY_DIR) if settings.MODEL_REGISTRY_DIR
+    else MODEL_DIR / "registry"
+)
+# Score -> percentile table built from prediction history (scripts/calibrate.py)
+CALIBRATION_PATH = MODEL_DIR / "calibration.npz"
+
+# "auto": registry CURRENT, else the mmap artifact, else the pickles
+MODEL_FORMATS = ("auto", "mmap", "pickle")
 
-FEATURES = [
+# Model inputs, in order: training, artifacts and serving all use this
+FEATURE_SCHEMA = FeatureSchema([
     "amount_usd",
     "tx_count_user",
     "rolling_volume_user",
     "relative_amount",
-]
+])
+FEATURES = list(FEATURE_SCHEMA.names)
 
 
 class ModelLoader:
@@ -28,12 +53,115 @@ class ModelLoader:
         return cls._instance
 
     def _load_models(self):
-        ...
+        start = time.perf_counter()
+        model_format = settings.MODEL_FORMAT
+        if model_format not in MODEL_FORMATS:
+            raise ValueError(
+                f"Unknown model format '{model_format}', expected one of {MODEL_FORMATS}"
+            )
+
+        self.registry = ModelRegistry(REGISTRY_DIR)
+        registry_version = self.registry.current() if model_format == "auto" else None
+
+        self.artifact = None
+        if registry_version is not None:
+            self._load_artifact(
+                self.registry.open(registry_version, FEATURE_SCHEMA), registry_version, "registry"
+            )
+        elif model_format == "mmap" or (
+            model_format == "auto" and (ARTIFACT_DIR / MANIFEST_NAME).exists()
+        ):
+            self._load_artifact(ModelArtifact(ARTIFACT_DIR, FEATURE_SCHEMA), settings.MODEL_VERSION, "mmap")
+        else:
+            self._load_pickles()
+
+        self.load_seconds = time.perf_counter() - start
+        print(f"✅ Model {self.version} loaded ({self.format}, {self.load_seconds * 1000:.1f} ms)")
+
+    def _load_artifact(self, artifact: ModelArtifact, version: str, model_format: str):
+        self._use_artifact(artifact, version, model_format)
+
+        if settings.MODEL_NATIVE_TREES:
+            threading.Thread(
+                target=self.attach_native_trees, args=(self.engine,),
+                name="native-trees", daemon=True,
+            ).start()
+
+    def _use_artifact(self, artifact: ModelArtifact, version: str, model_format: str):
+        # Only the compiled forest exists in this format
+        self.artifact = artifact
+        self.model = None
+        self.scaler = None
+        self.engine = artifact.engine
+        self.fingerprint = artifact.fingerprint
+        self.version = version
+        self.format = model_format
+
+    def swap(self, artifact: ModelArtifact, version: str):
+        """
+        Make a registry version the loaded model (InferenceService hot reload)
+        """
+        self._use_artifact(artifact, version, "registry")
+
+    @staticmethod
+    def attach_native_trees(engine: CompiledForest):
+        try:
+            engine.attach_native_trees()
+        except Exception as e:
+            # Large batches keep the NumPy traversal
+            print(f"⚠️ Native trees not rebuilt: {e}")
+
+    def _load_pickles(self):
+        # Unpickling the forest imports sklearn
+        import joblib
+
+        self.check_pickle_schema()
         self.model = joblib.load(MODEL_PATH)
         self.scaler = joblib.load(SCALER_PATH)
 
-    def validate_features(self, features: list[float]):
-        if len(features) != 4:
-            raise ValueError(
-                f"Expected 4 features, got {len(features)}"
+        # Flat-array copy of scaler + forest used on the hot path
+        self.engine = CompiledForest.from_sklearn(self.model, self.scaler)
+        self.fingerprint = fingerprint(self.engine)
+        self.version = settings.MODEL_VERSION
+        self.format = "pickle"
+
+    @staticmethod
+    def check_pickle_schema():
+        """
+        Pickles carry no feature names: refuse them without the schema
+        they were trained with, or with a different one
+        """
+        if not FEATURE_SCHEMA_PATH.exists():
+            raise FeatureSchemaMismatch(
+                f"No feature schema next to {MODEL_PATH} ({FEATURE_SCHEMA_PATH.name}) - "
+                f"retrain with scripts/train_model.py"
             )
+        FEATURE_SCHEMA.require(FeatureSchema.load(FEATURE_SCHEMA_PATH), f"Model {MODEL_PATH}")
+
+    def get_info(self) -> dict:
+        return {
+            "model_type": "IsolationForest",
+            "model_version": self.version,
+            "fingerprint": self.fingerprint,
+            "format": self.format,
+            "feature_count": len(FEATURES),
+            "feature_names": FEATURES,
+            "feature_schema": FEATURE_SCHEMA.to_dict(),
+            "n_trees": self.engine.n_trees,
+            "native_trees": self.engine.native_trees is not None,
+            "load_ms": self.load_seconds * 1000,
+            "artifact": (
+                {
+                    "path": str(self.artifact.directory),
+                    "created_at": self.artifact.manifest["created_at"],
+                    "bytes": self.artifact.nbytes,
+                }
+                if self.artifact is not None else None
+            ),
+        }
+
+    def validate_features(self, X: np.ndarray):
+        """
+        Shape + missing values of a whole feature matrix (once per batch)
+        """
+        FEATURE_SCHEMA.check_matrix(X)
@@ -0,0 +1,131 @@
+"""
+Model Registry
+Versioned model artifacts in one directory + which version serves traffic
+Every worker watches the same directory, so one activate() reaches all of them
+"""
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from app.ml.artifact import MANIFEST_NAME, ModelArtifact, export_artifact
+from app.ml.compiled_forest import CompiledForest
+from app.ml.feature_schema import FeatureSchema
+
+VERSION_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$")
+
+CURRENT_NAME = "CURRENT"
+CANDIDATE_NAME = "CANDIDATE"
+
+
+class ModelRegistry:
+    """
+    <root>/<version>/   one artifact per version (manifest with sha256)
+    <root>/CURRENT      version serving traffic
+    <root>/CANDIDATE    version scored in shadow (optional)
+
+    Versions are immutable once published; pointer files are replaced
+    atomically, so a reader sees the old version or the new one.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    # ----------------------------
+    # VERSIONS
+    # ----------------------------
+
+    def _version_dir(self, version: str) -> Path:
+        if not VERSION_PATTERN.match(version):
+            raise ValueError(f"Invalid model version '{version}'")
+        return self.root / version
+
+    def exists(self, version: str) -> bool:
+        return (self._version_dir(version) / MANIFEST_NAME).exists()
+
+    def publish(
+        self,
+        version: str,
+        engine: CompiledForest,
+        schema: FeatureSchema,
+    ) -> Path:
+        """
+        Store a compiled forest as a new version (not activated)
+        """
+        target = self._version_dir(version)
+        if target.exists():
+            raise ValueError(f"Model version '{version}' already exists")
+
+        # Exported next to its final place, then moved in one rename
+        staging = self.root / f".{version}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        export_artifact(engine, staging, schema)
+        staging.rename(target)
+        return target
+
+    def open(self, version: str, schema: FeatureSchema) -> ModelArtifact:
+        """
+        Map a version, checksum and feature schema verified
+        """
+        if not self.exists(version):
+            raise KeyError(f"Unknown model version '{version}'")
+        return ModelArtifact(self._version_dir(version), schema, verify=True)
+
+    def versions(self) -> List[dict]:
+        if not self.root.exists():
+            return []
+        current, candidate = self.pointers()
+        versions = []
+        for manifest_path in sorted(self.root.glob(f"*/{MANIFEST_NAME}")):
+            version = manifest_path.parent.name
+            if version.startswith("."):
+                continue
+            manifest = ModelArtifact.read_manifest(manifest_path.parent)
+            versions.append({
+                "version": version,
+                "fingerprint": manifest["fingerprint"],
+                "created_at": manifest["created_at"],
+                "n_trees": manifest["n_trees"],
+                "features": manifest["features"],
+                "current": version == current,
+                "candidate": version == candidate,
+            })
+        return versions
+
+    # ----------------------------
+    # POINTERS
+    # ----------------------------
+
+    def _read_pointer(self, name: str) -> Optional[str]:
+        try:
+            return (self.root / name).read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _write_pointer(self, name: str, version: Optional[str]):
+        path = self.root / name
+        if version is None:
+            path.unlink(missing_ok=True)
+            return
+        if not self.exists(version):
+            raise KeyError(f"Unknown model version '{version}'")
+
+        tmp_path = path.with_name(f"{name}.{os.getpid()}.tmp")
+        tmp_path.write_text(version + "\n")
+        tmp_path.replace(path)
+
+    def pointers(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        (current, candidate) versions
+        """
+        return self._read_pointer(CURRENT_NAME), self._read_pointer(CANDIDATE_NAME)
+
+    def current(self) -> Optional[str]:
+        return self._read_pointer(CURRENT_NAME)
+
+    def activate(self, version: str):
+        self._write_pointer(CURRENT_NAME, version)
+
+    def set_candidate(self, version: Optional[str]):
+        self._write_pointer(CANDIDATE_NAME, version)
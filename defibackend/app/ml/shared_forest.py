@@ -0,0 +1,86 @@
+"""
+Shared Forest
+Publishes a CompiledForest into one shared memory block
+Worker processes attach to it without copying the model
+"""
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from app.ml.compiled_forest import CompiledForest
+
+# Keep every array 64-byte aligned inside the block
+ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def array_layout(arrays: dict):
+    """
+    Aligned placement of arrays in one buffer
+    Returns ({name: (offset, shape, dtype str)}, total size)
+    """
+    layout = {}
+    size = 0
+    for name, array in arrays.items():
+        offset = _align(size)
+        layout[name] = (offset, array.shape, array.dtype.str)
+        size = offset + array.nbytes
+    return layout, size
+
+
+class SharedForest:
+    """
+    Owner side of a shared compiled forest
+
+    `spec` is a small picklable dict (block name, array layout, metadata)
+    that workers pass to `attach` to get zero-copy views of the arrays.
+    """
+
+    def __init__(self, engine: CompiledForest):
+        exported = engine.to_arrays()
+        layout, size = array_layout(exported["arrays"])
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+        for name, array in exported["arrays"].items():
+            offset, shape, dtype = layout[name]
+            view = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+            view[...] = array
+
+        self.spec = {
+            "name": self.shm.name,
+            "layout": layout,
+            "max_depth": exported["max_depth"],
+            "denominator": exported["denominator"],
+        }
+
+    def close(self):
+        """
+        Release and unlink the block (owner only)
+        """
+        self.shm.close()
+        self.shm.unlink()
+
+
+def attach(spec: dict):
+    """
+    Attach to a published forest
+    Returns (engine, shm) - keep shm referenced while the engine is in use
+    """
+    shm = shared_memory.SharedMemory(name=spec["name"])
+
+    arrays = {}
+    for name, (offset, shape, dtype) in spec["layout"].items():
+        array = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+        array.flags.writeable = False
+        arrays[name] = array
+
+    engine = CompiledForest.from_arrays(
+        arrays,
+        max_depth=spec["max_depth"],
+        denominator=spec["denominator"],
+    )
+    return engine, shm
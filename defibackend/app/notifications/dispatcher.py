@@ -0,0 +1,192 @@
+"""
+Notification Dispatcher
+Long-lived, rate-limited delivery of alert notifications to Telegram
+Bursts of alerts for one chat are coalesced into a single digest message
+"""
+import asyncio
+import time
+from typing import Callable, Dict, List
+
+from app.notifications.telegram_client import TelegramClient, TelegramError
+from app.schemas.models import AlertRecord
+from app.services.rate_limit import RateLimiter, TokenBucket
+
+
+class NotificationDispatcher:
+    """
+        notify(chat, alert) --> per-chat buffer --> [ready chats] --> workers
+
+    - A chat is queued once; alerts arriving while it waits (for its
+      per-chat token or a free worker) join its buffer and go out together
+      as one digest message
+    - Per-chat token buckets (Telegram: ~1 message/s per chat) and a global
+      one (~30 messages/s per bot); a chat over its limit is rescheduled
+      for when its next token is due instead of blocking a worker
+    - Retries with exponential backoff; Telegram's retry_after is honoured
+    - All sends share the TelegramClient's pooled connection
+    """
+
+    def __init__(
+        self,
+        client: TelegramClient,
+        format_alerts: Callable[[List[AlertRecord], int], str],
+        global_rate_per_sec: float = 30.0,
+        chat_rate_per_sec: float = 1.0,
+        max_digest_alerts: int = 20,
+        max_buffered: int = 10_000,
+        max_retries: int = 3,
+        workers: int = 4,
+    ):
+        self.client = client
+        self.format_alerts = format_alerts
+        # Burst of 1: Telegram counts messages over a sliding second
+        self.global_limiter = RateLimiter(global_rate_per_sec, burst=1)
+        self.chat_rate = chat_rate_per_sec
+        self.max_digest_alerts = max_digest_alerts
+        self.max_buffered = max_buffered
+        self.max_retries = max_retries
+        self.workers = workers
+
+        self._buffers: Dict[str, List[AlertRecord]] = {}
+        self._buffered = 0
+        self._delivering = 0
+        self._chat_buckets: Dict[str, TokenBucket] = {}
+        self._ready: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+
+        # Metrics
+        self.alerts_received = 0
+        self.alerts_coalesced = 0
+        self.alerts_dropped = 0
+        self.messages_sent = 0
+        self.digests_sent = 0
+        self.alerts_delivered = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.failed = 0
+        self.deferred = 0
+
+    # ----------------------------
+    # LIFECYCLE
+    # ----------------------------
+
+    async def start(self):
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, drain_timeout: float = 5.0):
+        """
+        Give buffered notifications a moment to go out, then stop
+        """
+        deadline = time.monotonic() + drain_timeout
+        while (self._buffers or self._delivering) and self._tasks and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.client.close()
+
+    # ----------------------------
+    # QUEUEING
+    # ----------------------------
+
+    def notify(self, chat_id: str, alert: AlertRecord):
+        self.alerts_received += 1
+        if self._buffered >= self.max_buffered:
+            self.alerts_dropped += 1
+            return
+
+        buffer = self._buffers.get(chat_id)
+        if buffer is None:
+            self._buffers[chat_id] = [alert]
+            self._ready.put_nowait(chat_id)
+        else:
+            buffer.append(alert)
+            self.alerts_coalesced += 1
+        self._buffered += 1
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= self.max_buffered:
+                # Forget chats that are back to a full bucket
+                self._chat_buckets = {
+                    chat: b for chat, b in self._chat_buckets.items() if not b.is_idle()
+                }
+            bucket = self._chat_buckets[chat_id] = TokenBucket(self.chat_rate, burst=1)
+        return bucket
+
+    # ----------------------------
+    # DELIVERY
+    # ----------------------------
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            chat_id = await self._ready.get()
+
+            wait = self._chat_bucket(chat_id).reserve()
+            if wait > 0:
+                # Keep collecting this chat's alerts until its token is due
+                self.deferred += 1
+                loop.call_later(wait, self._ready.put_nowait, chat_id)
+                continue
+
+            alerts = self._buffers.pop(chat_id)
+            self._buffered -= len(alerts)
+
+            self._delivering += 1
+            try:
+                await self._deliver(chat_id, alerts)
+            except Exception as e:
+                self.failed += 1
+                print(f"⚠️ Telegram notification to {chat_id} failed ({len(alerts)} alerts): {e}")
+            finally:
+                self._delivering -= 1
+
+    async def _deliver(self, chat_id: str, alerts: List[AlertRecord]):
+        text = self.format_alerts(alerts[: self.max_digest_alerts], len(alerts))
+
+        backoff = 1.0
+        for attempt in range(self.max_retries + 1):
+            await self.global_limiter.acquire()
+            try:
+                await self.client.send_message(chat_id, text)
+                break
+            except TelegramError as e:
+                if not e.retryable or attempt == self.max_retries:
+                    raise
+                self.retries += 1
+                if e.retry_after is not None:
+                    self.rate_limited += 1
+                    await asyncio.sleep(e.retry_after)
+                else:
+                    await asyncio.sleep(backoff)
+                    backoff *= 2
+
+        self.messages_sent += 1
+        self.digests_sent += len(alerts) > 1
+        self.alerts_delivered += len(alerts)
+
+    # ----------------------------
+    # METRICS
+    # ----------------------------
+
+    def get_metrics(self) -> dict:
+        return {
+            "buffered_alerts": self._buffered,
+            "chats_waiting": len(self._buffers),
+            "ready_queue": self._ready.qsize(),
+            "alerts_received": self.alerts_received,
+            "alerts_coalesced": self.alerts_coalesced,
+            "alerts_dropped": self.alerts_dropped,
+            "alerts_delivered": self.alerts_delivered,
+            "messages_sent": self.messages_sent,
+            "digests_sent": self.digests_sent,
+            "deferred": self.deferred,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "failed": self.failed,
+            "global_rate_waits": self.global_limiter.waits,
+        }
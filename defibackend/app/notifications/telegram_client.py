@@ -1,16 +1,54 @@
+from typing import Optional
+
 import httpx
 from config.settings import settings
 
+
+class TelegramError(Exception):
+    """
+    Bot API call failed
+    retry_after is set when Telegram asked us to slow down (HTTP 429)
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        # 429 / 5xx / network errors; other 4xx (bad chat id, bot blocked) won't succeed later
+        return self.status_code is None or self.status_code == 429 or self.status_code >= 500
+
+
 class TelegramClient:
-    def __init__(self):
+    def __init__(self, max_connections: int = 20, timeout_seconds: float = 10.0):
         if not settings.TELEGRAM_BOT_TOKEN:
             raise RuntimeError("TELEGRAM_BOT_TOKEN not set")
 
-        self.base_url = f"https://api.telegram.org/bot{settings.TELEGRAM_BOT_TOKEN}"
+        self.base_url = f"{settings.TELEGRAM_API_URL.rstrip('/')}/bot{settings.TELEGRAM_BOT_TOKEN}"
+        self._timeout = timeout_seconds
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self._http: Optional[httpx.AsyncClient] = None
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        # One pooled client (keep-alive), created lazily on the running loop
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(timeout=self._timeout, limits=self._limits)
+        return self._http
+
+    async def close(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
     async def send_message(self, chat_id: str, text: str):
-        async with httpx.AsyncClient(timeout=10) as client:
-            await client.post(
+        try:
+            response = await self.http.post(
                 f"{self.base_url}/sendMessage",
                 json={
                     "chat_id": chat_id,
@@ -18,3 +56,18 @@ class TelegramClient:
                     "parse_mode": "Markdown"
                 }
             )
+        except httpx.HTTPError as e:
+            raise TelegramError(f"Telegram request failed: {e}") from e
+
+        if response.status_code == 200:
+            return
+
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+        raise TelegramError(
+            f"Telegram error {response.status_code}: {data.get('description', response.text)}",
+            status_code=response.status_code,
+            retry_after=(data.get("parameters") or {}).get("retry_after"),
+        )
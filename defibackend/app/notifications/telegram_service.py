@@ -1,5 +1,9 @@
+from typing import List
+
+from app.notifications.dispatcher import NotificationDispatcher
 from app.notifications.telegram_client import TelegramClient
 from app.schemas.models import AlertRecord
+from config.settings import settings
 
 telegram = TelegramClient()
 
@@ -17,6 +21,46 @@ def format_alert(alert: AlertRecord) -> str:
 🔎 Action: Manual review recommended
 """
 
+def format_digest(alerts: List[AlertRecord], total: int) -> str:
+    if total == 1:
+        return format_alert(alerts[0])
+
+    # A chat can watch several wallets
+    wallets = {alert.wallet_address for alert in alerts}
+    one_wallet = len(wallets) == 1
+
+    lines = [
+        f"⚠️ {alert.risk_level.upper()} · ${alert.amount_usd:,.2f} · "
+        f"score {alert.risk_score:.3f} · {alert.timestamp.strftime('%H:%M:%S')}"
+        + ("" if one_wallet else f" · `{alert.wallet_address}`")
+        for alert in alerts
+    ]
+    if total > len(alerts):
+        lines.append(f"… and {total - len(alerts)} more")
+
+    header = f"👛 *Wallet:* `{alerts[0].wallet_address}`" if one_wallet else f"👛 *Wallets:* {len(wallets)}"
+    newline = "\n"
+    return f"""
+🚨 *DEFI RISK ALERTS ({total})*
+
+{header}
+
+{newline.join(lines)}
+
+🔎 Action: Manual review recommended
+"""
+
+dispatcher = NotificationDispatcher(
+    telegram,
+    format_digest,
+    global_rate_per_sec=settings.TELEGRAM_GLOBAL_RATE_PER_SEC,
+    chat_rate_per_sec=settings.TELEGRAM_CHAT_RATE_PER_SEC,
+    max_digest_alerts=settings.TELEGRAM_MAX_DIGEST_ALERTS,
+    max_buffered=settings.TELEGRAM_MAX_BUFFERED_ALERTS,
+    max_retries=settings.TELEGRAM_MAX_RETRIES,
+    workers=settings.TELEGRAM_WORKERS,
+)
+
 async def notify_telegram(chat_id: str, alert: AlertRecord):
-    message = format_alert(alert)
-    await telegram.send_message(chat_id, message)
+    # Queued: the dispatcher sends (or folds into a digest) under rate limits
+    dispatcher.notify(chat_id, alert)
@@ -3,7 +3,7 @@ Pydantic schemas for request/response validation
 Clean API contracts and type safety
 """
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from enum import Enum
 
@@ -17,12 +17,13 @@ class RiskLevel(str, Enum):
 class PredictRequest(BaseModel):
     """
     Request schema for transaction risk prediction
-    All features required for model inference
+    Wallet features may be omitted when wallet_address is given -
+    they are then filled from the server-side wallet feature store
     """
     amount_usd: float = Field(..., gt=0, description="Transaction amount in USD")
-    tx_count_user: int = Field(..., ge=0, description="Total transaction count by this wallet")
-    rolling_volume_user: float = Field(..., ge=0, description="Recent volume surge for this wallet")
-    relative_amount: float = Field(..., ge=0, description="Transaction size relative to wallet history")
+    tx_count_user: Optional[int] = Field(None, ge=0, description="Total transaction count by this wallet")
+    rolling_volume_user: Optional[float] = Field(None, ge=0, description="Recent volume surge for this wallet")
+    relative_amount: Optional[float] = Field(None, ge=0, description="Transaction size relative to wallet history")
 
     # Optional metadata (not used in model)
     whale_tx: int = Field(0, ge=0, le=1, description="Binary flag: whale transaction (metadata only)")
@@ -45,6 +46,8 @@ class PredictResponse(BaseModel):
     is_alert: bool = Field(..., description="Whether this triggers an alert")
     threshold: float = Field(..., description="Alert threshold used")
     confidence: float = Field(..., description="Model confidence (0-1)")
+    risk_percentile: Optional[float] = Field(None, description="Calibrated percentile of the score in prediction history (0-100)")
+    feature_contributions: Optional[Dict[str, float]] = Field(None, description="Per-feature share of the score with ?explain=true (log2 units: risk_score = 0.5 * 2^sum, positive = anomalous)")
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     
     # Optional blockchain tracking
@@ -103,6 +106,7 @@ class AlertListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
 
 class SystemStats(BaseModel):
     """
@@ -0,0 +1,145 @@
+"""
+Inference Batcher
+Coalesces concurrent single predictions into one batch_inference call
+Fixed per-call cost (scaling + forest setup) is paid once per window
+"""
+import asyncio
+import time
+from typing import List, Optional, Set, Tuple
+
+from app.schemas.models import PredictRequest
+from app.services.inference import InferenceService
+
+
+class InferenceBatcher:
+    """
+    Asyncio micro-batcher in front of InferenceService
+
+    A batch is flushed when either:
+        - max_batch_size requests are waiting, or
+        - max_wait_ms has elapsed since the first request of the window
+    so no request waits longer than max_wait_ms before being scored.
+    """
+
+    def __init__(
+        self,
+        inference_service: InferenceService,
+        max_batch_size: int = 256,
+        max_wait_ms: float = 2.0,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be non-negative")
+
+        self.inference_service = inference_service
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._pending: List[Tuple[PredictRequest, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._in_flight: Set[asyncio.Task] = set()
+
+        # Metrics
+        self.requests_total = 0
+        self.rows_batched = 0
+        self.batches_total = 0
+        self.last_batch_size = 0
+        self.max_batch_seen = 0
+        self.max_wait_seen_ms = 0.0
+        self.size_flushes = 0
+        self.timer_flushes = 0
+
+    async def submit(self, request: PredictRequest) -> float:
+        """
+        Queue a request for the next batch and wait for its risk score
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        self._pending.append((request, future, time.perf_counter()))
+        self.requests_total += 1
+
+        if len(self._pending) >= self.max_batch_size:
+            self.size_flushes += 1
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._on_timer)
+
+        return await future
+
+    def _on_timer(self):
+        self._timer = None
+        if self._pending:
+            self.timer_flushes += 1
+            self._flush()
+
+    def _flush(self):
+        """
+        Hand everything pending to the executor as one batch
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+
+        flushed_at = time.perf_counter()
+        oldest_wait_ms = (flushed_at - batch[0][2]) * 1000
+
+        self.batches_total += 1
+        self.rows_batched += len(batch)
+        self.last_batch_size = len(batch)
+        self.max_batch_seen = max(self.max_batch_seen, len(batch))
+        self.max_wait_seen_ms = max(self.max_wait_seen_ms, oldest_wait_ms)
+
+        # Scoring runs on the inference executor; keep the task referenced
+        task = asyncio.ensure_future(self._score_batch(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _score_batch(self, batch):
+        """
+        Score one batch and fan results out to the waiting requests
+        """
+        try:
+            scores = await self.inference_service.batch_inference_async(
+                [request for request, _, _ in batch]
+            )
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), score in zip(batch, scores):
+            # Caller may have been cancelled (client disconnect)
+            if not future.done():
+                future.set_result(score)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def get_metrics(self) -> dict:
+        """
+        Batching metrics for monitoring
+        """
+        return {
+            "queue_depth": self.queue_depth,
+            "batches_in_flight": len(self._in_flight),
+            "requests_total": self.requests_total,
+            "batches_total": self.batches_total,
+            "avg_batch_size": (
+                self.rows_batched / self.batches_total
+                if self.batches_total > 0
+                else 0.0
+            ),
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size_seen": self.max_batch_seen,
+            "max_wait_seen_ms": self.max_wait_seen_ms,
+            "size_flushes": self.size_flushes,
+            "timer_flushes": self.timer_flushes,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
@@ -0,0 +1,279 @@
+"""
+Score Calibration
+Empirical CDF of historical risk scores as a compact quantile lookup table
+Raw Isolation Forest scores -> percentiles (0-100), whole batches at once
+"""
+import asyncio
+import bisect
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+CALIBRATION_VERSION = 1
+
+
+class CalibrationTable:
+    """
+    knots[i] is the score below which a fraction i / (n - 1) of the
+    history falls; the CDF is linear between knots
+
+    A few thousand knots keep the error well under 0.1 percentile
+    while the table stays a few KB (vs the full score history)
+    """
+
+    def __init__(
+        self,
+        knots: np.ndarray,
+        sample_count: int,
+        model_version: str = "",
+        built_at: Optional[datetime] = None,
+    ):
+        knots = np.ascontiguousarray(knots, dtype=np.float64)
+        if knots.ndim != 1 or len(knots) < 2:
+            raise ValueError("Calibration table needs at least 2 knots")
+        if np.any(np.diff(knots) < 0):
+            raise ValueError("Calibration knots must be sorted")
+
+        self.knots = knots
+        # Percentile per unit of score on each segment (0 on flat ones)
+        spans = np.diff(knots)
+        self._slopes = np.zeros(len(knots), dtype=np.float64)
+        np.divide(100.0 / len(spans), spans, out=self._slopes[1:], where=spans > 0)
+        # Python copies for single-score lookups (no numpy call overhead)
+        self._knot_list = knots.tolist()
+        self._slope_list = self._slopes.tolist()
+        self.sample_count = sample_count
+        self.model_version = model_version
+        self.built_at = built_at or datetime.utcnow()
+
+    @classmethod
+    def from_scores(
+        cls,
+        scores: np.ndarray,
+        n_knots: int = 2048,
+        model_version: str = "",
+    ) -> "CalibrationTable":
+        """
+        Build the table from historical risk scores
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        scores = scores[np.isfinite(scores)]
+        if len(scores) < 2:
+            raise ValueError(f"Need at least 2 scores to calibrate, got {len(scores)}")
+
+        knots = np.quantile(scores, np.linspace(0.0, 1.0, n_knots))
+        return cls(knots, len(scores), model_version)
+
+    def __len__(self) -> int:
+        return len(self.knots)
+
+    # ----------------------------
+    # LOOKUP
+    # ----------------------------
+
+    def percentiles(self, scores) -> np.ndarray:
+        """
+        Calibrated percentile (0-100) of each score
+        One searchsorted over the batch - O(batch * log knots)
+        """
+        x = np.asarray(scores, dtype=np.float64)
+        knots = self.knots
+        last = len(knots) - 1
+        step = 100.0 / last
+
+        # side="right": a score equal to a run of knots lands after it,
+        # i.e. at the share of history <= score
+        idx = np.searchsorted(knots, x, side="right")
+        np.clip(idx, 1, last, out=idx)
+
+        # Knot below + linear step within the segment (capped at one step)
+        within = (x - knots[idx - 1]) * self._slopes[idx]
+        np.clip(within, 0.0, step, out=within)
+        percentiles = (idx - 1) * step + within
+
+        # At / above the top knot (the last segment may be flat)
+        percentiles[x >= knots[-1]] = 100.0
+        return percentiles
+
+    def percentile(self, score: float) -> float:
+        """
+        percentiles() for one score (the /predict path)
+        """
+        knots = self._knot_list
+        last = len(knots) - 1
+        if score >= knots[-1]:
+            return 100.0
+
+        step = 100.0 / last
+        idx = min(max(bisect.bisect_right(knots, score), 1), last)
+        within = (score - knots[idx - 1]) * self._slope_list[idx]
+        return (idx - 1) * step + min(max(within, 0.0), step)
+
+    def score_at(self, percentile: float) -> float:
+        """
+        Raw score at a calibrated percentile (inverse of percentiles)
+        """
+        levels = np.linspace(0.0, 100.0, len(self.knots))
+        return float(np.interp(percentile, levels, self.knots))
+
+    # ----------------------------
+    # PERSISTENCE
+    # ----------------------------
+
+    def save(self, path) -> None:
+        """
+        Write the table to .npz (atomic replace - readers never see half a file)
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                version=CALIBRATION_VERSION,
+                knots=self.knots,
+                sample_count=self.sample_count,
+                model_version=self.model_version,
+                built_at=self.built_at.isoformat(),
+            )
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path) -> "CalibrationTable":
+        with np.load(path) as data:
+            if int(data["version"]) != CALIBRATION_VERSION:
+                raise ValueError(f"Unsupported calibration table version {data['version']}")
+            return cls(
+                data["knots"],
+                int(data["sample_count"]),
+                str(data["model_version"]),
+                datetime.fromisoformat(str(data["built_at"])),
+            )
+
+    def get_info(self) -> dict:
+        return {
+            "knots": len(self.knots),
+            "sample_count": self.sample_count,
+            "model_version": self.model_version,
+            "built_at": self.built_at.isoformat(),
+            "min_score": float(self.knots[0]),
+            "median_score": self.score_at(50.0),
+            "max_score": float(self.knots[-1]),
+        }
+
+
+class CalibrationStore:
+    """
+    The current CalibrationTable, hot-swapped when its file changes
+
+    The file is polled for a new mtime and the table replaced with one
+    reference assignment: a batch that already grabbed `table` finishes
+    on it, the next one sees the new table. Every worker process watches
+    the same file, so one save() reaches all of them without a restart.
+    Only a table built from model_version's scores is used; another
+    model's score distribution would give meaningless cutoffs.
+    """
+
+    def __init__(
+        self,
+        path,
+        reload_interval_seconds: float = 10.0,
+        model_version: str = "",
+    ):
+        self.path = Path(path)
+        self.reload_interval = reload_interval_seconds
+        self.model_version = model_version
+        self.table: Optional[CalibrationTable] = None
+        self._mtime: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        # Version check + swap vs a model change on the registry thread
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.reloads = 0
+        self.reload_errors = 0
+        self.version_mismatches = 0
+        self.loaded_at: Optional[float] = None
+
+    def set_table(self, table: Optional[CalibrationTable]):
+        self.table = table
+        self.loaded_at = time.time()
+
+    def set_model_version(self, model_version: str):
+        """
+        The serving model changed: drop a table built for another version
+        and re-read the file on the next poll (it may be the new one's)
+        """
+        with self._lock:
+            self.model_version = model_version
+            self._mtime = None
+            table = self.table
+            if table is not None and table.model_version != model_version:
+                self.set_table(None)
+                print(f"⚠️ Calibration table dropped: built for model "
+                      f"{table.model_version or 'unknown'}, serving {model_version}")
+
+    def reload_if_changed(self) -> bool:
+        """
+        Load the table if the file is new or changed; True if swapped
+        A broken file keeps the current table
+        """
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        if mtime == self._mtime:
+            return False
+
+        self._mtime = mtime
+        try:
+            table = CalibrationTable.load(self.path)
+        except Exception as e:
+            self.reload_errors += 1
+            print(f"⚠️ Calibration table {self.path} not loaded: {e}")
+            return False
+
+        with self._lock:
+            if table.model_version != self.model_version:
+                # Fixed / live cutoffs until it is rebuilt for this model
+                self.version_mismatches += 1
+                print(f"⚠️ Calibration table {self.path} not loaded: built for model "
+                      f"{table.model_version or 'unknown'}, serving {self.model_version}")
+                return False
+            self.set_table(table)
+        self.reloads += 1
+        print(f"✅ Calibration table loaded ({len(table)} knots, "
+              f"{table.sample_count:,} scores)")
+        return True
+
+    async def start(self):
+        await asyncio.to_thread(self.reload_if_changed)
+        if self.reload_interval > 0:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            await asyncio.to_thread(self.reload_if_changed)
+
+    def get_metrics(self) -> dict:
+        return {
+            "path": str(self.path),
+            "loaded": self.table is not None,
+            "model_version": self.model_version,
+            "table": self.table.get_info() if self.table is not None else None,
+            "reloads": self.reloads,
+            "reload_errors": self.reload_errors,
+            "version_mismatches": self.version_mismatches,
+        }
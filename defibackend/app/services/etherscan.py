@@ -0,0 +1,294 @@
+"""
+Etherscan Client
+Async, pooled access to the Etherscan account txlist API
+Per-wallet TTL cache refreshed incrementally from the last seen block,
+request coalescing and client-side rate limiting
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from app.services.rate_limit import RateLimiter
+
+# Etherscan rejects page * offset above this
+MAX_RESULT_WINDOW = 10_000
+LATEST_BLOCK = 99_999_999
+# Page size for incremental refreshes (new activity since last_block)
+INCREMENTAL_PAGE = 1_000
+
+RATE_LIMIT_MESSAGES = ("max rate limit", "rate limit reached")
+
+
+class EtherscanError(Exception):
+    """Etherscan returned an error (or could not be reached)"""
+
+
+class _RateLimited(Exception):
+    """HTTP 429 from the provider"""
+
+
+@dataclass
+class WalletHistory:
+    """
+    Cached newest-first transactions of one wallet
+    complete: the wallet has no transactions older than the oldest cached one
+    """
+    transactions: List[dict] = field(default_factory=list)
+    last_block: int = 0
+    complete: bool = False
+    fetched_at: float = 0.0
+
+
+class EtherscanClient:
+    """
+    Wallet transaction lookups against Etherscan
+
+    - One pooled httpx.AsyncClient (keep-alive, bounded connections)
+    - Cache per wallet: served as-is for cache_ttl seconds, then refreshed by
+      fetching only blocks >= last_block and merging
+    - The first fetch asks for the newest `limit` transactions only
+      (page / offset) instead of the whole history
+    - Concurrent lookups of the same wallet share one upstream request
+    - Client-side token bucket plus retry with backoff on provider rate limits
+    - On upstream errors a stale cached history is served if there is one
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.etherscan.io/v2/api",
+        chain_id: int = 11155111,
+        rate_limit_per_sec: float = 5.0,
+        cache_ttl_seconds: float = 30.0,
+        max_cached_wallets: int = 10_000,
+        timeout_seconds: float = 10.0,
+        max_connections: int = 20,
+        max_retries: int = 3,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.chain_id = chain_id
+        self.cache_ttl = cache_ttl_seconds
+        self.max_cached_wallets = max_cached_wallets
+        self.max_retries = max_retries
+
+        self.limiter = RateLimiter(rate_limit_per_sec)
+        self._timeout = timeout_seconds
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self._http: Optional[httpx.AsyncClient] = None
+
+        self._cache: "OrderedDict[str, WalletHistory]" = OrderedDict()
+        # wallet -> (refresh task, limit it was started for)
+        self._in_flight: Dict[str, Tuple[asyncio.Task, int]] = {}
+
+        # Metrics
+        self.lookups = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.full_fetches = 0
+        self.incremental_fetches = 0
+        self.upstream_requests = 0
+        self.upstream_errors = 0
+        self.rate_limited = 0
+        self.stale_served = 0
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        # Created lazily so it binds to the running event loop
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(timeout=self._timeout, limits=self._limits)
+        return self._http
+
+    async def close(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    # ----------------------------
+    # PUBLIC API
+    # ----------------------------
+
+    async def get_transactions(self, address: str, limit: int = 20) -> List[dict]:
+        """
+        Newest-first transactions of a wallet (at most `limit`)
+        Raises EtherscanError if Etherscan fails and nothing is cached
+        """
+        key = address.lower()
+        self.lookups += 1
+
+        history = self._cache.get(key)
+        if history is not None and self._covers(history, limit):
+            if time.monotonic() - history.fetched_at < self.cache_ttl:
+                self.cache_hits += 1
+                self._cache.move_to_end(key)
+                return history.transactions[:limit]
+
+        # Same wallet already being fetched: share the result
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None and in_flight[1] >= limit:
+            task = in_flight[0]
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(self._refresh(key, limit))
+            self._in_flight[key] = (task, limit)
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+
+        try:
+            history = await asyncio.shield(task)
+        except EtherscanError:
+            stale = self._cache.get(key)
+            if stale is None:
+                raise
+            self.stale_served += 1
+            return stale.transactions[:limit]
+
+        return history.transactions[:limit]
+
+    def _forget(self, key: str, task: asyncio.Task):
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None and in_flight[0] is task:
+            del self._in_flight[key]
+
+    @staticmethod
+    def _covers(history: WalletHistory, limit: int) -> bool:
+        return history.complete or len(history.transactions) >= limit
+
+    # ----------------------------
+    # FETCHING
+    # ----------------------------
+
+    async def _refresh(self, key: str, limit: int) -> WalletHistory:
+        """
+        Bring the cached history up to date (incrementally when possible)
+        """
+        history = self._cache.get(key)
+        page_size = min(max(limit, 1), MAX_RESULT_WINDOW)
+
+        if history is not None and self._covers(history, limit):
+            self.incremental_fetches += 1
+            page_size = max(page_size, min(INCREMENTAL_PAGE, MAX_RESULT_WINDOW))
+            new = await self._txlist(key, history.last_block, page_size)
+
+            if len(new) < page_size:
+                # Everything since last_block fits in one page: merge
+                known = {tx["hash"] for tx in new}
+                merged = new + [tx for tx in history.transactions if tx["hash"] not in known]
+                history = WalletHistory(
+                    transactions=merged[:MAX_RESULT_WINDOW],
+                    last_block=max(history.last_block, self._max_block(new)),
+                    complete=history.complete and len(merged) <= MAX_RESULT_WINDOW,
+                )
+            else:
+                # Too much new activity to stitch together: start over from this page
+                history = WalletHistory(
+                    transactions=new,
+                    last_block=self._max_block(new),
+                    complete=False,
+                )
+        else:
+            self.full_fetches += 1
+            transactions = await self._txlist(key, 0, page_size)
+            history = WalletHistory(
+                transactions=transactions,
+                last_block=self._max_block(transactions),
+                complete=len(transactions) < page_size,
+            )
+
+        history.fetched_at = time.monotonic()
+        self._store(key, history)
+        return history
+
+    @staticmethod
+    def _max_block(transactions: List[dict]) -> int:
+        return max((int(tx.get("blockNumber", 0)) for tx in transactions), default=0)
+
+    def _store(self, key: str, history: WalletHistory):
+        self._cache[key] = history
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_cached_wallets:
+            self._cache.popitem(last=False)
+
+    async def _txlist(self, address: str, start_block: int, page_size: int) -> List[dict]:
+        """
+        One page of newest-first transactions in [start_block, latest]
+        """
+        params = {
+            "chainid": self.chain_id,
+            "module": "account",
+            "action": "txlist",
+            "address": address,
+            "startblock": start_block,
+            "endblock": LATEST_BLOCK,
+            "page": 1,
+            "offset": page_size,
+            "sort": "desc",
+            "apikey": self.api_key,
+        }
+
+        backoff = 1.0 / self.limiter.rate
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire()
+            self.upstream_requests += 1
+            try:
+                response = await self.http.get(self.base_url, params=params)
+                if response.status_code == 429:
+                    raise _RateLimited()
+                response.raise_for_status()
+                data = response.json()
+            except _RateLimited:
+                data = None
+            except (httpx.HTTPError, ValueError) as e:
+                self.upstream_errors += 1
+                raise EtherscanError(f"Etherscan request failed: {e}") from e
+
+            if data is not None:
+                result = data.get("result")
+                if data.get("status") == "1" and isinstance(result, list):
+                    return result
+                # "No transactions found" is status 0 with an empty list
+                if isinstance(result, list) and not result:
+                    return []
+                if not self._is_rate_limit(data):
+                    self.upstream_errors += 1
+                    raise EtherscanError(f"Etherscan error: {data.get('message')} {result}")
+
+            # Provider throttled us: back off and retry
+            self.rate_limited += 1
+            if attempt < self.max_retries:
+                await asyncio.sleep(backoff)
+                backoff *= 2
+
+        self.upstream_errors += 1
+        raise EtherscanError("Etherscan rate limit exceeded")
+
+    @staticmethod
+    def _is_rate_limit(data: dict) -> bool:
+        text = f"{data.get('message', '')} {data.get('result', '')}".lower()
+        return any(message in text for message in RATE_LIMIT_MESSAGES)
+
+    # ----------------------------
+    # METRICS
+    # ----------------------------
+
+    def get_metrics(self) -> dict:
+        return {
+            "lookups": self.lookups,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "full_fetches": self.full_fetches,
+            "incremental_fetches": self.incremental_fetches,
+            "upstream_requests": self.upstream_requests,
+            "upstream_errors": self.upstream_errors,
+            "rate_limited": self.rate_limited,
+            "stale_served": self.stale_served,
+            "rate_limit_waits": self.limiter.waits,
+            "cached_wallets": len(self._cache),
+            "in_flight": len(self._in_flight),
+        }
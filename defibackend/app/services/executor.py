@@ -0,0 +1,187 @@
+"""
+Inference Executors
+Where CPU-bound scoring runs: inline, thread pool or process pool
+Keeps the event loop free for health checks and I/O
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Tuple
+
+import numpy as np
+
+from app.ml.compiled_forest import CompiledForest
+from app.ml.shared_forest import SharedForest, attach
+
+EXECUTOR_MODES = ("inline", "thread", "process")
+
+# Process mode splits a batch across workers only above this size
+MIN_ROWS_PER_WORKER = 1024
+
+
+class InlineExecutor:
+    """
+    Score on the calling thread (blocks the event loop while scoring)
+    """
+
+    mode = "inline"
+
+    def __init__(self, engine: CompiledForest):
+        self.engine = engine
+
+    async def risk_scores(self, X: np.ndarray) -> np.ndarray:
+        return self.engine.risk_scores(X)
+
+    async def explain(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return self.engine.explain(X)
+
+    def swap_engine(self, engine: CompiledForest):
+        self.engine = engine
+
+    def close(self):
+        pass
+
+
+class ThreadPoolInferenceExecutor:
+    """
+    Score on a thread pool
+    Tree traversal and large NumPy ops release the GIL
+    """
+
+    mode = "thread"
+
+    def __init__(self, engine: CompiledForest, workers: int):
+        self.engine = engine
+        self.pool = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="inference",
+        )
+
+    async def risk_scores(self, X: np.ndarray) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, self.engine.risk_scores, X)
+
+    async def explain(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, self.engine.explain, X)
+
+    def swap_engine(self, engine: CompiledForest):
+        # Submitted batches hold the old engine's bound method and finish on it
+        self.engine = engine
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+
+
+# ----------------------------
+# PROCESS POOL (worker side)
+# ----------------------------
+
+_worker_engine = None
+_worker_shm = None
+
+
+def _init_worker(spec: dict):
+    """
+    Runs once per worker: attach to the shared forest, no model copy
+    """
+    global _worker_engine, _worker_shm
+    _worker_engine, _worker_shm = attach(spec)
+
+
+def _score_in_worker(X: np.ndarray) -> np.ndarray:
+    return _worker_engine.risk_scores(X)
+
+
+def _explain_in_worker(X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    return _worker_engine.explain(X)
+
+
+class ProcessPoolInferenceExecutor:
+    """
+    Score on worker processes sharing one copy of the forest arrays
+    Batches are shipped as feature matrices; large ones are split per worker
+    """
+
+    mode = "process"
+
+    def __init__(self, engine: CompiledForest, workers: int):
+        self.workers = workers
+        self.shared, self.pool = self._start_pool(engine)
+
+    def _start_pool(self, engine: CompiledForest):
+        shared = SharedForest(engine)
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(shared.spec,),
+        )
+        return shared, pool
+
+    async def risk_scores(self, X: np.ndarray) -> np.ndarray:
+        parts = await self._run_split(_score_in_worker, X)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    async def explain(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        parts = await self._run_split(_explain_in_worker, X)
+        if len(parts) == 1:
+            return parts[0]
+        return (
+            np.concatenate([scores for scores, _ in parts]),
+            np.concatenate([contributions for _, contributions in parts]),
+        )
+
+    async def _run_split(self, fn, X: np.ndarray) -> list:
+        loop = asyncio.get_running_loop()
+
+        n_chunks = min(self.workers, max(1, len(X) // MIN_ROWS_PER_WORKER))
+        if n_chunks == 1:
+            return [await loop.run_in_executor(self.pool, fn, X)]
+
+        return await asyncio.gather(*(
+            loop.run_in_executor(self.pool, fn, chunk)
+            for chunk in np.array_split(X, n_chunks)
+        ))
+
+    def swap_engine(self, engine: CompiledForest):
+        """
+        New pool attached to the new forest; the old pool drains its
+        queued batches in the background, then its block is released
+        """
+        old_shared, old_pool = self.shared, self.pool
+        self.shared, self.pool = self._start_pool(engine)
+
+        def retire():
+            old_pool.shutdown(wait=True)
+            old_shared.close()
+
+        threading.Thread(target=retire, name="retire-pool", daemon=True).start()
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+        self.shared.close()
+
+
+def create_executor(mode: str, engine: CompiledForest, workers: int = 0):
+    """
+    Build an executor by name
+    Args:
+        mode: "inline", "thread" or "process"
+        engine: compiled forest to score with
+        workers: pool size (0 = one per CPU core)
+    """
+    if mode not in EXECUTOR_MODES:
+        raise ValueError(
+            f"Unknown inference executor '{mode}', expected one of {EXECUTOR_MODES}"
+        )
+
+    workers = workers or os.cpu_count() or 1
+
+    if mode == "thread":
+        return ThreadPoolInferenceExecutor(engine, workers)
+    if mode == "process":
+        return ProcessPoolInferenceExecutor(engine, workers)
+    return InlineExecutor(engine)
@@ -0,0 +1,336 @@
+"""
+Wallet Feature Store
+Per-wallet rolling history so /predict can fill model features server-side
+Clients only need to send amount_usd + wallet_address
+"""
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.schemas.models import PredictRequest
+
+# Model features the store can fill in
+DERIVED_FEATURES = ("tx_count_user", "rolling_volume_user", "relative_amount")
+
+SNAPSHOT_VERSION = 1
+
+
+class WalletFeatureStore:
+    """
+    Rolling-window counters keyed by wallet_address
+
+    Each wallet owns one row of fixed-size NumPy tables:
+        volume[row, slot] / count[row, slot]  ring buffer of time buckets
+        head[row]                             newest bucket epoch written
+        lifetime_count / lifetime_volume      all-time totals
+        last_seen                             for TTL eviction
+    Updates and lookups touch one row and at most n_buckets slots - O(1).
+
+    Memory is bounded by max_wallets (LRU eviction) and idle wallets are
+    dropped after ttl_seconds.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 86_400.0,
+        n_buckets: int = 24,
+        max_wallets: int = 1_000_000,
+        ttl_seconds: float = 7 * 86_400.0,
+        initial_capacity: int = 1024,
+    ):
+        if n_buckets < 1:
+            raise ValueError("n_buckets must be at least 1")
+        if max_wallets < 1:
+            raise ValueError("max_wallets must be at least 1")
+
+        self.window_seconds = window_seconds
+        self.n_buckets = n_buckets
+        self.bucket_seconds = window_seconds / n_buckets
+        self.max_wallets = max_wallets
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        # wallet -> row, least recently used first
+        self._rows: "OrderedDict[str, int]" = OrderedDict()
+        self._free: list = []
+
+        self._allocate(min(initial_capacity, max_wallets))
+
+        # Metrics
+        self.evictions_lru = 0
+        self.evictions_ttl = 0
+
+    # ----------------------------
+    # STORAGE
+    # ----------------------------
+
+    def _allocate(self, capacity: int):
+        self.capacity = capacity
+        self.volume = np.zeros((capacity, self.n_buckets), dtype=np.float64)
+        self.count = np.zeros((capacity, self.n_buckets), dtype=np.int32)
+        self.head = np.zeros(capacity, dtype=np.int64)
+        self.lifetime_count = np.zeros(capacity, dtype=np.int64)
+        self.lifetime_volume = np.zeros(capacity, dtype=np.float64)
+        self.last_seen = np.zeros(capacity, dtype=np.float64)
+        self._next_row = 0
+
+    def _grow(self):
+        new_capacity = min(self.capacity * 2, self.max_wallets)
+        for name in ("volume", "count", "head", "lifetime_count",
+                     "lifetime_volume", "last_seen"):
+            old = getattr(self, name)
+            grown = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            grown[: self.capacity] = old
+            setattr(self, name, grown)
+        self.capacity = new_capacity
+
+    def _row_for(self, wallet: str, now: float) -> int:
+        """
+        Row of an existing wallet, or a fresh (zeroed) row for a new one
+        """
+        row = self._rows.get(wallet)
+        if row is not None:
+            self._rows.move_to_end(wallet)
+            return row
+
+        self._evict_idle(now)
+
+        if self._free:
+            row = self._free.pop()
+        elif self._next_row < self.capacity:
+            row = self._next_row
+            self._next_row += 1
+        elif self.capacity < self.max_wallets:
+            self._grow()
+            row = self._next_row
+            self._next_row += 1
+        else:
+            # Full: recycle the least recently used wallet
+            _, row = self._rows.popitem(last=False)
+            self.evictions_lru += 1
+
+        self.volume[row] = 0.0
+        self.count[row] = 0
+        self.head[row] = self._epoch(now)
+        self.lifetime_count[row] = 0
+        self.lifetime_volume[row] = 0.0
+        self.last_seen[row] = now
+
+        self._rows[wallet] = row
+        return row
+
+    def _evict_idle(self, now: float):
+        """
+        Drop wallets idle for longer than the TTL (oldest first, stops early)
+        """
+        cutoff = now - self.ttl_seconds
+        while self._rows:
+            wallet, row = next(iter(self._rows.items()))
+            if self.last_seen[row] >= cutoff:
+                break
+            del self._rows[wallet]
+            self._free.append(row)
+            self.evictions_ttl += 1
+
+    def _epoch(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds)
+
+    def _advance(self, row: int, epoch: int):
+        """
+        Move the ring head to `epoch`, clearing buckets that fell out of the window
+        """
+        head = int(self.head[row])
+        if epoch <= head:
+            return
+
+        if epoch - head >= self.n_buckets:
+            self.volume[row] = 0.0
+            self.count[row] = 0
+        else:
+            for e in range(head + 1, epoch + 1):
+                slot = e % self.n_buckets
+                self.volume[row, slot] = 0.0
+                self.count[row, slot] = 0
+
+        self.head[row] = epoch
+
+    def _window(self, row: int) -> Tuple[int, float]:
+        return int(self.count[row].sum()), float(self.volume[row].sum())
+
+    # ----------------------------
+    # PUBLIC API
+    # ----------------------------
+
+    def record(self, wallet: str, amount_usd: float, timestamp: Optional[float] = None):
+        """
+        Add a scored transaction to the wallet's history
+        """
+        now = time.time() if timestamp is None else timestamp
+        epoch = self._epoch(now)
+
+        with self._lock:
+            row = self._row_for(wallet, now)
+            self._advance(row, epoch)
+
+            # Out-of-order events older than the window only count lifetime
+            if epoch > int(self.head[row]) - self.n_buckets:
+                slot = epoch % self.n_buckets
+                self.volume[row, slot] += amount_usd
+                self.count[row, slot] += 1
+
+            self.lifetime_count[row] += 1
+            self.lifetime_volume[row] += amount_usd
+            self.last_seen[row] = max(self.last_seen[row], now)
+
+    def features(
+        self,
+        wallet: str,
+        amount_usd: float,
+        timestamp: Optional[float] = None,
+    ) -> Dict[str, float]:
+        """
+        Model features for a new transaction, as if it were already recorded:
+            tx_count_user        lifetime transactions incl. this one
+            rolling_volume_user  volume in the rolling window incl. this one
+            relative_amount      amount / mean amount in the window
+                                 (lifetime mean when the window is empty, 1.0 for new wallets)
+        Read-only: call record() once the transaction has been scored
+        """
+        now = time.time() if timestamp is None else timestamp
+
+        with self._lock:
+            row = self._rows.get(wallet)
+            if row is None:
+                return {
+                    "tx_count_user": 1,
+                    "rolling_volume_user": float(amount_usd),
+                    "relative_amount": 1.0,
+                }
+
+            self._advance(row, self._epoch(now))
+            window_count, window_volume = self._window(row)
+            lifetime_count = int(self.lifetime_count[row])
+            lifetime_volume = float(self.lifetime_volume[row])
+
+        if window_count > 0 and window_volume > 0:
+            mean_amount = window_volume / window_count
+        elif lifetime_count > 0 and lifetime_volume > 0:
+            mean_amount = lifetime_volume / lifetime_count
+        else:
+            mean_amount = 0.0
+
+        return {
+            "tx_count_user": lifetime_count + 1,
+            "rolling_volume_user": window_volume + amount_usd,
+            "relative_amount": amount_usd / mean_amount if mean_amount > 0 else 1.0,
+        }
+
+    def complete_request(self, request: PredictRequest) -> PredictRequest:
+        """
+        Fill missing model features from the wallet history
+        Client-supplied values always win
+        Raises ValueError when features are missing and no wallet is given
+        """
+        missing = [name for name in DERIVED_FEATURES if getattr(request, name) is None]
+        if not missing:
+            return request
+
+        if not request.wallet_address:
+            raise ValueError(
+                f"Missing features {missing}: send them or a wallet_address"
+            )
+
+        derived = self.features(request.wallet_address, request.amount_usd)
+        return request.model_copy(update={name: derived[name] for name in missing})
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get_metrics(self) -> dict:
+        used = self._next_row
+        bytes_per_row = (
+            self.volume.itemsize * self.n_buckets
+            + self.count.itemsize * self.n_buckets
+            + self.head.itemsize
+            + self.lifetime_count.itemsize
+            + self.lifetime_volume.itemsize
+            + self.last_seen.itemsize
+        )
+        return {
+            "wallets": len(self._rows),
+            "capacity": self.capacity,
+            "max_wallets": self.max_wallets,
+            "table_bytes": self.capacity * bytes_per_row,
+            "rows_used": used,
+            "evictions_lru": self.evictions_lru,
+            "evictions_ttl": self.evictions_ttl,
+        }
+
+    # ----------------------------
+    # SNAPSHOT / RESTORE
+    # ----------------------------
+
+    def snapshot(self, path: str) -> None:
+        """
+        Write the store to a compressed .npz (LRU order preserved)
+        """
+        # Copy under the lock, compress + write outside it
+        with self._lock:
+            wallets = list(self._rows.keys())
+            rows = np.fromiter(self._rows.values(), dtype=np.int64, count=len(wallets))
+            tables = {
+                name: getattr(self, name)[rows]
+                for name in ("volume", "count", "head", "lifetime_count",
+                             "lifetime_volume", "last_seen")
+            }
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                version=SNAPSHOT_VERSION,
+                window_seconds=self.window_seconds,
+                n_buckets=self.n_buckets,
+                wallets=np.array(wallets, dtype=str),
+                **tables,
+            )
+        # Atomic replace: a crash never leaves a half-written snapshot
+        tmp_path.replace(path)
+
+    def restore(self, path: str) -> int:
+        """
+        Load a snapshot written by snapshot(); returns wallets restored
+        Raises ValueError if the snapshot uses a different bucket layout
+        """
+        with np.load(path) as data:
+            if int(data["version"]) != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported feature store snapshot version {data['version']}")
+            if (int(data["n_buckets"]) != self.n_buckets
+                    or float(data["window_seconds"]) != self.window_seconds):
+                raise ValueError("Feature store snapshot has a different window layout")
+
+            # Most recently used wallets are last - keep those if we shrank
+            all_wallets = data["wallets"].tolist()
+            wallets = all_wallets[-self.max_wallets:]
+            n = len(wallets)
+            start = len(all_wallets) - n
+
+            with self._lock:
+                capacity = max(min(n, self.max_wallets), 1)
+                self._allocate(capacity)
+                self._rows = OrderedDict(zip(wallets, range(n)))
+                self._free = []
+                self._next_row = n
+
+                for name in ("volume", "count", "head", "lifetime_count",
+                             "lifetime_volume", "last_seen"):
+                    getattr(self, name)[:n] = data[name][start:]
+
+        return n
@@ -3,10 +3,14 @@ Inference Service
 Core ML inference logic - separated from HTTP layer
 This is the BRAIN 🧠 of the system
 """
+import asyncio
 import numpy as np
-from typing import List, Dict
-from app.ml.model_loader import ModelLoader
+from typing import Callable, List, Dict, Optional, Tuple
+from app.ml.model_loader import FEATURE_SCHEMA, ModelLoader
 from app.schemas.models import PredictRequest
+from app.services.executor import create_executor
+from app.services.shadow import ShadowScorer
+from config.settings import settings
 
 
 class InferenceService:
@@ -15,37 +19,50 @@ class InferenceService:
     Detection ≠ Decision
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        executor_mode: Optional[str] = None,
+        workers: Optional[int] = None,
+        alert_cutoff: Optional[Callable[[], float]] = None,
+        on_model_change: Optional[Callable[[], None]] = None,
+    ):
         self.model_loader = ModelLoader()
         self.model = self.model_loader.model
         self.scaler = self.model_loader.scaler
+        self.engine = self.model_loader.engine
 
-    def _extract_features(self, request: PredictRequest) -> list[float]:
-        """
-        Extract features in the EXACT order used during training
-        """
-        return [
-            request.amount_usd,
-            request.tx_count_user,
-            request.rolling_volume_user,
-            request.relative_amount,
-        ]
+        # Where the *_async methods run scoring (inline / thread / process)
+        self.executor = create_executor(
+            executor_mode or settings.INFERENCE_EXECUTOR,
+            self.engine,
+            workers if workers is not None else settings.INFERENCE_WORKERS,
+        )
+
+        # Registry candidate scored on a sample of traffic (never answers requests)
+        self.shadow = ShadowScorer(
+            fraction=settings.MODEL_SHADOW_FRACTION,
+            alert_cutoff=alert_cutoff,
+            window_seconds=settings.LIVE_THRESHOLD_WINDOW_SECONDS,
+        )
+        self.reload_interval = settings.MODEL_REGISTRY_POLL_SECONDS
+        # Called after every hot-swap (drops results + cutoffs of the previous model)
+        self.on_model_change = on_model_change
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.reloads = 0
+        self.reload_errors = 0
 
     def run_inference(self, request: PredictRequest) -> float:
         """
         Run inference for a single transaction
         """
-        # 1️⃣ Extract features
-        features = self._extract_features(request)
+        # 1️⃣ Extract features (in the order the model was trained on) + 2️⃣ validate
+        X = self._feature_matrix([request])
 
-        # 2️⃣ Validate feature vector
-        self.model_loader.validate_features(features)
-
-        # 3️⃣ Scale
-        X_scaled = self.scaler.transform([features])
-
-        # 4️⃣ Isolation Forest score (higher = more anomalous)
-        raw_score = -self.model.score_samples(X_scaled)[0]
+        # 3️⃣ Scale + 4️⃣ Isolation Forest score (higher = more anomalous)
+        # Compiled engine: bit-identical to -model.score_samples(scaler.transform(X))
+        raw_score = self.engine.risk_scores(X)[0]
 
         return float(raw_score)
 
@@ -53,23 +70,156 @@ class InferenceService:
         """
         Batch inference for multiple transactions
         """
-        feature_matrix = [self._extract_features(req) for req in requests]
+        raw_scores = self.engine.risk_scores(self._feature_matrix(requests))
 
-        for features in feature_matrix:
-            self.model_loader.validate_features(features)
+        return raw_scores.tolist()
 
-        X_scaled = self.scaler.transform(feature_matrix)
-        raw_scores = -self.model.score_samples(X_scaled)
+    def _feature_matrix(self, requests: List[PredictRequest]) -> np.ndarray:
+        """
+        FEATURE_SCHEMA order, one allocation, validated once for the batch
+        """
+        X = FEATURE_SCHEMA.matrix(requests)
+        self.model_loader.validate_features(X)
 
-        return [float(score) for score in raw_scores]
+        return X
 
-    def explain_features(self, request: PredictRequest) -> Dict[str, float]:
+    async def run_inference_async(self, request: PredictRequest) -> float:
+        """
+        run_inference on the configured executor (off the event loop)
+        """
+        scores = await self.batch_inference_async([request])
+        return scores[0]
+
+    async def batch_inference_async(self, requests: List[PredictRequest]) -> List[float]:
+        """
+        batch_inference on the configured executor (off the event loop)
+        """
+        raw_scores = await self._score(self._feature_matrix(requests))
+
+        return raw_scores.tolist()
+
+    async def matrix_inference_async(self, X: np.ndarray) -> np.ndarray:
+        """
+        Scores for a ready feature matrix in FEATURE_SCHEMA order (columnar /predict/batch)
+        """
+        self.model_loader.validate_features(X)
+
+        return await self._score(X)
+
+    async def _score(self, X: np.ndarray) -> np.ndarray:
+        raw_scores = await self.executor.risk_scores(X)
+        self.shadow.sample(X, raw_scores)
+        return raw_scores
+
+    # ----------------------------
+    # ATTRIBUTION (opt-in, ?explain=true)
+    # ----------------------------
+
+    async def batch_explain_async(
+        self, requests: List[PredictRequest]
+    ) -> Tuple[List[float], List[Dict[str, float]]]:
+        """
+        Scores + {feature: contribution} per request (see CompiledForest.explain)
+        """
+        raw_scores, contributions = await self.matrix_explain_async(
+            self._feature_matrix(requests)
+        )
+        return raw_scores.tolist(), FEATURE_SCHEMA.to_dicts(contributions)
+
+    async def matrix_explain_async(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Return feature values for interpretability
+        Scores + (n, n_features) contributions for a ready feature matrix
         """
+        self.model_loader.validate_features(X)
+
+        raw_scores, contributions = await self.executor.explain(X)
+        self.shadow.sample(X, raw_scores)
+        return raw_scores, contributions
+
+    # ----------------------------
+    # MODEL REGISTRY (hot reload)
+    # ----------------------------
+
+    def use_model(self, artifact, version: str):
+        """
+        Switch scoring to another model version
+        Batches already handed to the executor finish on the old one
+        """
+        if settings.MODEL_NATIVE_TREES:
+            ModelLoader.attach_native_trees(artifact.engine)
+
+        self.model_loader.swap(artifact, version)
+        self.model = self.model_loader.model
+        self.scaler = self.model_loader.scaler
+        self.engine = artifact.engine
+        self.executor.swap_engine(self.engine)
+        if self.on_model_change is not None:
+            self.on_model_change()
+        print(f"🔁 Serving model {version} ({artifact.fingerprint})")
+
+    def reload_if_changed(self) -> bool:
+        """
+        Follow the registry's CURRENT / CANDIDATE pointers; True if the
+        serving model changed. A version that fails to open is skipped
+        (and retried on the next poll) - the loaded one keeps serving.
+        """
+        registry = self.model_loader.registry
+        try:
+            current, candidate = registry.pointers()
+
+            if candidate != self.shadow.version:
+                engine = registry.open(candidate, FEATURE_SCHEMA).engine if candidate else None
+                self.shadow.set_candidate(engine, candidate)
+                if candidate:
+                    print(f"👥 Shadow scoring {settings.MODEL_SHADOW_FRACTION:.0%} of traffic with {candidate}")
+
+            # MODEL_FORMAT=mmap / pickle pin the model to those files
+            following = settings.MODEL_FORMAT == "auto"
+            if following and current is not None and current != self.model_loader.version:
+                self.use_model(registry.open(current, FEATURE_SCHEMA), current)
+                self.reloads += 1
+                return True
+        except Exception as e:
+            self.reload_errors += 1
+            print(f"⚠️ Model registry reload failed: {e}")
+        return False
+
+    async def start(self):
+        await asyncio.to_thread(self.reload_if_changed)
+        if self.reload_interval > 0:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            await asyncio.to_thread(self.reload_if_changed)
+
+    def get_registry_info(self) -> dict:
         return {
-            "amount_usd": request.amount_usd,
-            "tx_count_user": request.tx_count_user,
-            "rolling_volume_user": request.rolling_volume_user,
-            "relative_amount": request.relative_amount,
+            "loaded": self.model_loader.get_info(),
+            "versions": self.model_loader.registry.versions(),
+            "shadow": self.shadow.get_info(),
+            "reloads": self.reloads,
+            "reload_errors": self.reload_errors,
         }
+
+    def close(self) -> None:
+        """
+        Shut down executor workers
+        """
+        self.executor.close()
+        self.shadow.close()
+
+    def explain_features(self, request: PredictRequest) -> Dict[str, float]:
+        """
+        Per-feature contributions to the request's score (log2 units:
+        risk_score = 0.5 * 2 ** sum(contributions); positive = anomalous)
+        """
+        _, contributions = self.engine.explain(self._feature_matrix([request]))
+        return FEATURE_SCHEMA.to_dicts(contributions)[0]
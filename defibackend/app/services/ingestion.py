@@ -0,0 +1,465 @@
+"""
+Chain Ingestion
+Follows new blocks and pending transactions over JSON-RPC and feeds
+decoded transactions into batched scoring
+Resumes from the last processed block after a restart
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from pydantic import ValidationError
+from web3 import Web3
+
+from app.schemas.models import PredictRequest, PredictResponse
+from app.web3.client import Web3Client
+
+WEI_PER_ETH = 10 ** 18
+
+# Pending hashes handed to a worker at a time
+PENDING_CHUNK = 64
+# Mempool hashes remembered so mined transactions are not scored twice
+MAX_SEEN_PENDING = 100_000
+# Longest wait between reconnect attempts
+MAX_BACKOFF_SECONDS = 30.0
+# A block whose fetch / decode keeps raising is passed on empty after this
+MAX_JOB_ATTEMPTS = 5
+
+
+def decode_transaction(tx: dict, eth_price_usd: float) -> Optional[PredictRequest]:
+    """
+    Map a JSON-RPC transaction onto a scoring request
+    Only native value transfers carry an amount - zero-value contract
+    calls and malformed transactions are skipped (None)
+    """
+    value = int(tx.get("value") or 0)
+    if value <= 0:
+        return None
+
+    try:
+        return PredictRequest(
+            amount_usd=value / WEI_PER_ETH * eth_price_usd,
+            tx_hash=Web3.to_hex(tx["hash"]),
+            wallet_address=tx["from"],
+        )
+    except (KeyError, ValidationError):
+        return None
+
+
+class ChainIngestor:
+    """
+    Bounded producer / consumer pipeline over a Web3Client
+
+        block follower ---+
+                          +--> [jobs queue] --> N decode workers --> [decoded queue] --> scorer
+        pending follower -+
+
+    - The block follower enqueues block numbers up to head - confirmations
+    - Workers fetch blocks (or pending transactions) and decode them
+    - The scorer batches decoded transactions into score_batch calls
+    Both queues are bounded, so a slow scorer stops the followers instead
+    of buffering the chain in memory.
+
+    Workers finish blocks out of order; the cursor only advances over a
+    contiguous run of fully scored blocks and is checkpointed via
+    save_cursor. A restart resumes at cursor + 1 (at-least-once: blocks
+    scored after the last checkpoint are scored again).
+    """
+
+    def __init__(
+        self,
+        client: Web3Client,
+        score_batch: Callable[[List[PredictRequest]], Awaitable[list]],
+        load_cursor: Callable[[str], Optional[int]],
+        save_cursor: Callable[[str, int], None],
+        name: str = "chain",
+        workers: int = 4,
+        queue_size: int = 64,
+        batch_size: int = 256,
+        batch_wait_ms: float = 50.0,
+        poll_interval: float = 1.0,
+        confirmations: int = 0,
+        start_block: int = -1,
+        include_pending: bool = True,
+        eth_price_usd: float = 3000.0,
+        checkpoint_interval: float = 1.0,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if queue_size < 1 or batch_size < 1:
+            raise ValueError("queue_size and batch_size must be at least 1")
+
+        self.client = client
+        self.score_batch = score_batch
+        self.load_cursor = load_cursor
+        self.save_cursor = save_cursor
+        self.name = name
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait_ms / 1000
+        self.poll_interval = poll_interval
+        self.confirmations = confirmations
+        self.start_block = start_block
+        self.include_pending = include_pending
+        self.eth_price_usd = eth_price_usd
+        self.checkpoint_interval = checkpoint_interval
+
+        self._jobs: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._decoded: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._tasks: List[asyncio.Task] = []
+
+        # Position
+        self.cursor: Optional[int] = None  # last contiguous processed block
+        self._saved_cursor: Optional[int] = None
+        self._last_checkpoint = 0.0
+        self._next_block: Optional[int] = None
+        self._done_blocks: set = set()
+        self._seen_pending: "OrderedDict[str, None]" = OrderedDict()
+        # Pending hashes handed to a worker, not yet fetched
+        self._pending_in_flight: set = set()
+
+        # Metrics
+        self.connected: Optional[bool] = None
+        self.head: Optional[int] = None
+        self.blocks_processed = 0
+        self.pending_seen = 0
+        self.pending_dropped = 0
+        self.tx_decoded = 0
+        self.tx_skipped = 0
+        self.tx_scored = 0
+        self.tx_errors = 0
+        self.job_errors = 0
+        self.blocks_failed = 0
+        self.alerts = 0
+        self.batches = 0
+
+    # ----------------------------
+    # LIFECYCLE
+    # ----------------------------
+
+    async def start(self):
+        """
+        Load the saved cursor and start the pipeline tasks
+        """
+        self.cursor = await asyncio.to_thread(self.load_cursor, self.name)
+        self._saved_cursor = self.cursor
+        if self.cursor is not None:
+            self._next_block = self.cursor + 1
+            print(f"⛓️ Ingestion resuming at block {self._next_block}")
+
+        coroutines = [self._follow_blocks(), self._score_loop()]
+        coroutines += [self._decode_worker() for _ in range(self.workers)]
+        if self.include_pending:
+            coroutines.append(self._follow_pending())
+        self._tasks = [asyncio.ensure_future(c) for c in coroutines]
+
+    async def stop(self):
+        """
+        Stop all tasks and checkpoint what has been fully processed
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._checkpoint()
+
+    async def _wait_for_node(self):
+        """
+        Block until the node answers, backing off between attempts
+        """
+        backoff = self.poll_interval
+        while not await asyncio.to_thread(self.client.ensure_connected):
+            if self.connected is not False:
+                print(f"⚠️ Ingestion waiting for node at {self.client.rpc_url}")
+            self.connected = False
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, MAX_BACKOFF_SECONDS)
+
+        if not self.connected:
+            print(f"✅ Ingestion connected to {self.client.rpc_url}")
+        self.connected = True
+
+    # ----------------------------
+    # PRODUCERS
+    # ----------------------------
+
+    async def _follow_blocks(self):
+        while True:
+            await self._wait_for_node()
+
+            head = await asyncio.to_thread(self.client.get_block_number)
+            if head is not None:
+                self.head = head
+                safe_head = head - self.confirmations
+
+                if self._next_block is None:
+                    # Fresh start: configured block, else the current safe head
+                    self._next_block = (
+                        self.start_block if self.start_block >= 0 else max(safe_head, 0)
+                    )
+                    self.cursor = self._next_block - 1
+                    print(f"⛓️ Ingestion starting at block {self._next_block}")
+
+                while self._next_block <= safe_head:
+                    # Blocks while the workers are behind (backpressure)
+                    await self._jobs.put(("block", self._next_block))
+                    self._next_block += 1
+
+            await asyncio.sleep(self.poll_interval)
+
+    async def _follow_pending(self):
+        pending_filter = None
+        while True:
+            await self._wait_for_node()
+
+            if pending_filter is None:
+                pending_filter = await asyncio.to_thread(self.client.new_pending_filter)
+                if pending_filter is None:
+                    print("⚠️ Node has no pending transaction filter - following blocks only")
+                    return
+
+            try:
+                hashes = await asyncio.to_thread(pending_filter.get_new_entries)
+            except Exception:
+                # Filters expire on most nodes - install a new one
+                pending_filter = None
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            fresh = []
+            for tx_hash in hashes:
+                tx_hash = Web3.to_hex(tx_hash)
+                if tx_hash not in self._seen_pending and tx_hash not in self._pending_in_flight:
+                    self._pending_in_flight.add(tx_hash)
+                    fresh.append(tx_hash)
+            self.pending_seen += len(fresh)
+
+            for i in range(0, len(fresh), PENDING_CHUNK):
+                await self._jobs.put(("pending", fresh[i:i + PENDING_CHUNK]))
+
+            await asyncio.sleep(self.poll_interval)
+
+    def _remember_pending(self, tx_hash: str):
+        self._seen_pending[tx_hash] = None
+        if len(self._seen_pending) > MAX_SEEN_PENDING:
+            self._seen_pending.popitem(last=False)
+
+    # ----------------------------
+    # DECODE WORKERS
+    # ----------------------------
+
+    async def _decode_worker(self):
+        while True:
+            kind, payload = await self._jobs.get()
+            if kind == "block":
+                await self._run_block_job(payload)
+            else:
+                try:
+                    await self._process_pending(payload)
+                except Exception as e:
+                    # Left to the block worker once they are mined
+                    self.job_errors += 1
+                    self._pending_in_flight.difference_update(payload)
+                    print(f"❌ Ingestion pending job failed: {e}")
+
+    async def _run_block_job(self, block_number: int):
+        """
+        Retry a failing block with backoff; one that keeps failing is
+        passed on empty (logged) so the cursor doesn't stall behind it
+        """
+        backoff = self.poll_interval
+        for attempt in range(1, MAX_JOB_ATTEMPTS + 1):
+            try:
+                await self._process_block(block_number)
+                return
+            except Exception as e:
+                self.job_errors += 1
+                print(f"❌ Ingestion block {block_number} failed "
+                      f"(attempt {attempt}/{MAX_JOB_ATTEMPTS}): {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF_SECONDS)
+
+        self.blocks_failed += 1
+        print(f"❌ Ingestion skipping block {block_number} after {MAX_JOB_ATTEMPTS} attempts")
+        await self._decoded.put((block_number, []))
+
+    async def _process_block(self, block_number: int):
+        block = await self._fetch_block(block_number)
+
+        transactions, from_mempool = [], []
+        for tx in block.get("transactions", []):
+            tx_hash = Web3.to_hex(tx["hash"])
+            if tx_hash in self._seen_pending:
+                # Already scored while pending
+                from_mempool.append(tx_hash)
+                continue
+            # A pending fetch still in flight drops it: scored here instead
+            self._pending_in_flight.discard(tx_hash)
+            transactions.append(tx)
+        requests = self._decode(transactions)
+
+        for tx_hash in from_mempool:
+            self._seen_pending.pop(tx_hash, None)
+        await self._decoded.put((block_number, requests))
+
+    async def _process_pending(self, hashes: List[str]):
+        fetched = await asyncio.to_thread(self._fetch_pending, hashes)
+
+        # Skip the ones a block worker claimed meanwhile (mined)
+        fetched = [(tx_hash, tx) for tx_hash, tx in fetched if tx_hash in self._pending_in_flight]
+        requests = self._decode([tx for _, tx in fetched])
+
+        # Seen only once fetched + decoded: a failed fetch leaves the hash
+        # to the block worker
+        self._pending_in_flight.difference_update(hashes)
+        for tx_hash, _ in fetched:
+            self._remember_pending(tx_hash)
+        if requests:
+            await self._decoded.put((None, requests))
+
+    async def _fetch_block(self, block_number: int) -> dict:
+        """
+        Fetch a block, retrying until the node serves it
+        (the cursor must not skip blocks)
+        """
+        while True:
+            block = await asyncio.to_thread(self.client.get_block, block_number)
+            if block is not None:
+                return block
+            await asyncio.sleep(self.poll_interval)
+            await self._wait_for_node()
+
+    def _fetch_pending(self, hashes: List[str]) -> List[Tuple[str, dict]]:
+        fetched = []
+        for tx_hash in hashes:
+            try:
+                fetched.append((tx_hash, self.client.w3.eth.get_transaction(tx_hash)))
+            except Exception:
+                # Mined, replaced or evicted before we got to it
+                self.pending_dropped += 1
+        return fetched
+
+    def _decode(self, transactions) -> List[PredictRequest]:
+        requests = []
+        for tx in transactions:
+            request = decode_transaction(tx, self.eth_price_usd)
+            if request is None:
+                self.tx_skipped += 1
+            else:
+                requests.append(request)
+        self.tx_decoded += len(requests)
+        return requests
+
+    # ----------------------------
+    # SCORING
+    # ----------------------------
+
+    async def _next_entries(self) -> list:
+        """
+        Wait for decoded work, then gather up to batch_size transactions
+        for at most batch_wait
+        """
+        entries = [await self._decoded.get()]
+        rows = len(entries[0][1])
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_wait
+        while rows < self.batch_size:
+            try:
+                entry = self._decoded.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._decoded.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            entries.append(entry)
+            rows += len(entry[1])
+
+        return entries
+
+    async def _score_loop(self):
+        while True:
+            entries = await self._next_entries()
+
+            requests = [request for _, batch in entries for request in batch]
+            if requests:
+                results = await self._score_with_retry(requests)
+                self.batches += 1
+                for result in results:
+                    if isinstance(result, PredictResponse):
+                        self.tx_scored += 1
+                        self.alerts += result.is_alert
+                    else:
+                        self.tx_errors += 1
+
+            for block_number, _ in entries:
+                if block_number is not None:
+                    self._done_blocks.add(block_number)
+                    self.blocks_processed += 1
+
+            self._advance_cursor()
+            if time.monotonic() - self._last_checkpoint >= self.checkpoint_interval:
+                await self._checkpoint()
+
+    async def _score_with_retry(self, requests: List[PredictRequest]) -> list:
+        """
+        Retry until scoring succeeds - the queues fill up meanwhile and the
+        followers pause, so nothing is skipped while e.g. the DB is down
+        """
+        backoff = self.poll_interval
+        while True:
+            try:
+                return await self.score_batch(requests)
+            except Exception as e:
+                print(f"❌ Ingestion scoring failed, retrying in {backoff:.0f}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF_SECONDS)
+
+    def _advance_cursor(self):
+        while self.cursor is not None and self.cursor + 1 in self._done_blocks:
+            self._done_blocks.remove(self.cursor + 1)
+            self.cursor += 1
+
+    async def _checkpoint(self):
+        if self.cursor is None or self.cursor == self._saved_cursor:
+            return
+        cursor = self.cursor
+        await asyncio.to_thread(self.save_cursor, self.name, cursor)
+        self._saved_cursor = cursor
+        self._last_checkpoint = time.monotonic()
+
+    # ----------------------------
+    # METRICS
+    # ----------------------------
+
+    def get_metrics(self) -> dict:
+        return {
+            "connected": bool(self.connected),
+            "rpc_url": self.client.rpc_url,
+            "head": self.head,
+            "cursor": self.cursor,
+            "checkpointed_cursor": self._saved_cursor,
+            "lag_blocks": (
+                self.head - self.confirmations - self.cursor
+                if self.head is not None and self.cursor is not None
+                else None
+            ),
+            "jobs_queue_depth": self._jobs.qsize(),
+            "decoded_queue_depth": self._decoded.qsize(),
+            "workers": self.workers,
+            "blocks_processed": self.blocks_processed,
+            "pending_seen": self.pending_seen,
+            "pending_dropped": self.pending_dropped,
+            "tx_decoded": self.tx_decoded,
+            "tx_skipped": self.tx_skipped,
+            "tx_scored": self.tx_scored,
+            "tx_errors": self.tx_errors,
+            "job_errors": self.job_errors,
+            "blocks_failed": self.blocks_failed,
+            "alerts": self.alerts,
+            "batches": self.batches,
+        }
@@ -0,0 +1,214 @@
+"""
+Live Threshold
+Alert / risk-level cutoffs derived continuously from recent traffic
+Every scored transaction feeds a sliding quantile sketch
+"""
+import asyncio
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.services.quantile_sketch import SlidingQuantileSketch
+
+
+class LiveThreshold:
+    """
+    Scores -> SlidingQuantileSketch -> cutoffs at the configured percentiles
+
+    - Cutoffs are recomputed at most every refresh_seconds and only once
+      the window holds min_samples scores (None before that - callers fall
+      back to their static cutoffs)
+    - With a shared_dir, each worker process publishes its sketch there
+      every sync_seconds and merges the others', so all workers derive
+      the same thresholds from the traffic they saw together. Snapshots
+      of a restarted worker keep counting until they age out of the window.
+    - Scores of one model only: reset() on a model change empties the
+      window, and shared snapshots are kept per model version
+    """
+
+    def __init__(
+        self,
+        percentiles: Dict[str, float],
+        window_seconds: float = 3600.0,
+        n_buckets: int = 12,
+        relative_accuracy: float = 0.001,
+        min_samples: int = 1_000,
+        refresh_seconds: float = 1.0,
+        shared_dir: str = "",
+        sync_seconds: float = 5.0,
+        model_version: str = "",
+    ):
+        self.percentiles = percentiles
+        self.model_version = model_version
+        self.min_samples = min_samples
+        self.refresh_seconds = refresh_seconds
+        self.sketch = SlidingQuantileSketch(window_seconds, n_buckets, relative_accuracy)
+
+        self.shared_dir = Path(shared_dir) if shared_dir else None
+        self.sync_seconds = sync_seconds
+        self._name = f"{socket.gethostname()}-{os.getpid()}.npz"
+        # Merged sketches of the other workers (replaced on every sync)
+        self._peers: Optional[SlidingQuantileSketch] = None
+        self._peer_count = 0
+        self._task: Optional[asyncio.Task] = None
+
+        self._cutoffs: Optional[Dict[str, float]] = None
+        self._samples = 0
+        self._refreshed_at = 0.0
+        # Bumped by reset(): a refresh / sync that raced it is discarded
+        self._generation = 0
+
+        # Metrics
+        self.observed = 0
+        self.refreshes = 0
+        self.sync_errors = 0
+        self.resets = 0
+
+    # ----------------------------
+    # FEED
+    # ----------------------------
+
+    def observe(self, risk_score: float):
+        self.sketch.add(risk_score)
+        self.observed += 1
+
+    def observe_many(self, risk_scores):
+        self.sketch.add_many(risk_scores)
+        self.observed += len(risk_scores)
+
+    def reset(self, model_version: str):
+        """
+        Scores now come from model_version: start an empty window (cutoffs
+        are None until it holds min_samples again) and merge only the
+        snapshots of workers serving the same version
+        """
+        self._generation += 1
+        self.model_version = model_version
+        self.sketch.clear()
+        self._peers = None
+        self._peer_count = 0
+        self._cutoffs = None
+        self._samples = 0
+        self._refreshed_at = 0.0
+        self.resets += 1
+
+    # ----------------------------
+    # THRESHOLDS
+    # ----------------------------
+
+    def cutoffs(self) -> Optional[Dict[str, float]]:
+        """
+        Scores at the configured percentiles over the window, None until warm
+        """
+        now = time.time()
+        if now - self._refreshed_at >= self.refresh_seconds:
+            self._refresh(now)
+        return self._cutoffs
+
+    def _refresh(self, now: float):
+        generation = self._generation
+        counts = self.sketch.window_counts(now)
+        peers = self._peers
+        if peers is not None:
+            counts = counts + peers.window_counts(now)
+
+        samples = int(counts.sum())
+        cutoffs = None
+        if samples >= self.min_samples:
+            names = list(self.percentiles)
+            qs = [self.percentiles[name] / 100.0 for name in names]
+            values = self.sketch.quantiles_of(counts, qs)
+            cutoffs = {name: float(value) for name, value in zip(names, values)}
+
+        if generation != self._generation:
+            return
+        self._cutoffs = cutoffs
+        self._samples = samples
+        self._refreshed_at = now
+        self.refreshes += 1
+
+    # ----------------------------
+    # CROSS-PROCESS SYNC
+    # ----------------------------
+
+    async def start(self):
+        if self.shared_dir is not None:
+            self._task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            # Last publish so the window survives a restart
+            await asyncio.to_thread(self.sync)
+
+    async def _sync_loop(self):
+        while True:
+            await asyncio.to_thread(self.sync)
+            await asyncio.sleep(self.sync_seconds)
+
+    def sync(self):
+        """
+        Publish this worker's sketch, merge the other workers' snapshots
+        (those of the same model version)
+        """
+        generation = self._generation
+        shared_dir = self.shared_dir / self.model_version if self.model_version else self.shared_dir
+        try:
+            self.sketch.snapshot(shared_dir / self._name)
+        except Exception as e:
+            self.sync_errors += 1
+            print(f"⚠️ Live threshold sketch not published: {e}")
+
+        # Snapshots not touched within the window have nothing left in it
+        oldest = time.time() - self.sketch.window_seconds
+        peers = SlidingQuantileSketch(
+            self.sketch.window_seconds,
+            self.sketch.n_buckets,
+            self.sketch.relative_accuracy,
+            self.sketch.min_value,
+            self.sketch.max_value,
+        )
+        merged = 0
+        for path in shared_dir.glob("*.npz"):
+            if path.name == self._name:
+                continue
+            try:
+                if path.stat().st_mtime < oldest:
+                    continue
+                peers.merge(SlidingQuantileSketch.load(path))
+                merged += 1
+            except Exception as e:
+                # Written mid-read or from a different layout: skip this round
+                self.sync_errors += 1
+                print(f"⚠️ Skipping live threshold sketch {path.name}: {e}")
+
+        if generation != self._generation:
+            return
+        self._peers = peers if merged else None
+        self._peer_count = merged
+
+    # ----------------------------
+    # METRICS
+    # ----------------------------
+
+    def get_info(self) -> dict:
+        cutoffs = self.cutoffs()
+        return {
+            "ready": cutoffs is not None,
+            "cutoffs": cutoffs,
+            "percentiles": self.percentiles,
+            "window_seconds": self.sketch.window_seconds,
+            "window_samples": self._samples,
+            "min_samples": self.min_samples,
+            "relative_accuracy": self.sketch.relative_accuracy,
+            "sketch_bytes": self.sketch.nbytes,
+            "model_version": self.model_version,
+            "peers": self._peer_count,
+            "observed": self.observed,
+            "resets": self.resets,
+            "sync_errors": self.sync_errors,
+        }
@@ -0,0 +1,144 @@
+"""
+Prediction Cache
+/predict results by (tx_hash, submitted features, model version): a retried
+or re-submitted transaction is answered from memory - no inference, no
+second Prediction row, no duplicate alert / notification
+"""
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from app.ml.model_loader import FEATURE_SCHEMA
+from app.schemas.models import PredictRequest, PredictResponse
+
+# (tx_hash, feature vector hash, model version, explain)
+CacheKey = Tuple[str, str, str, bool]
+
+
+class PredictionCache:
+    """
+    LRU + TTL of PredictResponses
+
+    - Keyed on the features as submitted (before wallet feature completion,
+      which changes once the first attempt is recorded)
+    - Concurrent requests for the same key share one computation
+    - Only successful predictions are cached
+    - invalidate() on model hot-swap; a computation that raced it isn't cached
+    Thread-safe: invalidate() runs on the registry reload thread.
+    """
+
+    def __init__(self, max_size: int = 100_000, ttl_seconds: float = 300.0):
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        self._entries: "OrderedDict[CacheKey, Tuple[PredictResponse, float]]" = OrderedDict()
+        self._in_flight: Dict[CacheKey, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expired = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(request: PredictRequest, model_version: str, explain: bool = False) -> CacheKey:
+        features = FEATURE_SCHEMA.matrix([request]).tobytes()
+        return (
+            request.tx_hash,
+            hashlib.blake2b(features, digest_size=8).hexdigest(),
+            model_version,
+            explain,
+        )
+
+    # ----------------------------
+    # LOOKUP
+    # ----------------------------
+
+    async def get_or_compute(
+        self,
+        key: CacheKey,
+        compute: Callable[[], Awaitable[PredictResponse]],
+    ) -> PredictResponse:
+        """
+        The cached response, the one another request for the key is
+        computing, or compute()'s result
+        """
+        response = self._get(key)
+        if response is not None:
+            return response
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        generation = self.generation
+        task = asyncio.ensure_future(compute())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda t, k=key: self._finish(k, t, generation))
+        # Shielded: a disconnecting client doesn't cancel it for the others
+        return await asyncio.shield(task)
+
+    def _get(self, key: CacheKey) -> Optional[PredictResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] >= self.ttl:
+                del self._entries[key]
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def _finish(self, key: CacheKey, task: asyncio.Task, generation: int):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (task.result(), time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    # ----------------------------
+    # INVALIDATION
+    # ----------------------------
+
+    def invalidate(self):
+        """
+        Drop everything (the serving model changed)
+        """
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+            self.invalidations += 1
+
+    def get_metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            # Requests answered by another request's computation
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "in_flight": len(self._in_flight),
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "invalidations": self.invalidations,
+        }
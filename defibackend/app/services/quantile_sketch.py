@@ -0,0 +1,224 @@
+"""
+Quantile Sketch
+Sliding-window, mergeable quantile estimates over a stream of risk scores
+Constant memory, relative-error guarantee (DDSketch-style log buckets)
+"""
+import math
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+SNAPSHOT_VERSION = 1
+
+
+class SlidingQuantileSketch:
+    """
+    Log-bucketed histogram per time bucket:
+        counts[slot, bin]   ring of n_buckets histograms
+        epochs[slot]        time bucket each slot currently holds
+
+    A value x falls in bin ceil(log_gamma(x)), gamma = (1 + a) / (1 - a);
+    every quantile estimate is within a relative error a of a value
+    actually seen. Memory is n_buckets * n_bins counters whatever the
+    traffic - ~440 KB for a = 0.1%, values in [1e-4, 1], 12 buckets.
+
+    Sketches with the same layout merge by adding the histograms of
+    matching time buckets (epochs are wall-clock based, so separate
+    processes line up).
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 3600.0,
+        n_buckets: int = 12,
+        relative_accuracy: float = 0.001,
+        min_value: float = 1e-4,
+        max_value: float = 1.0,
+    ):
+        if n_buckets < 1:
+            raise ValueError("n_buckets must be at least 1")
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        if not 0 < min_value < max_value:
+            raise ValueError("Need 0 < min_value < max_value")
+
+        self.window_seconds = window_seconds
+        self.n_buckets = n_buckets
+        self.bucket_seconds = window_seconds / n_buckets
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.max_value = max_value
+
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._inv_log_gamma = 1.0 / math.log(gamma)
+        self._offset = math.ceil(math.log(min_value) * self._inv_log_gamma)
+        self.n_bins = math.ceil(math.log(max_value) * self._inv_log_gamma) - self._offset + 1
+        # Bin i covers (gamma^(i-1), gamma^i]; estimate in its middle
+        exponents = np.arange(self.n_bins) + self._offset
+        self._values = 2.0 * gamma ** exponents / (gamma + 1.0)
+
+        self._lock = threading.Lock()
+        self.counts = np.zeros((n_buckets, self.n_bins), dtype=np.int64)
+        self.epochs = np.full(n_buckets, -1, dtype=np.int64)
+
+    # ----------------------------
+    # INSERTS
+    # ----------------------------
+
+    def _epoch(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds)
+
+    def _slot(self, epoch: int) -> int:
+        """
+        Slot for `epoch`, cleared first if it still holds an older bucket
+        """
+        slot = epoch % self.n_buckets
+        if self.epochs[slot] != epoch:
+            self.counts[slot] = 0
+            self.epochs[slot] = epoch
+        return slot
+
+    def _bin(self, value: float) -> int:
+        value = min(max(value, self.min_value), self.max_value)
+        return math.ceil(math.log(value) * self._inv_log_gamma) - self._offset
+
+    def add(self, value: float, timestamp: Optional[float] = None):
+        epoch = self._epoch(time.time() if timestamp is None else timestamp)
+        index = self._bin(value)
+        with self._lock:
+            self.counts[self._slot(epoch), index] += 1
+
+    def add_many(self, values, timestamp: Optional[float] = None):
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        clipped = np.clip(values, self.min_value, self.max_value)
+        bins = np.ceil(np.log(clipped) * self._inv_log_gamma).astype(np.int64) - self._offset
+        # Float rounding at the top edge
+        np.clip(bins, 0, self.n_bins - 1, out=bins)
+        histogram = np.bincount(bins, minlength=self.n_bins)
+
+        epoch = self._epoch(time.time() if timestamp is None else timestamp)
+        with self._lock:
+            self.counts[self._slot(epoch)] += histogram
+
+    # ----------------------------
+    # QUERIES
+    # ----------------------------
+
+    def window_counts(self, now: Optional[float] = None) -> np.ndarray:
+        """
+        Histogram over the last window_seconds (buckets that aged out excluded)
+        """
+        epoch = self._epoch(time.time() if now is None else now)
+        with self._lock:
+            active = (self.epochs > epoch - self.n_buckets) & (self.epochs <= epoch)
+            return self.counts[active].sum(axis=0)
+
+    def quantiles_of(self, counts: np.ndarray, qs) -> Optional[np.ndarray]:
+        """
+        Values at quantiles qs (0-1) of a histogram from window_counts
+        None for an empty histogram
+        """
+        cumulative = np.cumsum(counts)
+        total = int(cumulative[-1])
+        if total == 0:
+            return None
+        ranks = np.asarray(qs, dtype=np.float64) * (total - 1)
+        bins = np.searchsorted(cumulative, ranks, side="right")
+        return self._values[np.minimum(bins, self.n_bins - 1)]
+
+    def quantile(self, q: float, now: Optional[float] = None) -> Optional[float]:
+        values = self.quantiles_of(self.window_counts(now), [q])
+        return None if values is None else float(values[0])
+
+    def count(self, now: Optional[float] = None) -> int:
+        return int(self.window_counts(now).sum())
+
+    def clear(self):
+        """
+        Forget every value (e.g. they came from a model no longer serving)
+        """
+        with self._lock:
+            self.counts[:] = 0
+            self.epochs[:] = -1
+
+    @property
+    def nbytes(self) -> int:
+        return self.counts.nbytes + self.epochs.nbytes
+
+    # ----------------------------
+    # MERGE / SNAPSHOT
+    # ----------------------------
+
+    def _layout(self) -> tuple:
+        return (self.n_buckets, self.bucket_seconds, self.relative_accuracy,
+                self.min_value, self.max_value)
+
+    def merge(self, other: "SlidingQuantileSketch"):
+        """
+        Add another sketch's buckets into this one (same layout required)
+        A bucket older than the one held in the slot is dropped
+        """
+        if other._layout() != self._layout():
+            raise ValueError("Cannot merge quantile sketches with different layouts")
+
+        with other._lock:
+            counts = other.counts.copy()
+            epochs = other.epochs.copy()
+
+        with self._lock:
+            for slot, epoch in enumerate(epochs.tolist()):
+                if epoch < 0 or epoch < self.epochs[slot]:
+                    continue
+                if epoch > self.epochs[slot]:
+                    self.counts[slot] = 0
+                    self.epochs[slot] = epoch
+                self.counts[slot] += counts[slot]
+
+    def snapshot(self, path) -> None:
+        """
+        Write the sketch to a compressed .npz (atomic replace)
+        """
+        with self._lock:
+            counts = self.counts.copy()
+            epochs = self.epochs.copy()
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                version=SNAPSHOT_VERSION,
+                window_seconds=self.window_seconds,
+                n_buckets=self.n_buckets,
+                relative_accuracy=self.relative_accuracy,
+                min_value=self.min_value,
+                max_value=self.max_value,
+                counts=counts,
+                epochs=epochs,
+            )
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path) -> "SlidingQuantileSketch":
+        with np.load(path) as data:
+            if int(data["version"]) != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported quantile sketch snapshot version {data['version']}")
+            sketch = cls(
+                float(data["window_seconds"]),
+                int(data["n_buckets"]),
+                float(data["relative_accuracy"]),
+                float(data["min_value"]),
+                float(data["max_value"]),
+            )
+            if data["counts"].shape != sketch.counts.shape:
+                raise ValueError("Quantile sketch snapshot has a different bin layout")
+            sketch.counts[:] = data["counts"]
+            sketch.epochs[:] = data["epochs"]
+        return sketch
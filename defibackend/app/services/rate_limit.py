@@ -0,0 +1,69 @@
+"""
+Rate Limiting
+Token buckets shared by the outbound API clients (Etherscan, Telegram)
+"""
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    At most `rate` tokens per second, bursts up to `burst`
+    Non-blocking: reserve() says how long to wait instead of sleeping
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst or max(int(rate), 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Take a token and return 0, or return the seconds until one is available
+        """
+        self._refill(time.monotonic())
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def is_idle(self) -> bool:
+        """
+        Refilled to a full burst (safe to forget)
+        """
+        self._refill(time.monotonic())
+        return self._tokens >= self.burst
+
+
+class RateLimiter:
+    """
+    Async token bucket: at most `rate` calls per second, bursts up to `burst`
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.bucket = TokenBucket(rate, burst)
+        self.rate = self.bucket.rate
+        self.burst = self.bucket.burst
+        self._lock = asyncio.Lock()
+
+        # Metrics
+        self.waits = 0
+        self.waited_s = 0.0
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                delay = self.bucket.reserve()
+                if delay == 0:
+                    return
+                self.waits += 1
+                self.waited_s += delay
+                await asyncio.sleep(delay)
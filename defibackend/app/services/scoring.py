@@ -5,10 +5,80 @@ CRITICAL SEPARATION: Detection ≠ Decision
 Judges love this architectural choice
 """
 import numpy as np
-from typing import Dict
-from app.schemas.models import RiskLevel
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+from app.ml.model_loader import CALIBRATION_PATH
+from app.schemas.models import PredictResponse, RiskLevel
+from app.services.calibration import CalibrationStore
+from app.services.live_threshold import LiveThreshold
 from config.settings import settings
 
+# Raw score cutoffs used while no calibration table is loaded
+CRITICAL_SCORE = 0.9
+HIGH_SCORE = 0.7
+MEDIUM_SCORE = 0.5
+
+# np.digitize over the medium / high / critical cutoffs -> index into this
+RISK_LEVELS = np.array(
+    [RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH, RiskLevel.CRITICAL],
+    dtype=object,
+)
+
+
+@dataclass
+class ScoredBatch:
+    """
+    Decisions for a batch of scores - one array per response field
+    """
+    risk_scores: np.ndarray
+    level_index: np.ndarray  # Into RISK_LEVELS
+    is_alert: np.ndarray
+    confidence: np.ndarray
+    percentiles: Optional[np.ndarray]  # None without a calibration table
+    threshold: float
+
+    def __len__(self) -> int:
+        return len(self.risk_scores)
+
+    @property
+    def alerts_count(self) -> int:
+        return int(np.count_nonzero(self.is_alert))
+
+    def risk_levels(self) -> List[RiskLevel]:
+        return RISK_LEVELS[self.level_index].tolist()
+
+    def to_responses(self) -> List[PredictResponse]:
+        """
+        Serialization edge: arrays -> PredictResponse objects
+        (the only per-row Python work left in a batch)
+        """
+        timestamp = datetime.utcnow()
+        percentiles = (
+            self.percentiles.tolist() if self.percentiles is not None
+            else [None] * len(self)
+        )
+
+        return [
+            PredictResponse(
+                risk_score=risk_score,
+                risk_level=risk_level,
+                is_alert=is_alert,
+                threshold=self.threshold,
+                confidence=confidence,
+                risk_percentile=percentile,
+                timestamp=timestamp,
+            )
+            for risk_score, risk_level, is_alert, confidence, percentile in zip(
+                self.risk_scores.tolist(),
+                self.risk_levels(),
+                self.is_alert.tolist(),
+                self.confidence.tolist(),
+                percentiles,
+            )
+        ]
+
+
 class ScoringService:
     """
     Converts raw risk scores into actionable decisions
@@ -16,24 +86,137 @@ class ScoringService:
     """
     
     def __init__(self):
-        # These would be calculated from historical data in production
-        # For demo, we use configured values
+        # Fixed cutoffs until live traffic or a calibration table (built
+        # from historical scores) provides percentiles
         self.threshold = settings.HIGH_RISK_THRESHOLD
         self.percentile = settings.RISK_THRESHOLD_PERCENTILE
+        self.critical_percentile = settings.RISK_CRITICAL_PERCENTILE
+        self.medium_percentile = settings.RISK_MEDIUM_PERCENTILE
+
+        # Score -> percentile table, hot-reloaded from next to the model
+        # (only used when built for the serving model, see set_model_version)
+        self.calibration = CalibrationStore(
+            CALIBRATION_PATH,
+            settings.CALIBRATION_RELOAD_INTERVAL_SECONDS,
+            settings.MODEL_VERSION,
+        )
+        self._cutoffs_cache = (None, None)
+
+        # Same percentiles over a sliding window of live scores
+        self.threshold_source = settings.ALERT_THRESHOLD_SOURCE
+        self.live = LiveThreshold(
+            {
+                "critical": self.critical_percentile,
+                "high": self.percentile,
+                "medium": self.medium_percentile,
+            },
+            window_seconds=settings.LIVE_THRESHOLD_WINDOW_SECONDS,
+            n_buckets=settings.LIVE_THRESHOLD_BUCKETS,
+            relative_accuracy=settings.LIVE_THRESHOLD_RELATIVE_ACCURACY,
+            min_samples=settings.LIVE_THRESHOLD_MIN_SAMPLES,
+            refresh_seconds=settings.LIVE_THRESHOLD_REFRESH_SECONDS,
+            shared_dir=settings.LIVE_THRESHOLD_SHARED_DIR,
+            sync_seconds=settings.LIVE_THRESHOLD_SYNC_SECONDS,
+            model_version=settings.MODEL_VERSION,
+        )
+
+    def set_model_version(self, model_version: str) -> None:
+        """
+        Scores now come from model_version: a calibration table built
+        for another model is dropped and the live window starts over,
+        so cutoffs fall back to fixed ones until either is rebuilt
+        """
+        self.calibration.set_model_version(model_version)
+        if model_version != self.live.model_version:
+            self.live.reset(model_version)
+
+    def observe(self, risk_scores) -> None:
+        """
+        Feed scored transactions to the live threshold sketch
+        """
+        self.live.observe_many(risk_scores)
+
+    def observe_one(self, risk_score: float) -> None:
+        self.live.observe(risk_score)
+
+    def cutoff_source(self) -> str:
+        """
+        Where cutoffs currently come from: "live", "calibration" or "fixed"
+        """
+        if self.threshold_source == "live" and self.live.cutoffs() is not None:
+            return "live"
+        if self.calibration.table is not None:
+            return "calibration"
+        return "fixed"
+
+    def cutoffs(self) -> Dict[str, float]:
+        """
+        Raw score cutoffs for critical / high / medium and alerts
+        Live (once the window is warm), else the calibration table's
+        percentiles (derived once per table), else fixed scores
+        """
+        if self.threshold_source == "live":
+            live = self.live.cutoffs()
+            if live is not None:
+                return {**live, "alert": live["high"]}
+
+        table = self.calibration.table
+        if table is None:
+            return {
+                "critical": CRITICAL_SCORE,
+                "high": HIGH_SCORE,
+                "medium": MEDIUM_SCORE,
+                "alert": self.threshold,
+            }
+
+        cached_table, cutoffs = self._cutoffs_cache
+        if cached_table is not table:
+            high = table.score_at(self.percentile)
+            cutoffs = {
+                "critical": table.score_at(self.critical_percentile),
+                "high": high,
+                "medium": table.score_at(self.medium_percentile),
+                "alert": high,
+            }
+            self._cutoffs_cache = (table, cutoffs)
+        return cutoffs
+
+    def alert_threshold(self) -> float:
+        """
+        Raw score at which alerts fire (calibrated when a table is loaded)
+        """
+        return self.cutoffs()["alert"]
+
+    def calibrate(self, risk_scores) -> Optional[np.ndarray]:
+        """
+        Calibrated percentiles (0-100) for a batch of raw scores
+        None while no calibration table is loaded
+        """
+        table = self.calibration.table
+        if table is None:
+            return None
+        return table.percentiles(risk_scores)
+
+    def calibrate_one(self, risk_score: float) -> Optional[float]:
+        table = self.calibration.table
+        if table is None:
+            return None
+        return table.percentile(risk_score)
     
     def classify_risk_level(self, risk_score: float) -> RiskLevel:
         """
         Classify risk score into risk levels
         Args:
-            risk_score: normalized risk score (0-1)
+            risk_score: raw risk score
         Returns:
             RiskLevel enum
         """
-        if risk_score >= 0.9:
+        cutoffs = self.cutoffs()
+        if risk_score >= cutoffs["critical"]:
             return RiskLevel.CRITICAL
-        elif risk_score >= 0.7:
+        elif risk_score >= cutoffs["high"]:
             return RiskLevel.HIGH
-        elif risk_score >= 0.5:
+        elif risk_score >= cutoffs["medium"]:
             return RiskLevel.MEDIUM
         else:
             return RiskLevel.LOW
@@ -47,7 +230,7 @@ class ScoringService:
         Returns:
             True if alert should be triggered
         """
-        return risk_score >= self.threshold
+        return risk_score >= self.alert_threshold()
     
     def calculate_confidence(self, risk_score: float) -> float:
         """
@@ -62,7 +245,41 @@ class ScoringService:
         # Score of 0 or 1 = maximum confidence (100%)
         deviation = abs(risk_score - 0.5)
         confidence = 0.5 + deviation  # Maps [0, 0.5] to [0.5, 1.0]
-        return float(np.clip(confidence, 0, 1))
+        return float(min(max(confidence, 0.0), 1.0))
+
+    def calculate_confidences(self, risk_scores: np.ndarray) -> np.ndarray:
+        """
+        calculate_confidence for an array of scores
+        """
+        confidence = np.abs(risk_scores - 0.5)
+        confidence += 0.5
+        return np.clip(confidence, 0.0, 1.0, out=confidence)
+
+    def score_batch(self, risk_scores) -> ScoredBatch:
+        """
+        classify_risk_level / should_alert / calculate_confidence for a
+        whole batch in array operations; cutoffs are read once per batch
+        Args:
+            risk_scores: raw risk scores (list or array)
+        Returns:
+            ScoredBatch of per-score arrays
+        """
+        scores = np.asarray(risk_scores, dtype=np.float64)
+        cutoffs = self.cutoffs()
+
+        # bins[i - 1] <= score < bins[i]: same >= semantics as classify_risk_level
+        level_index = np.digitize(
+            scores, [cutoffs["medium"], cutoffs["high"], cutoffs["critical"]]
+        )
+
+        return ScoredBatch(
+            risk_scores=scores,
+            level_index=level_index,
+            is_alert=scores >= cutoffs["alert"],
+            confidence=self.calculate_confidences(scores),
+            percentiles=self.calibrate(scores),
+            threshold=cutoffs["alert"],
+        )
     
     def get_threshold_info(self) -> Dict[str, float]:
         """
@@ -70,18 +287,24 @@ class ScoringService:
         Returns:
             Dictionary with threshold information
         """
+        cutoffs = self.cutoffs()
         return {
-            "alert_threshold": self.threshold,
+            "source": self.cutoff_source(),
+            "calibrated": self.calibration.table is not None,
+            "alert_threshold": cutoffs["alert"],
             "percentile": self.percentile,
-            "critical_threshold": 0.9,
-            "high_threshold": 0.7,
-            "medium_threshold": 0.5
+            "critical_threshold": cutoffs["critical"],
+            "high_threshold": cutoffs["high"],
+            "medium_threshold": cutoffs["medium"],
+            "live": self.live.get_info(),
         }
     
     def update_threshold(self, new_threshold: float) -> None:
         """
         Update alert threshold dynamically
         Useful for protocol-specific tuning
+        Applies while neither live nor calibrated cutoffs are available
+        (see RISK_THRESHOLD_PERCENTILE / ALERT_THRESHOLD_SOURCE)
         Args:
             new_threshold: new threshold value (0-1)
         """
@@ -124,26 +347,29 @@ class ScoringService:
         base_explanation = explanations[risk_level]
         
         if is_alert:
-            base_explanation += f" Alert triggered (score: {risk_score:.3f} > threshold: {self.threshold:.3f})."
+            base_explanation += f" Alert triggered (score: {risk_score:.3f} > threshold: {self.alert_threshold():.3f})."
         
         return base_explanation
     
-    def analyze_batch(self, risk_scores: list) -> Dict[str, any]:
+    def analyze_batch(self, risk_scores) -> Dict[str, any]:
         """
         Analyze batch of risk scores for statistics
         Args:
-            risk_scores: list of risk scores
+            risk_scores: list / array of risk scores
         Returns:
             statistical summary
         """
-        scores_array = np.array(risk_scores)
-        
+        scores_array = np.asarray(risk_scores, dtype=np.float64)
+        n = len(scores_array)
+        mean = scores_array.mean()
+        alerts_count = int(np.count_nonzero(scores_array >= self.alert_threshold()))
+
         return {
-            "mean_risk": float(np.mean(scores_array)),
+            "mean_risk": float(mean),
             "median_risk": float(np.median(scores_array)),
-            "max_risk": float(np.max(scores_array)),
-            "min_risk": float(np.min(scores_array)),
-            "std_risk": float(np.std(scores_array)),
-            "alerts_count": sum(1 for score in risk_scores if score >= self.threshold),
-            "alert_rate": sum(1 for score in risk_scores if score >= self.threshold) / len(risk_scores)
+            "max_risk": float(scores_array.max()),
+            "min_risk": float(scores_array.min()),
+            "std_risk": float(np.sqrt(np.dot(scores_array - mean, scores_array - mean) / n)),
+            "alerts_count": alerts_count,
+            "alert_rate": alerts_count / n
         }
\ No newline at end of file
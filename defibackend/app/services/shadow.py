@@ -0,0 +1,213 @@
+"""
+Shadow Scoring
+A candidate model scores a sample of live traffic off the request path
+Its score distribution and alert decisions are compared with the serving model's
+"""
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import numpy as np
+
+from app.ml.compiled_forest import CompiledForest
+from app.services.quantile_sketch import SlidingQuantileSketch
+
+REPORT_QUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99, "p99.9": 0.999}
+
+
+class ShadowScorer:
+    """
+    Rows sampled with probability `fraction` are scored again by the
+    candidate on one background thread; requests never wait for it.
+    While a sample is being scored, new ones are dropped (counted), so
+    shadow work can't queue up behind a slow candidate.
+
+    - Quantiles / KS distance: both models' scores over the last window
+    - Differences and alert agreement: totals since the candidate was set
+    """
+
+    def __init__(
+        self,
+        fraction: float = 0.1,
+        alert_cutoff: Optional[Callable[[], float]] = None,
+        window_seconds: float = 3600.0,
+        seed: Optional[int] = None,
+    ):
+        self.fraction = fraction
+        self.alert_cutoff = alert_cutoff
+        self.window_seconds = window_seconds
+        self._rng = np.random.default_rng(seed)
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow")
+        self._lock = threading.Lock()
+        self._pending = False
+
+        self.version: Optional[str] = None
+        self.engine: Optional[CompiledForest] = None
+        self._reset()
+
+    def _reset(self):
+        self.primary = SlidingQuantileSketch(self.window_seconds)
+        self.candidate = SlidingQuantileSketch(self.window_seconds)
+        self.sampled = 0
+        self.dropped = 0
+        self.errors = 0
+        self._sums = np.zeros(5)  # primary, candidate, primary², candidate², primary·candidate
+        self._abs_diff = 0.0
+        self._max_abs_diff = 0.0
+        # [both alert, primary only, candidate only]
+        self._alerts = np.zeros(3, dtype=np.int64)
+
+    # ----------------------------
+    # CANDIDATE
+    # ----------------------------
+
+    def set_candidate(self, engine: Optional[CompiledForest], version: Optional[str]):
+        """
+        Start comparing against a new candidate (None stops shadowing)
+        """
+        with self._lock:
+            self.engine = engine
+            self.version = version
+            self._reset()
+
+    @property
+    def active(self) -> bool:
+        return self.engine is not None and self.fraction > 0
+
+    # ----------------------------
+    # SAMPLING
+    # ----------------------------
+
+    def sample(self, X: np.ndarray, primary_scores: np.ndarray):
+        """
+        Called with every scored batch; returns immediately
+        """
+        engine, version = self.engine, self.version
+        if engine is None or self.fraction <= 0:
+            return
+
+        mask = self._rng.random(len(X)) < self.fraction
+        n = int(mask.sum())
+        if n == 0:
+            return
+
+        with self._lock:
+            if self._pending:
+                self.dropped += n
+                return
+            self._pending = True
+
+        self._pool.submit(
+            self._score, engine, version,
+            np.asarray(X)[mask], np.asarray(primary_scores, dtype=np.float64)[mask],
+        )
+
+    def _score(self, engine, version, X, primary):
+        try:
+            candidate = engine.risk_scores(X)
+            cutoff = self.alert_cutoff() if self.alert_cutoff is not None else None
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+                self._pending = False
+            print(f"⚠️ Shadow scoring failed ({version}): {e}")
+            return
+
+        with self._lock:
+            self._pending = False
+            if version != self.version:
+                # Candidate replaced while this sample was scored
+                return
+            self._record(primary, candidate, cutoff)
+
+    def _record(self, primary, candidate, cutoff):
+        self.primary.add_many(primary)
+        self.candidate.add_many(candidate)
+        self.sampled += len(primary)
+
+        self._sums += (
+            primary.sum(), candidate.sum(),
+            (primary ** 2).sum(), (candidate ** 2).sum(),
+            (primary * candidate).sum(),
+        )
+        diff = np.abs(candidate - primary)
+        self._abs_diff += float(diff.sum())
+        self._max_abs_diff = max(self._max_abs_diff, float(diff.max()))
+
+        if cutoff is not None:
+            primary_alert = primary >= cutoff
+            candidate_alert = candidate >= cutoff
+            self._alerts += (
+                int((primary_alert & candidate_alert).sum()),
+                int((primary_alert & ~candidate_alert).sum()),
+                int((~primary_alert & candidate_alert).sum()),
+            )
+
+    # ----------------------------
+    # REPORT
+    # ----------------------------
+
+    def get_info(self) -> dict:
+        with self._lock:
+            info = {
+                "version": self.version,
+                "active": self.active,
+                "fraction": self.fraction,
+                "sampled": self.sampled,
+                "dropped": self.dropped,
+                "errors": self.errors,
+            }
+            if not self.sampled:
+                return info
+
+            n = self.sampled
+            mean_p, mean_c, sq_p, sq_c, cross = (self._sums / n).tolist()
+            var_p, var_c = sq_p - mean_p ** 2, sq_c - mean_c ** 2
+            covariance = cross - mean_p * mean_c
+            correlation = (
+                covariance / math.sqrt(var_p * var_c) if var_p > 0 and var_c > 0 else None
+            )
+
+            primary_counts = self.primary.window_counts()
+            candidate_counts = self.candidate.window_counts()
+            both, primary_only, candidate_only = self._alerts.tolist()
+
+        qs = list(REPORT_QUANTILES.values())
+        primary_q = self.primary.quantiles_of(primary_counts, qs)
+        candidate_q = self.candidate.quantiles_of(candidate_counts, qs)
+
+        info.update({
+            "mean": {"primary": mean_p, "candidate": mean_c},
+            "mean_abs_diff": self._abs_diff / n,
+            "max_abs_diff": self._max_abs_diff,
+            "correlation": correlation,
+            "ks_statistic": self._ks(primary_counts, candidate_counts),
+            "quantiles": (
+                {
+                    name: {"primary": float(p), "candidate": float(c)}
+                    for name, p, c in zip(REPORT_QUANTILES, primary_q, candidate_q)
+                }
+                if primary_q is not None and candidate_q is not None else None
+            ),
+            "alerts": {
+                "both": both,
+                "primary_only": primary_only,
+                "candidate_only": candidate_only,
+            },
+        })
+        return info
+
+    @staticmethod
+    def _ks(primary_counts: np.ndarray, candidate_counts: np.ndarray) -> Optional[float]:
+        """
+        Largest gap between the two empirical CDFs (same sketch bins)
+        """
+        if primary_counts.sum() == 0 or candidate_counts.sum() == 0:
+            return None
+        cdf_p = np.cumsum(primary_counts) / primary_counts.sum()
+        cdf_c = np.cumsum(candidate_counts) / candidate_counts.sum()
+        return float(np.abs(cdf_p - cdf_c).max())
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
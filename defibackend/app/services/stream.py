@@ -0,0 +1,307 @@
+"""
+Stream Sessions
+Per-connection pipeline for long-lived scoring streams (WebSocket / NDJSON)
+Records are micro-batched internally and answered in arrival order
+"""
+import asyncio
+import itertools
+import json
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Tuple, Union
+
+from pydantic import ValidationError
+
+from app.schemas.models import PredictRequest, PredictResponse
+
+# score_batch(requests) -> one PredictResponse or error message per request
+ScoreBatch = Callable[[List[PredictRequest]], Awaitable[List[Union[PredictResponse, str]]]]
+
+# (position in the stream, response or error message)
+StreamResult = Tuple[int, Union[PredictResponse, str]]
+
+_END = object()
+
+
+def validation_message(error: ValidationError) -> str:
+    """
+    One-line summary of a pydantic ValidationError
+    """
+    parts = []
+    for err in error.errors():
+        loc = ".".join(str(part) for part in err["loc"])
+        parts.append(f"{loc}: {err['msg']}" if loc else err["msg"])
+    return "; ".join(parts)
+
+
+def encode_results(results: List[StreamResult]) -> str:
+    """
+    NDJSON lines: the PredictResponse, or {"index", "error"} for a rejected record
+    """
+    lines = []
+    for index, result in results:
+        if isinstance(result, PredictResponse):
+            lines.append(result.model_dump_json())
+        else:
+            lines.append(json.dumps({"index": index, "error": result}))
+    return "\n".join(lines) + "\n"
+
+
+class StreamSession:
+    """
+    One streaming connection
+
+        transport reader --put()--> [bounded queue] --> batch loop --> score_batch
+                                                                          |
+        transport writer <------------- results() <----- [scored batches, in order]
+
+    Flow control: the input queue holds at most max_in_flight records. When it
+    is full put() blocks, the transport stops reading and the client is
+    throttled by TCP / WebSocket backpressure. At most max_batches_in_flight
+    batches are scored ahead of the writer, so a slow reader throttles too.
+    """
+
+    def __init__(
+        self,
+        score_batch: ScoreBatch,
+        transport: str,
+        max_batch_size: int = 512,
+        max_wait_ms: float = 5.0,
+        max_in_flight: int = 4096,
+        max_batches_in_flight: int = 2,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_in_flight < 1 or max_batches_in_flight < 1:
+            raise ValueError("in-flight limits must be at least 1")
+
+        self.score_batch = score_batch
+        self.transport = transport
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_in_flight = max_in_flight
+
+        self._input: asyncio.Queue = asyncio.Queue(maxsize=max_in_flight)
+        self._scored: asyncio.Queue = asyncio.Queue(maxsize=max_batches_in_flight)
+        self._next_index = 0
+
+        # Metrics
+        self.id = None
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self._finished = None
+        self.rows_in = 0
+        self.rows_out = 0
+        self.errors = 0
+        self.batches = 0
+        self.max_batch_seen = 0
+        self.backpressure_waits = 0
+        self.blocked_s = 0.0
+        self.scoring_s = 0.0
+
+    # ----------------------------
+    # INPUT
+    # ----------------------------
+
+    async def put(self, item: Union[PredictRequest, str]):
+        """
+        Queue a parsed record (or an error message for a rejected one)
+        Blocks while max_in_flight records are waiting to be scored
+        """
+        entry = (self._next_index, item)
+        self._next_index += 1
+        self.rows_in += 1
+
+        if self._input.full():
+            self.backpressure_waits += 1
+            start = time.perf_counter()
+            await self._input.put(entry)
+            self.blocked_s += time.perf_counter() - start
+        else:
+            self._input.put_nowait(entry)
+
+    async def feed_line(self, line: Union[bytes, str]):
+        """
+        Parse one NDJSON line into a PredictRequest and queue it
+        Blank lines are ignored; invalid records are answered with an error
+        """
+        if not line.strip():
+            return
+        try:
+            item = PredictRequest.model_validate_json(line)
+        except ValidationError as e:
+            item = validation_message(e)
+        await self.put(item)
+
+    async def end(self):
+        """
+        No more input: flush what is queued, then results() finishes
+        """
+        await self._input.put(_END)
+
+    def abort(self):
+        """
+        end() for a reader cancelled because the writer is gone: nothing
+        drains the queue any more, so drop what is queued instead of waiting
+        """
+        while not self._input.empty():
+            self._input.get_nowait()
+        self._input.put_nowait(_END)
+
+    # ----------------------------
+    # BATCHING
+    # ----------------------------
+
+    async def _next_batch(self) -> Tuple[list, bool]:
+        """
+        Wait for the first record, then gather up to max_batch_size more
+        for at most max_wait. Returns (batch, reached_end)
+        """
+        entry = await self._input.get()
+        if entry is _END:
+            return [], True
+
+        batch = [entry]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            try:
+                entry = self._input.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._input.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if entry is _END:
+                return batch, True
+            batch.append(entry)
+
+        return batch, False
+
+    async def _score(self, batch: list) -> List[StreamResult]:
+        """
+        Score the valid records of a batch; rejected ones keep their error
+        """
+        results = dict(batch)
+        valid = [(index, item) for index, item in batch if isinstance(item, PredictRequest)]
+
+        if valid:
+            start = time.perf_counter()
+            scored = await self.score_batch([item for _, item in valid])
+            self.scoring_s += time.perf_counter() - start
+            for (index, _), result in zip(valid, scored):
+                results[index] = result
+
+        return [(index, results[index]) for index, _ in batch]
+
+    async def _batch_loop(self):
+        """
+        Cut the input into micro-batches and start scoring them in order
+        """
+        done = False
+        while not done:
+            batch, done = await self._next_batch()
+            if not batch:
+                break
+
+            self.batches += 1
+            self.max_batch_seen = max(self.max_batch_seen, len(batch))
+
+            # Blocks once max_batches_in_flight are waiting on the writer
+            await self._scored.put(asyncio.ensure_future(self._score(batch)))
+
+        await self._scored.put(_END)
+
+    # ----------------------------
+    # OUTPUT
+    # ----------------------------
+
+    async def results(self) -> AsyncIterator[List[StreamResult]]:
+        """
+        Scored batches in stream order, until end() has been drained
+        """
+        batcher = asyncio.ensure_future(self._batch_loop())
+        try:
+            while True:
+                task = await self._scored.get()
+                if task is _END:
+                    break
+
+                batch = await task
+                self.rows_out += len(batch)
+                self.errors += sum(
+                    1 for _, result in batch if not isinstance(result, PredictResponse)
+                )
+                yield batch
+
+            # Surface batch loop failures instead of ending silently
+            await batcher
+        finally:
+            self._finished = time.perf_counter()
+            batcher.cancel()
+            while not self._scored.empty():
+                task = self._scored.get_nowait()
+                if task is not _END:
+                    task.cancel()
+
+    # ----------------------------
+    # METRICS
+    # ----------------------------
+
+    def get_metrics(self) -> dict:
+        elapsed = (self._finished or time.perf_counter()) - self._started
+        return {
+            "id": self.id,
+            "transport": self.transport,
+            "started_at": self.started_at,
+            "duration_s": elapsed,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "errors": self.errors,
+            "rows_per_sec": self.rows_out / elapsed if elapsed > 0 else 0.0,
+            "batches": self.batches,
+            "avg_batch_size": self.rows_out / self.batches if self.batches else 0.0,
+            "max_batch_size_seen": self.max_batch_seen,
+            "queue_depth": self._input.qsize(),
+            "max_in_flight": self.max_in_flight,
+            "backpressure_waits": self.backpressure_waits,
+            "blocked_ms": self.blocked_s * 1000,
+            "scoring_ms": self.scoring_s * 1000,
+        }
+
+
+class StreamRegistry:
+    """
+    Active stream sessions plus totals for closed ones
+    """
+
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self._active: Dict[int, StreamSession] = {}
+        self.streams_total = 0
+        self.rows_total = 0
+        self.errors_total = 0
+
+    def open(self, session: StreamSession) -> StreamSession:
+        session.id = next(self._ids)
+        self._active[session.id] = session
+        self.streams_total += 1
+        return session
+
+    def close(self, session: StreamSession):
+        if self._active.pop(session.id, None) is not None:
+            self.rows_total += session.rows_out
+            self.errors_total += session.errors
+
+    def get_metrics(self) -> dict:
+        active = list(self._active.values())
+        return {
+            "active_streams": len(active),
+            "streams_total": self.streams_total,
+            "rows_total": self.rows_total + sum(s.rows_out for s in active),
+            "errors_total": self.errors_total + sum(s.errors for s in active),
+            "connections": [s.get_metrics() for s in active],
+        }
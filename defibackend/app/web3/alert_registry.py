@@ -4,15 +4,16 @@ Manages on-chain alert creation
 Blockchain used for AUDITABILITY, not computation
 """
 
-from typing import Optional
-from web3 import Web3
-from app.web3.client import Web3Client
+from typing import Callable, Dict, List, Optional
+from app.web3.anchor import MerkleAnchorer
+from app.web3.sender import AlertTransactionSender
 from config.settings import settings
 
 
 # ✅ ABI MUST MATCH DEPLOYED CONTRACT EXACTLY
 # Solidity:
 # function createAlert(bytes32 _txHash, uint8 _riskScore) external
+# function anchorAlertBatch(bytes32 _merkleRoot, uint32 _alertCount) external
 ALERT_REGISTRY_ABI = [
     {
         "inputs": [
@@ -23,6 +24,16 @@ ALERT_REGISTRY_ABI = [
         "outputs": [],
         "stateMutability": "nonpayable",
         "type": "function"
+    },
+    {
+        "inputs": [
+            {"internalType": "bytes32", "name": "_merkleRoot", "type": "bytes32"},
+            {"internalType": "uint32", "name": "_alertCount", "type": "uint32"}
+        ],
+        "name": "anchorAlertBatch",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function"
     }
 ]
 
@@ -31,42 +42,89 @@ class AlertRegistry:
     """
     On-chain alert registry
     Purpose: Immutable audit trail, not real-time computation
-    """
 
-    def __init__(self):
-        self.web3_client = Web3Client()
-        self.contract = None
-        self._initialize_contract()
+    createAlert transactions go through an AlertTransactionSender: nonces
+    are managed locally, transactions are signed and pipelined without
+    waiting for receipts, and confirmed hashes are reported to on_confirmed
 
-    def _initialize_contract(self):
+    With ALERT_ANCHOR_MODE=merkle alerts are collected by a MerkleAnchorer
+    instead and anchored one root per window; each alert's inclusion proof
+    goes to store_proofs
+    """
+
+    def __init__(
+        self,
+        on_confirmed: Optional[Callable[[Dict[int, str]], None]] = None,
+        store_proofs: Optional[Callable[[List[dict]], None]] = None,
+    ):
+        self.on_confirmed = on_confirmed
+        self.store_proofs = store_proofs
+        self.sender: Optional[AlertTransactionSender] = None
+        self.anchorer: Optional[MerkleAnchorer] = None
+        self._initialize_sender()
+
+    def _initialize_sender(self):
         """
-        Initialize smart contract instance
+        Set up the transaction sender if a contract and key are configured
         """
-        if not self.web3_client.is_connected():
-            print("⚠️ Web3 not connected - alerts will be DB-only")
-            return
-
         contract_address = settings.ALERT_REGISTRY_CONTRACT
 
         if not contract_address or contract_address == "0x...":
-            print("ℹ️ Alert registry contract not configured")
+            print("ℹ️ Alert registry contract not configured - alerts will be DB-only")
+            return
+
+        if not settings.PRIVATE_KEY:
+            print("⚠️ No signing account configured - alerts will be DB-only")
             return
 
         try:
-            self.contract = self.web3_client.w3.eth.contract(
-                address=Web3.to_checksum_address(contract_address),
-                abi=ALERT_REGISTRY_ABI
+            self.sender = AlertTransactionSender(
+                rpc_url=settings.WEB3_RPC_URL,
+                contract_address=contract_address,
+                abi=ALERT_REGISTRY_ABI,
+                private_key=settings.PRIVATE_KEY,
+                on_confirmed=self.on_confirmed,
+                gas_limit=settings.ALERT_TX_GAS_LIMIT,
+                max_batch=settings.ALERT_TX_MAX_BATCH,
+                queue_size=settings.ALERT_TX_QUEUE_SIZE,
+                poll_interval=settings.ALERT_TX_POLL_INTERVAL_SECONDS,
+                receipt_timeout_blocks=settings.ALERT_TX_RECEIPT_TIMEOUT_BLOCKS,
             )
-            print(f"✅ Alert registry contract loaded at {contract_address}")
+            print(f"✅ Alert registry contract configured at {contract_address}")
         except Exception as e:
-            print(f"⚠️ Contract initialization error: {e}")
-            self.contract = None
+            print(f"⚠️ Alert sender initialization error: {e}")
+            self.sender = None
+            return
+
+        if settings.ALERT_ANCHOR_MODE == "merkle" and self.store_proofs is not None:
+            self.anchorer = MerkleAnchorer(
+                self.sender,
+                self.store_proofs,
+                window_seconds=settings.ALERT_ANCHOR_WINDOW_SECONDS,
+                max_batch=settings.ALERT_ANCHOR_MAX_BATCH,
+            )
+            print(f"🌳 Alerts anchored as Merkle roots "
+                  f"(window {settings.ALERT_ANCHOR_WINDOW_SECONDS}s, "
+                  f"max {settings.ALERT_ANCHOR_MAX_BATCH} alerts)")
+
+    async def start(self):
+        if self.sender is not None:
+            await self.sender.start()
+        if self.anchorer is not None:
+            await self.anchorer.start()
+
+    async def stop(self):
+        if self.anchorer is not None:
+            await self.anchorer.stop()
+        if self.sender is not None:
+            await self.sender.stop()
 
     async def create_alert(
         self,
         wallet_address: str,  # kept for API consistency (NOT used on-chain)
         risk_score: float,
-        tx_hash: str
+        tx_hash: str,
+        alert_id: Optional[int] = None,
     ) -> Optional[str]:
         """
         Create alert on-chain
@@ -75,55 +133,33 @@ class AlertRegistry:
             wallet_address: ignored by contract (off-chain metadata only)
             risk_score: float (0–1)
             tx_hash: transaction hash string
+            alert_id: DB alert row to receive on_chain_tx_hash once mined
 
         Returns:
-            blockchain tx hash or None
+            blockchain tx hash once sent (not yet mined) or None
+            (always None in merkle mode - the alert's window is anchored later)
         """
 
-        if not self.contract or not self.web3_client.is_connected():
+        if self.sender is None:
             print("ℹ️ Blockchain unavailable - alert stored in DB only")
             return None
 
-        try:
-            # 🔐 tx_hash → bytes32
-            tx_hash_bytes32 = Web3.keccak(text=tx_hash)
-
-            # 🔢 risk_score → uint8 (0–255)
-            risk_score_uint8 = min(int(risk_score * 100), 255)
-
-            account_address = self.web3_client.get_account()
-            if not account_address:
-                print("⚠️ No signing account configured")
-                return None
-
-            # ✅ EXACTLY TWO ARGUMENTS — MATCHES ABI
-            transaction = self.contract.functions.createAlert(
-                tx_hash_bytes32,
-                risk_score_uint8
-            ).build_transaction({
-                "from": account_address,
-                "nonce": self.web3_client.w3.eth.get_transaction_count(account_address),
-                "gas": 150000,
-                "gasPrice": self.web3_client.w3.eth.gas_price
-            })
-
-            signed_txn = self.web3_client.w3.eth.account.sign_transaction(
-                transaction,
-                private_key=settings.PRIVATE_KEY
-            )
-
-            tx_hash_result = self.web3_client.w3.eth.send_raw_transaction(
-                signed_txn.rawTransaction
-            )
-
-            print(f"✅ Alert created on-chain: {tx_hash_result.hex()}")
-            return tx_hash_result.hex()
-
-        except Exception as e:
-            print(f"⚠️ On-chain alert creation failed: {e}")
-            print("ℹ️ Alert will be stored in database only")
+        if self.anchorer is not None:
+            # The proof is keyed by alert id - without one the alert stays DB-only
+            if alert_id is not None:
+                self.anchorer.add(alert_id, tx_hash, risk_score)
             return None
 
+        return await self.sender.submit(alert_id, tx_hash, risk_score)
+
     def is_available(self) -> bool:
         """Check if on-chain registry is available"""
-        return self.contract is not None and self.web3_client.is_connected()
+        return self.sender is not None and self.sender.connected
+
+    def get_metrics(self) -> Optional[dict]:
+        if self.sender is None:
+            return None
+        metrics = self.sender.get_metrics()
+        if self.anchorer is not None:
+            metrics["anchoring"] = self.anchorer.get_metrics()
+        return metrics
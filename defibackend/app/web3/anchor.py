@@ -0,0 +1,154 @@
+"""
+Merkle Alert Anchoring
+Collects alerts over a window and anchors the whole window on-chain
+with a single anchorAlertBatch(root) instead of one createAlert each
+"""
+import asyncio
+from typing import Callable, List, Optional, Tuple
+
+from web3 import Web3
+
+from app.web3.merkle import alert_leaf, build_tree, merkle_proof, merkle_root
+from app.web3.sender import AlertTransactionSender
+
+
+class MerkleAnchorer:
+    """
+        add() --> [window] --(window_seconds after the first alert,
+                              or max_batch alerts)--> build tree,
+                  sender.submit_anchor(root), store every alert's proof
+
+    Proofs are stored once the root has been sent; a batch the sender
+    rejects or gives up on, or whose transaction reverts or is dropped,
+    goes back into the window and is anchored again under the next root
+    (its proofs are replaced then). The alerts' on_chain_tx_hash is filled
+    in by the sender once the anchoring transaction is mined.
+    """
+
+    def __init__(
+        self,
+        sender: AlertTransactionSender,
+        store_proofs: Callable[[List[dict]], None],
+        window_seconds: float = 30.0,
+        max_batch: int = 1024,
+    ):
+        self.sender = sender
+        self.store_proofs = store_proofs
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+
+        # (alert_id, tx_hash, risk_score)
+        self._window: List[Tuple[int, str, float]] = []
+        self._has_alerts = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.batches = 0
+        self.alerts_anchored = 0
+        self.failed_batches = 0
+        self.last_root: Optional[str] = None
+
+    async def start(self):
+        self._task = asyncio.ensure_future(self._window_loop())
+
+    async def stop(self):
+        # Alerts still in the window stay DB-only, like unsent createAlerts
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def add(self, alert_id: int, tx_hash: str, risk_score: float):
+        self._window.append((alert_id, tx_hash, risk_score))
+        self._has_alerts.set()
+        if len(self._window) >= self.max_batch:
+            self._full.set()
+
+    async def _window_loop(self):
+        while True:
+            await self._has_alerts.wait()
+            try:
+                await asyncio.wait_for(self._full.wait(), self.window_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+            batch = self._window[: self.max_batch]
+            self._window = self._window[self.max_batch:]
+            if not self._window:
+                self._has_alerts.clear()
+            if len(self._window) < self.max_batch:
+                self._full.clear()
+
+            try:
+                await self._anchor(batch)
+            except Exception as e:
+                self.failed_batches += 1
+                print(f"⚠️ Alert batch anchoring failed ({len(batch)} alerts): {e}")
+
+    async def _anchor(self, batch: List[Tuple[int, str, float]]):
+        root, proofs = await asyncio.to_thread(self._build, batch)
+
+        # Resolves once sent: None = rejected (queue full) or out of attempts
+        chain_tx_hash = await self.sender.submit_anchor(
+            [alert_id for alert_id, _, _ in batch], root, len(batch),
+            on_failed=lambda _, batch=batch: self._anchor_failed(batch),
+        )
+        if chain_tx_hash is None:
+            self.failed_batches += 1
+            self._requeue(batch)
+            print(f"⚠️ Alert batch not sent - {len(batch)} alerts back in the window")
+            return
+
+        await asyncio.to_thread(self.store_proofs, proofs)
+
+        self.batches += 1
+        self.alerts_anchored += len(batch)
+        self.last_root = Web3.to_hex(root)
+
+    def _anchor_failed(self, batch: List[Tuple[int, str, float]]):
+        """
+        The anchoring transaction was sent but reverted or was dropped:
+        the root never landed, so anchor the alerts again
+        """
+        self.batches -= 1
+        self.alerts_anchored -= len(batch)
+        self.failed_batches += 1
+        self._requeue(batch)
+        print(f"⚠️ Alert batch anchor not mined - {len(batch)} alerts back in the window")
+
+    def _requeue(self, batch: List[Tuple[int, str, float]]):
+        # Ahead of newer alerts, retried when the next window closes
+        self._window[:0] = batch
+        self._has_alerts.set()
+        if len(self._window) >= self.max_batch:
+            self._full.set()
+
+    @staticmethod
+    def _build(batch: List[Tuple[int, str, float]]) -> Tuple[bytes, List[dict]]:
+        levels = build_tree([alert_leaf(tx_hash, score) for _, tx_hash, score in batch])
+        root = merkle_root(levels)
+        hex_root = Web3.to_hex(root)
+        proofs = [
+            {
+                "alert_id": alert_id,
+                "merkle_root": hex_root,
+                "leaf_index": i,
+                "batch_size": len(batch),
+                "proof": ",".join(Web3.to_hex(h) for h in merkle_proof(levels, i)),
+            }
+            for i, (alert_id, _, _) in enumerate(batch)
+        ]
+        return root, proofs
+
+    def get_metrics(self) -> dict:
+        return {
+            "window_size": len(self._window),
+            "batches": self.batches,
+            "alerts_anchored": self.alerts_anchored,
+            "alerts_per_tx": (
+                round(self.alerts_anchored / self.batches, 1) if self.batches else None
+            ),
+            "failed_batches": self.failed_batches,
+            "last_root": self.last_root,
+        }
@@ -13,7 +13,8 @@ class Web3Client:
     Isolated from core business logic
     """
     
-    def __init__(self):
+    def __init__(self, rpc_url: Optional[str] = None):
+        self.rpc_url = rpc_url or settings.WEB3_RPC_URL
         self.w3: Optional[Web3] = None
         self._connect()
     
@@ -23,7 +24,7 @@ class Web3Client:
         Fails gracefully if RPC unavailable
         """
         try:
-            self.w3 = Web3(Web3.HTTPProvider(settings.WEB3_RPC_URL))
+            self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
             
             if self.w3.is_connected():
                 print(f"✅ Connected to {settings.WEB3_NETWORK}")
@@ -39,6 +40,12 @@ class Web3Client:
     def is_connected(self) -> bool:
         """Check if Web3 is connected"""
         return self.w3 is not None and self.w3.is_connected()
+
+    def ensure_connected(self) -> bool:
+        """Reconnect if the node was unavailable earlier"""
+        if self.w3 is None:
+            self._connect()
+        return self.is_connected()
     
     def get_block_number(self) -> Optional[int]:
         """Get current block number"""
@@ -119,4 +126,36 @@ class Web3Client:
             return gas
         except Exception as e:
             print(f"Error estimating gas: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    # ----------------------------
+    # INGESTION
+    # ----------------------------
+
+    def get_block(self, block_number: int, full_transactions: bool = True) -> Optional[dict]:
+        """
+        Get a block, with transaction objects when full_transactions is set
+        Returns None if the node is unavailable or the block does not exist yet
+        """
+        if self.w3 is None:
+            return None
+
+        try:
+            return dict(self.w3.eth.get_block(block_number, full_transactions=full_transactions))
+        except Exception as e:
+            print(f"Error fetching block {block_number}: {e}")
+            return None
+
+    def new_pending_filter(self):
+        """
+        Filter over pending (mempool) transaction hashes, or None if the
+        node does not support it
+        """
+        if self.w3 is None:
+            return None
+
+        try:
+            return self.w3.eth.filter("pending")
+        except Exception as e:
+            print(f"⚠️ Pending transaction filter unavailable: {e}")
+            return None
@@ -0,0 +1,72 @@
+"""
+Alert Merkle Trees
+Leaf / tree / proof helpers matching AlertRegistry.anchorAlertBatch
+and AlertRegistry.verifyBatchedAlert
+"""
+from typing import List
+
+from web3 import Web3
+
+
+def contract_risk_score(risk_score: float) -> int:
+    """
+    Risk score (0–1) as the contract's uint8 (0–100)
+    """
+    return min(max(int(risk_score * 100), 0), 100)
+
+
+def alert_leaf(tx_hash: str, risk_score: float) -> bytes:
+    """
+    keccak256(abi.encodePacked(bytes32 txHash, uint8 riskScore)), with
+    txHash = keccak256(tx_hash) exactly as createAlert is called
+    """
+    return Web3.keccak(
+        Web3.keccak(text=tx_hash) + bytes([contract_risk_score(risk_score)])
+    )
+
+
+def _hash_pair(a: bytes, b: bytes) -> bytes:
+    # Sorted pairs: proofs don't need left / right position bits
+    return Web3.keccak(a + b if a < b else b + a)
+
+
+def build_tree(leaves: List[bytes]) -> List[List[bytes]]:
+    """
+    All levels of the tree, leaves first, root last
+    An odd node at the end of a level is carried up unchanged
+    """
+    if not leaves:
+        raise ValueError("Cannot build a Merkle tree with no leaves")
+
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [_hash_pair(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def merkle_root(levels: List[List[bytes]]) -> bytes:
+    return levels[-1][0]
+
+
+def merkle_proof(levels: List[List[bytes]], index: int) -> List[bytes]:
+    """
+    Sibling hashes from leaf `index` up to the root
+    """
+    proof = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append(level[sibling])
+        index //= 2
+    return proof
+
+
+def verify_proof(leaf: bytes, proof: List[bytes], root: bytes) -> bool:
+    node = leaf
+    for sibling in proof:
+        node = _hash_pair(node, sibling)
+    return node == root
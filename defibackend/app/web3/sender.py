@@ -0,0 +1,438 @@
+"""
+Alert Transaction Sender
+Async, nonce-managed submission of createAlert transactions
+Signs locally and pipelines sends without waiting for receipts
+Receipts are tracked per block and written back to the alerts table
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from eth_account import Account
+from web3 import AsyncWeb3, AsyncHTTPProvider, Web3
+
+from app.web3.merkle import contract_risk_score
+
+# Errors that mean our local nonce is out of sync with the node
+NONCE_ERRORS = ("nonce too low", "nonce too high", "already known", "replacement transaction")
+
+
+class NonceManager:
+    """
+    Hands out consecutive nonces locally
+    Synced from the node's pending count on first use and after reset()
+    """
+
+    def __init__(self, w3: AsyncWeb3, address: str):
+        self.w3 = w3
+        self.address = address
+        self._next: Optional[int] = None
+        self._lock = asyncio.Lock()
+        self.resyncs = 0
+
+    async def allocate(self, count: int) -> List[int]:
+        async with self._lock:
+            if self._next is None:
+                self._next = await self.w3.eth.get_transaction_count(self.address, "pending")
+                self.resyncs += 1
+            nonces = list(range(self._next, self._next + count))
+            self._next += count
+            return nonces
+
+    def reset(self):
+        self._next = None
+
+
+class GasPriceCache:
+    """
+    Gas price fetched at most once per block
+    """
+
+    def __init__(self, w3: AsyncWeb3):
+        self.w3 = w3
+        self.head: Optional[int] = None  # updated by the receipt tracker
+        self._block: Optional[int] = None
+        self._price: Optional[int] = None
+        self.fetches = 0
+
+    async def get(self) -> int:
+        if self._price is None or self._block != self.head:
+            self._price = await self.w3.eth.gas_price
+            self._block = self.head
+            self.fetches += 1
+        return self._price
+
+
+@dataclass
+class AlertSubmission:
+    alert_ids: List[int]  # DB alerts this transaction covers
+    fn_name: str
+    args: list
+    future: asyncio.Future
+    attempts: int = 0
+    # Called with alert_ids if the sent transaction reverts or is dropped
+    on_failed: Optional[Callable[[List[int]], None]] = None
+
+
+@dataclass
+class PendingAlertTx:
+    alert_ids: List[int]
+    chain_tx_hash: str
+    nonce: int
+    sent_block: Optional[int]
+    sent_at: float
+    on_failed: Optional[Callable[[List[int]], None]] = None
+
+
+class AlertTransactionSender:
+    """
+    Queue in front of the AlertRegistry contract
+
+        submit() / submit_anchor() --> [queue] --> send loop: allocate nonces, sign locally,
+                                 send_raw_transaction concurrently
+                                 (no waiting for receipts)
+                     receipt loop: scan each new block for our pending
+                                   transactions, report confirmed ones
+                                   via on_confirmed({alert_id: tx_hash})
+                                   for every alert they cover
+
+    Nonces come from a local NonceManager, so back-to-back alerts no longer
+    collide. A send that fails because of a nonce mismatch resyncs the
+    manager and is retried. A transaction that is still unmined
+    receipt_timeout_blocks after sending is dropped and the nonce is resynced.
+    A reverted or dropped transaction is reported to its submission's
+    on_failed (e.g. the anchorer re-anchors those alerts).
+    """
+
+    def __init__(
+        self,
+        rpc_url: str,
+        contract_address: str,
+        abi: list,
+        private_key: str,
+        on_confirmed: Optional[Callable[[Dict[int, str]], None]] = None,
+        gas_limit: int = 150_000,
+        max_batch: int = 64,
+        queue_size: int = 10_000,
+        poll_interval: float = 1.0,
+        receipt_timeout_blocks: int = 50,
+        max_attempts: int = 3,
+    ):
+        self.rpc_url = rpc_url
+        self.w3 = AsyncWeb3(AsyncHTTPProvider(rpc_url))
+        self.account = Account.from_key(private_key)
+        self.contract = self.w3.eth.contract(
+            address=Web3.to_checksum_address(contract_address), abi=abi
+        )
+        self.on_confirmed = on_confirmed
+        self.gas_limit = gas_limit
+        self.max_batch = max_batch
+        self.poll_interval = poll_interval
+        self.receipt_timeout_blocks = receipt_timeout_blocks
+        self.max_attempts = max_attempts
+
+        self.nonces = NonceManager(self.w3, self.account.address)
+        self.gas_price = GasPriceCache(self.w3)
+        self.chain_id: Optional[int] = None
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._pending: Dict[str, PendingAlertTx] = {}
+        self._scanned_block: Optional[int] = None
+        self._tasks: List[asyncio.Task] = []
+        self.connected = False
+
+        # Metrics
+        self.submitted = 0
+        self.sent = 0
+        self.confirmed = 0
+        self.reverted = 0
+        self.dropped = 0
+        self.send_errors = 0
+        self.rejected_queue_full = 0
+        self.batches = 0
+
+    # ----------------------------
+    # LIFECYCLE
+    # ----------------------------
+
+    async def start(self):
+        self._tasks = [
+            asyncio.ensure_future(self._send_loop()),
+            asyncio.ensure_future(self._receipt_loop()),
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        while not self._queue.empty():
+            submission = self._queue.get_nowait()
+            if not submission.future.done():
+                submission.future.set_result(None)
+
+    async def _ensure_connected(self):
+        backoff = self.poll_interval
+        while True:
+            try:
+                if self.chain_id is None:
+                    self.chain_id = await self.w3.eth.chain_id
+                if not self.connected:
+                    print(f"✅ Alert sender connected (chain {self.chain_id}, "
+                          f"account {self.account.address})")
+                self.connected = True
+                return
+            except Exception as e:
+                if self.connected or backoff == self.poll_interval:
+                    print(f"⚠️ Alert sender cannot reach {self.rpc_url}: {e}")
+                self.connected = False
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    # ----------------------------
+    # SUBMISSION
+    # ----------------------------
+
+    def submit(self, alert_id: Optional[int], tx_hash: str, risk_score: float) -> asyncio.Future:
+        """
+        Queue a createAlert; the future resolves to the on-chain tx hash
+        once sent (None if it could not be sent)
+        """
+        return self._submit(
+            [alert_id] if alert_id is not None else [],
+            "createAlert",
+            [Web3.keccak(text=tx_hash), contract_risk_score(risk_score)],
+        )
+
+    def submit_anchor(
+        self,
+        alert_ids: List[int],
+        root: bytes,
+        alert_count: int,
+        on_failed: Optional[Callable[[List[int]], None]] = None,
+    ) -> asyncio.Future:
+        """
+        Queue an anchorAlertBatch for a Merkle root over `alert_count` alerts
+        on_failed(alert_ids) runs if it is sent but reverts or is dropped
+        """
+        return self._submit(alert_ids, "anchorAlertBatch", [root, alert_count], on_failed)
+
+    def _submit(
+        self,
+        alert_ids: List[int],
+        fn_name: str,
+        args: list,
+        on_failed: Optional[Callable[[List[int]], None]] = None,
+    ) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait(
+                AlertSubmission(alert_ids, fn_name, args, future, on_failed=on_failed)
+            )
+            self.submitted += 1
+        except asyncio.QueueFull:
+            self.rejected_queue_full += 1
+            future.set_result(None)
+        return future
+
+    async def _send_loop(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            await self._ensure_connected()
+            try:
+                await self._send_batch(batch)
+            except Exception as e:
+                # RPC failure before anything was sent (nonce / gas lookup)
+                print(f"⚠️ Alert batch failed: {e}")
+                self.nonces.reset()
+                self._retry_or_fail(batch)
+                await asyncio.sleep(self.poll_interval)
+
+    async def _send_batch(self, batch: List[AlertSubmission]):
+        self.batches += 1
+        gas_price = await self.gas_price.get()
+        nonces = await self.nonces.allocate(len(batch))
+
+        for submission in batch:
+            submission.attempts += 1
+        # Signing is CPU-bound (~ms per tx): keep it off the event loop
+        signed = await asyncio.to_thread(self._sign_batch, batch, nonces, gas_price)
+
+        # Tracked before sending: early sends of a large batch can be mined
+        # before the whole batch has been handed to the node
+        hashes = [Web3.to_hex(tx.hash) for tx in signed]
+        for submission, nonce, chain_tx_hash in zip(batch, nonces, hashes):
+            self._pending[chain_tx_hash] = PendingAlertTx(
+                alert_ids=submission.alert_ids,
+                chain_tx_hash=chain_tx_hash,
+                nonce=nonce,
+                sent_block=self.gas_price.head,
+                sent_at=time.time(),
+                on_failed=submission.on_failed,
+            )
+
+        # Pipelined: all sends in flight at once, receipts tracked separately
+        results = await asyncio.gather(
+            *(self.w3.eth.send_raw_transaction(tx.rawTransaction) for tx in signed),
+            return_exceptions=True,
+        )
+
+        failed = []
+        for submission, nonce, chain_tx_hash, result in zip(batch, nonces, hashes, results):
+            if isinstance(result, Exception):
+                self._pending.pop(chain_tx_hash, None)
+                self.send_errors += 1
+                message = str(result).lower()
+                if any(error in message for error in NONCE_ERRORS):
+                    self.nonces.reset()
+                print(f"⚠️ {submission.fn_name} send failed (nonce {nonce}): {result}")
+                failed.append(submission)
+                continue
+
+            self.sent += 1
+            if not submission.future.done():
+                submission.future.set_result(chain_tx_hash)
+
+        if failed:
+            # A failed nonce leaves a gap behind it - resync before retrying
+            self.nonces.reset()
+            self._retry_or_fail(failed)
+
+    def _sign_batch(self, batch: List[AlertSubmission], nonces: List[int], gas_price: int) -> list:
+        signed = []
+        for submission, nonce in zip(batch, nonces):
+            transaction = {
+                "to": self.contract.address,
+                "data": self.contract.encodeABI(
+                    fn_name=submission.fn_name, args=submission.args
+                ),
+                "value": 0,
+                "gas": self.gas_limit,
+                "gasPrice": gas_price,
+                "nonce": nonce,
+                "chainId": self.chain_id,
+            }
+            signed.append(self.account.sign_transaction(transaction))
+        return signed
+
+    def _retry_or_fail(self, submissions: List[AlertSubmission]):
+        for submission in submissions:
+            if submission.attempts < self.max_attempts:
+                try:
+                    self._queue.put_nowait(submission)
+                    continue
+                except asyncio.QueueFull:
+                    pass
+            if not submission.future.done():
+                submission.future.set_result(None)
+
+    # ----------------------------
+    # RECEIPTS
+    # ----------------------------
+
+    async def _receipt_loop(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self._ensure_connected()
+                await self._scan_new_blocks()
+            except Exception as e:
+                print(f"⚠️ Receipt tracking error: {e}")
+
+    async def _scan_new_blocks(self):
+        head = await self.w3.eth.block_number
+        self.gas_price.head = head
+        if self._scanned_block is None:
+            # Anything we sent lands at or after the block we started at
+            self._scanned_block = head - 1
+        if not self._pending:
+            self._scanned_block = head
+            return
+
+        confirmed: Dict[int, str] = {}
+        failed: List[PendingAlertTx] = []
+        for number in range(self._scanned_block + 1, head + 1):
+            block = await self.w3.eth.get_block(number)
+            mined = [
+                Web3.to_hex(h) for h in block["transactions"]
+                if Web3.to_hex(h) in self._pending
+            ]
+            receipts = await asyncio.gather(
+                *(self.w3.eth.get_transaction_receipt(h) for h in mined)
+            )
+            for chain_tx_hash, receipt in zip(mined, receipts):
+                pending = self._pending.pop(chain_tx_hash)
+                if receipt["status"] == 1:
+                    self.confirmed += 1
+                    for alert_id in pending.alert_ids:
+                        confirmed[alert_id] = chain_tx_hash
+                else:
+                    # e.g. "Alert already exists" for a re-flagged transaction
+                    self.reverted += 1
+                    failed.append(pending)
+            self._scanned_block = number
+
+        failed.extend(self._expire_stale(head))
+        self._report_failed(failed)
+
+        if confirmed and self.on_confirmed is not None:
+            await asyncio.to_thread(self.on_confirmed, confirmed)
+
+    def _report_failed(self, failed: List[PendingAlertTx]):
+        for pending in failed:
+            if pending.on_failed is None:
+                continue
+            try:
+                pending.on_failed(pending.alert_ids)
+            except Exception as e:
+                print(f"⚠️ Failed alert tx {pending.chain_tx_hash} not reported: {e}")
+
+    def _expire_stale(self, head: int) -> List[PendingAlertTx]:
+        """
+        Drop transactions unmined after receipt_timeout_blocks; returns them
+        """
+        stale = []
+        for chain_tx_hash, pending in self._pending.items():
+            if pending.sent_block is None:
+                # Sent before the first head was known
+                pending.sent_block = head
+            elif head - pending.sent_block > self.receipt_timeout_blocks:
+                stale.append(chain_tx_hash)
+        dropped = []
+        for chain_tx_hash in stale:
+            pending = self._pending.pop(chain_tx_hash)
+            self.dropped += 1
+            dropped.append(pending)
+            print(f"⚠️ Alert tx {chain_tx_hash} (nonce {pending.nonce}) not mined "
+                  f"after {self.receipt_timeout_blocks} blocks - dropped")
+        if stale:
+            self.nonces.reset()
+        return dropped
+
+    # ----------------------------
+    # METRICS
+    # ----------------------------
+
+    def get_metrics(self) -> dict:
+        return {
+            "connected": self.connected,
+            "account": self.account.address,
+            "queue_depth": self._queue.qsize(),
+            "pending_receipts": len(self._pending),
+            "submitted": self.submitted,
+            "sent": self.sent,
+            "confirmed": self.confirmed,
+            "reverted": self.reverted,
+            "dropped": self.dropped,
+            "send_errors": self.send_errors,
+            "rejected_queue_full": self.rejected_queue_full,
+            "batches": self.batches,
+            "nonce_resyncs": self.nonces.resyncs,
+            "gas_price_fetches": self.gas_price.fetches,
+            "head": self.gas_price.head,
+        }
@@ -2,9 +2,12 @@
 Configuration settings for DeFi Risk Engine
 Centralized configuration management
 """
+from pathlib import Path
 from pydantic_settings import BaseSettings
 from typing import List
 
+BASE_DIR = Path(__file__).resolve().parent.parent
+
 class Settings(BaseSettings):
     """Application settings"""
     
@@ -14,34 +17,141 @@ class Settings(BaseSettings):
     MODEL_VERSION: str = "v1.0"
     
     TELEGRAM_BOT_TOKEN: str | None = None
+    TELEGRAM_API_URL: str = "https://api.telegram.org"
+    # Telegram allows ~30 messages/s per bot and ~1/s per chat
+    TELEGRAM_GLOBAL_RATE_PER_SEC: float = 30.0
+    TELEGRAM_CHAT_RATE_PER_SEC: float = 1.0
+    TELEGRAM_MAX_DIGEST_ALERTS: int = 20  # Alerts listed in one digest message
+    TELEGRAM_MAX_BUFFERED_ALERTS: int = 10_000
+    TELEGRAM_MAX_RETRIES: int = 3
+    TELEGRAM_WORKERS: int = 4
+    TELEGRAM_CHAT_CACHE_SIZE: int = 100_000  # Wallet -> chat id entries
+    TELEGRAM_CHAT_CACHE_TTL_SECONDS: float = 60.0  # Bounds staleness of external writes
     # API
     ALLOWED_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8000"]
     
     # Model paths
     MODEL_PATH: str = "models/isolation_forest.pkl"
     SCALER_PATH: str = "models/scaler.pkl"
+    # "auto" = mmap artifact (models/forest, scripts/train_model.py) when exported,
+    # else the pickles; "mmap" / "pickle" to force one
+    MODEL_FORMAT: str = "auto"
+    # After an mmap load, rebuild sklearn's trees in the background: imports
+    # sklearn, but batches of 128+ rows score ~4x faster
+    MODEL_NATIVE_TREES: bool = True
+    # Versioned models (scripts/model_registry.py), "" = app/models/registry
+    # Its CURRENT version wins over the files above when MODEL_FORMAT=auto
+    MODEL_REGISTRY_DIR: str = ""
+    MODEL_REGISTRY_POLL_SECONDS: float = 5.0  # CURRENT / CANDIDATE checked this often; 0 = never
+    MODEL_SHADOW_FRACTION: float = 0.1  # Share of scored rows also scored by the candidate
     
     # Risk thresholds
     RISK_THRESHOLD_PERCENTILE: float = 98.0  # Top 2% are flagged
     HIGH_RISK_THRESHOLD: float = 0.7  # Above this = critical alert
+
+    # Score calibration (app/models/calibration.npz, see scripts/calibrate.py)
+    # With a table loaded, levels + alerts use calibrated percentiles:
+    # >= RISK_THRESHOLD_PERCENTILE is HIGH and alerts
+    RISK_CRITICAL_PERCENTILE: float = 99.9
+    RISK_MEDIUM_PERCENTILE: float = 90.0
+    CALIBRATION_KNOTS: int = 2048  # Table size (~16 KB)
+    CALIBRATION_MIN_SAMPLES: int = 1_000  # Less history is too noisy to calibrate on
+    CALIBRATION_RELOAD_INTERVAL_SECONDS: float = 10.0  # Poll for a new table; 0 = load once
+
+    # Live cutoffs: the same percentiles over a sliding window of scores
+    # "fixed": calibration table, else HIGH_RISK_THRESHOLD + fixed level cutoffs
+    # "live" (opt-in): the window's percentiles once warm - pins the alert rate
+    # at ~(100 - RISK_THRESHOLD_PERCENTILE)% and ignores POST /predict/threshold
+    ALERT_THRESHOLD_SOURCE: str = "fixed"
+    LIVE_THRESHOLD_WINDOW_SECONDS: float = 3600.0
+    LIVE_THRESHOLD_BUCKETS: int = 12  # Window slides in steps of window / buckets
+    LIVE_THRESHOLD_RELATIVE_ACCURACY: float = 0.001  # Cutoffs within 0.1% of a true quantile
+    LIVE_THRESHOLD_MIN_SAMPLES: int = 1_000  # Scores in the window before live cutoffs apply
+    LIVE_THRESHOLD_REFRESH_SECONDS: float = 1.0
+    LIVE_THRESHOLD_SHARED_DIR: str = ""  # Workers merge sketches through here; "" = per process
+    LIVE_THRESHOLD_SYNC_SECONDS: float = 5.0
+
+    # Inference executor: "inline", "thread" or "process"
+    INFERENCE_EXECUTOR: str = "thread"
+    INFERENCE_WORKERS: int = 0  # 0 = one per CPU core
+
+    # Micro-batching for /predict
+    PREDICT_BATCHING_ENABLED: bool = True
+    PREDICT_BATCH_MAX_SIZE: int = 256  # Flush once this many requests wait
+    PREDICT_BATCH_MAX_WAIT_MS: float = 2.0  # Upper bound on queueing delay
+    # /predict + /predict/batch bodies encoded straight from score arrays
+    # (orjson when installed) instead of pydantic models + response_model
+    PREDICT_FAST_JSON: bool = True
+    # Columnar /predict/batch (application/x-npy feature matrix in, .npz out)
+    PREDICT_BATCH_BINARY_MAX_ROWS: int = 100_000
+    # /predict results cached by tx_hash + submitted features + model version:
+    # retries / re-submissions skip inference and every write
+    PREDICT_CACHE_ENABLED: bool = True
+    PREDICT_CACHE_MAX_ENTRIES: int = 100_000  # LRU bound
+    PREDICT_CACHE_TTL_SECONDS: float = 300.0  # Retries after this are scored again
+
+    # Streaming /predict/stream (WebSocket / NDJSON)
+    STREAM_BATCH_MAX_SIZE: int = 512  # Records per internal micro-batch
+    STREAM_BATCH_MAX_WAIT_MS: float = 5.0  # Max wait to fill a micro-batch
+    STREAM_MAX_IN_FLIGHT: int = 4096  # Queued records per connection before reads pause
+    STREAM_MAX_BATCHES_IN_FLIGHT: int = 2  # Batches scored ahead of the writer
+    STREAM_MAX_LINE_BYTES: int = 65_536  # Longer NDJSON lines are rejected
     
+    # Wallet feature store (server-side tx_count / rolling volume / relative amount)
+    FEATURE_STORE_WINDOW_SECONDS: float = 86_400.0  # Rolling volume window
+    FEATURE_STORE_BUCKETS: int = 24  # Time buckets per window
+    FEATURE_STORE_MAX_WALLETS: int = 1_000_000  # LRU bound
+    FEATURE_STORE_TTL_SECONDS: float = 7 * 86_400.0  # Idle wallets are dropped
+    # Next to the model files, whatever the working directory; "" disables
+    FEATURE_STORE_SNAPSHOT_PATH: str = str(BASE_DIR / "app" / "models" / "wallet_features.npz")
+    FEATURE_STORE_SNAPSHOT_INTERVAL_SECONDS: float = 300.0
+
+    # Chain ingestion (blocks + mempool over JSON-RPC)
+    INGEST_ENABLED: bool = True
+    INGEST_RPC_URL: str = "http://127.0.0.1:8545"  # anvil / hardhat node; "" = WEB3_RPC_URL
+    INGEST_WORKERS: int = 4  # Concurrent block / transaction decoders
+    INGEST_QUEUE_SIZE: int = 64  # Bounded pipeline queues (backpressure)
+    INGEST_BATCH_SIZE: int = 256  # Transactions per scoring batch
+    INGEST_BATCH_WAIT_MS: float = 50.0
+    INGEST_POLL_INTERVAL_SECONDS: float = 1.0
+    INGEST_CONFIRMATIONS: int = 0  # Blocks behind head to stay clear of reorgs
+    INGEST_START_BLOCK: int = -1  # Used when no cursor is saved; -1 = current head
+    INGEST_PENDING_TX: bool = True  # Also score mempool transactions
+    INGEST_ETH_PRICE_USD: float = 3000.0  # Converts native value to amount_usd
+
     # Web3
     WEB3_NETWORK: str = "sepolia"  # testnet for demo
     WEB3_RPC_URL: str = "https://eth-sepolia.g.alchemy.com/v2/demo"
     ALERT_REGISTRY_CONTRACT: str = "0x..."  # Contract address
     PRIVATE_KEY: str = ""  # Set via environment variable
+    ALERT_TX_GAS_LIMIT: int = 150_000
+    ALERT_TX_MAX_BATCH: int = 64  # createAlert txs signed + sent per round
+    ALERT_TX_QUEUE_SIZE: int = 10_000
+    ALERT_TX_POLL_INTERVAL_SECONDS: float = 1.0  # Receipt / head polling
+    ALERT_TX_RECEIPT_TIMEOUT_BLOCKS: int = 50  # Unmined after this = dropped
+    # "per_alert": one createAlert per alert
+    # "merkle": one anchorAlertBatch(root) per window of alerts
+    ALERT_ANCHOR_MODE: str = "per_alert"
+    ALERT_ANCHOR_WINDOW_SECONDS: float = 30.0  # Window starts at its first alert
+    ALERT_ANCHOR_MAX_BATCH: int = 1024  # A full window is anchored right away
     
     # Database
     DATABASE_URL: str = "sqlite:///./defi_risk.db"
+    DB_WRITE_BUFFERED: bool = True  # Bulk-write predictions / alerts
+    DB_WRITE_BATCH_SIZE: int = 500  # Flush once this many rows are buffered
+    DB_WRITE_FLUSH_INTERVAL_MS: float = 200.0  # ...or at least this often
+    DB_WRITE_MAX_PENDING: int = 10_000  # Producers block above this (backpressure)
+    DB_WRITE_MAX_RETRIES: int = 3  # Failed flushes retried, then written row by row
     ETHERSCAN_API_KEY: str
+    ETHERSCAN_URL: str = "https://api.etherscan.io/v2/api"
+    ETHERSCAN_CHAIN_ID: int = 11155111  # Sepolia
+    ETHERSCAN_RATE_LIMIT_PER_SEC: float = 5.0  # Free tier limit
+    ETHERSCAN_CACHE_TTL_SECONDS: float = 30.0  # Serve cached history this long
+    ETHERSCAN_CACHE_MAX_WALLETS: int = 10_000
+    ETHERSCAN_TIMEOUT_SECONDS: float = 10.0
+    ETHERSCAN_MAX_CONNECTIONS: int = 20
 
-    # Feature names (must match training)
-    FEATURE_NAMES: List[str] = [
-        "amount_usd",
-        "whale_tx",
-        "tx_count_user",
-        "rolling_volume_user"
-    ]
+    # Model features are not configurable: see app/ml/model_loader.FEATURE_SCHEMA
     
     class Config:
         env_file = ".env"
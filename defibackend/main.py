@@ -3,16 +3,16 @@ DeFi Attack Early Warning System - Backend API
 Entry point for the FastAPI application
 """
 import asyncio
-
-from app.services.simulator import generate_transaction
-from app.services.processor import process_transaction
+from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api import predict, alerts, health
+from app.api import predict, stream, ingestion, alerts, health
 from app.auth.wallet import router as wallet_auth_router
-from app.api.wallet_activity import router as wallet_activity_router
+from app.api import wallet_activity
+from app.notifications import telegram_service
+from config.settings import settings
 
 
 app = FastAPI(
@@ -35,17 +35,66 @@ app.add_middleware(
 # API routes
 app.include_router(health.router, prefix="/api/v1", tags=["Health"])
 app.include_router(predict.router, prefix="/api/v1", tags=["Prediction"])
+app.include_router(stream.router, prefix="/api/v1", tags=["Prediction"])
+app.include_router(ingestion.router, prefix="/api/v1", tags=["Ingestion"])
 app.include_router(alerts.router, prefix="/api/v1", tags=["Alerts"])
 app.include_router(wallet_auth_router, prefix="/api/v1", tags=["Auth"])
-app.include_router(wallet_activity_router, prefix="/api/v1")
+app.include_router(wallet_activity.router, prefix="/api/v1")
 @app.on_event("startup")
 async def startup_event():
-    print("⚙️ Starting simulated transaction pool...")
+    # Model registry: follow CURRENT (hot reload) and CANDIDATE (shadow scoring)
+    await predict.inference_service.start()
+    # Score calibration table (hot-reloaded when scripts/calibrate.py rewrites it)
+    await predict.scoring_service.calibration.start()
+    # Live threshold sketch exchange between workers (LIVE_THRESHOLD_SHARED_DIR)
+    await predict.scoring_service.live.start()
+    # On-chain alert sender (nonce manager + receipt tracking)
+    await predict.alert_registry.start()
+    # Rate-limited Telegram delivery (one pooled connection)
+    await telegram_service.dispatcher.start()
+
+    # Follow blocks + mempool and score them (resumes from the saved cursor)
+    if ingestion.chain_ingestor is not None:
+        print("⛓️ Starting chain ingestion...")
+        await ingestion.chain_ingestor.start()
+
+    # Wallet feature store: restore last snapshot, then snapshot periodically
+    snapshot_path = settings.FEATURE_STORE_SNAPSHOT_PATH
+    if snapshot_path:
+        if Path(snapshot_path).exists():
+            try:
+                restored = predict.feature_store.restore(snapshot_path)
+                print(f"✅ Restored {restored} wallets from {snapshot_path}")
+            except Exception as e:
+                print(f"⚠️ Feature store restore failed: {e}")
+
+        async def snapshot_loop():
+            while True:
+                await asyncio.sleep(settings.FEATURE_STORE_SNAPSHOT_INTERVAL_SECONDS)
+                await asyncio.to_thread(predict.feature_store.snapshot, snapshot_path)
+
+        asyncio.create_task(snapshot_loop())
 
-    async def simulator_loop():
-        while True:
-            tx = generate_transaction()
-            process_transaction(tx)
-            await asyncio.sleep(3)
 
-    asyncio.create_task(simulator_loop())
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Stop ingestion and checkpoint its cursor (needs the DB still open)
+    if ingestion.chain_ingestor is not None:
+        await ingestion.chain_ingestor.stop()
+    await predict.scoring_service.calibration.stop()
+    await predict.scoring_service.live.stop()
+    # Stop the alert sender (unsent alerts stay DB-only)
+    await predict.alert_registry.stop()
+    # Send what is still buffered (bounded wait), close the Telegram pool
+    await telegram_service.dispatcher.stop()
+    # Stop following the model registry, then the inference workers
+    # (and release shared model memory)
+    await predict.inference_service.stop()
+    predict.inference_service.close()
+    # Close pooled Etherscan connections
+    await wallet_activity.etherscan_client.close()
+    # Flush buffered predictions / alerts
+    predict.db_service.close()
+    # Persist wallet history for the next start
+    if settings.FEATURE_STORE_SNAPSHOT_PATH:
+        predict.feature_store.snapshot(settings.FEATURE_STORE_SNAPSHOT_PATH)
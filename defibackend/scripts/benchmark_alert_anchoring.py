@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Alert Anchoring Benchmark
+Alerts anchored per transaction: one createAlert per alert vs one
+anchorAlertBatch(root) per window, plus tree / proof / verify cost
+    python scripts/benchmark_alert_anchoring.py                    # offline only
+    python scripts/benchmark_alert_anchoring.py --contract 0x...   # + dev chain gas
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from web3 import Web3
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.web3.alert_registry import ALERT_REGISTRY_ABI
+from app.web3.merkle import alert_leaf, build_tree, merkle_proof, merkle_root, verify_proof
+from app.web3.sender import AlertTransactionSender
+
+# Hardhat / anvil default account #0 (dev chains only)
+DEV_PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+
+def bench_offline(window_sizes: list):
+    print("🌳 Tree build + proofs + verification (per window)\n")
+    for size in window_sizes:
+        alerts = [(f"0x{uuid.uuid4().hex}", 0.9) for _ in range(size)]
+
+        start = time.perf_counter()
+        leaves = [alert_leaf(tx_hash, score) for tx_hash, score in alerts]
+        levels = build_tree(leaves)
+        proofs = [merkle_proof(levels, i) for i in range(size)]
+        build_s = time.perf_counter() - start
+
+        root = merkle_root(levels)
+        start = time.perf_counter()
+        assert all(verify_proof(leaf, proof, root) for leaf, proof in zip(leaves, proofs))
+        verify_s = time.perf_counter() - start
+
+        print(f"   window {size:6d}   {size:6d} alerts / tx   build {build_s * 1000:8.1f} ms   "
+              f"proof {len(proofs[0]):2d} hashes   verify {verify_s / size * 1e6:6.1f} µs/alert")
+
+
+async def send_and_wait(args, submit) -> list:
+    sender = AlertTransactionSender(
+        rpc_url=args.rpc_url,
+        contract_address=args.contract,
+        abi=ALERT_REGISTRY_ABI,
+        private_key=args.private_key,
+        poll_interval=0.2,
+    )
+    await sender.start()
+    hashes = await asyncio.gather(*submit(sender))
+    await sender.stop()
+    return [h for h in hashes if h]
+
+
+def gas_used(w3: Web3, hashes: list) -> int:
+    return sum(w3.eth.wait_for_transaction_receipt(h, timeout=120)["gasUsed"] for h in hashes)
+
+
+def bench_on_chain(args):
+    w3 = Web3(Web3.HTTPProvider(args.rpc_url))
+    if not w3.is_connected():
+        sys.exit(f"❌ No node at {args.rpc_url}")
+
+    run = uuid.uuid4().hex[:8]
+    alerts = [(f"{run}-{i}", 0.9) for i in range(args.alerts)]
+    print(f"\n⛓️ {args.alerts} alerts on chain {w3.eth.chain_id}\n")
+
+    start = time.perf_counter()
+    hashes = asyncio.run(send_and_wait(
+        args, lambda s: [s.submit(None, tx_hash, score) for tx_hash, score in alerts]
+    ))
+    gas = gas_used(w3, hashes)
+    elapsed = time.perf_counter() - start
+    print(f"   {'createAlert':18s} {len(hashes):5d} tx   {args.alerts / max(len(hashes), 1):7.1f} alerts/tx   "
+          f"{gas / args.alerts:9.0f} gas/alert   {elapsed:6.2f} s")
+
+    windows = [alerts[i:i + args.window] for i in range(0, len(alerts), args.window)]
+    roots = [
+        merkle_root(build_tree([alert_leaf(f"anchor-{tx_hash}", score) for tx_hash, score in window]))
+        for window in windows
+    ]
+    start = time.perf_counter()
+    hashes = asyncio.run(send_and_wait(
+        args, lambda s: [s.submit_anchor([], root, len(w)) for root, w in zip(roots, windows)]
+    ))
+    gas = gas_used(w3, hashes)
+    elapsed = time.perf_counter() - start
+    print(f"   {'anchorAlertBatch':18s} {len(hashes):5d} tx   {args.alerts / max(len(hashes), 1):7.1f} alerts/tx   "
+          f"{gas / args.alerts:9.0f} gas/alert   {elapsed:6.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--windows", default="16,256,1024,4096")
+    parser.add_argument("--rpc-url", default="http://127.0.0.1:8545")
+    parser.add_argument("--contract", help="AlertRegistry address (enables on-chain run)")
+    parser.add_argument("--private-key", default=DEV_PRIVATE_KEY)
+    parser.add_argument("--alerts", type=int, default=500)
+    parser.add_argument("--window", type=int, default=256)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("  DeFi Risk Engine - Alert Anchoring Benchmark")
+    print("=" * 60 + "\n")
+
+    bench_offline([int(size) for size in args.windows.split(",")])
+    if args.contract:
+        bench_on_chain(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Alert Pagination Benchmark
+OFFSET vs keyset pagination at page 1 and page 10,000 of a large alerts table
+    python scripts/benchmark_alert_pagination.py --rows 5000000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+PAGE_SIZE = 100
+CHUNK = 50_000
+
+
+def populate(db_service, n_rows: int):
+    from sqlalchemy import insert
+    from app.db.database import Alert
+
+    start_time = datetime(2024, 1, 1)
+    levels = ["low", "medium", "high", "critical"]
+
+    with db_service.engine.begin() as conn:
+        for offset in range(0, n_rows, CHUNK):
+            conn.execute(insert(Alert), [
+                {
+                    "tx_hash": f"0x{i:064x}",
+                    "wallet_address": f"0x{i % 5000:040x}",
+                    "risk_score": (i % 100) / 100,
+                    "risk_level": levels[i % 4],
+                    "amount_usd": float(i),
+                    "timestamp": start_time + timedelta(milliseconds=i * 250),
+                    "verified": False,
+                }
+                for i in range(offset, min(offset + CHUNK, n_rows))
+            ])
+            print(f"   {min(offset + CHUNK, n_rows):,} / {n_rows:,} rows", end="\r")
+        db_service.stats.rebuild(conn)
+    print()
+
+
+def median_ms(fn, repeats: int = 5) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("  DeFi Risk Engine - Alert Pagination Benchmark")
+    print("=" * 60 + "\n")
+
+    tmp = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/alerts_bench.db"
+    os.environ["DB_WRITE_BUFFERED"] = "false"
+
+    from app.db.database import DatabaseService
+    from app.db.pagination import encode_cursor
+
+    db_service = DatabaseService()
+
+    print(f"📥 Inserting {args.rows:,} alerts...")
+    populate(db_service, args.rows)
+
+    deep_page = min(10_000, args.rows // PAGE_SIZE)
+
+    for page in [1, deep_page]:
+        skip = (page - 1) * PAGE_SIZE
+
+        # Cursor a client would hold after walking to this page (setup only)
+        cursor = None
+        if skip:
+            previous = db_service.get_alerts(skip=skip - 1, limit=1)[0]
+            cursor = encode_cursor(previous.timestamp, previous.id)
+
+        offset_ms = median_ms(lambda: db_service.get_alerts(skip=skip, limit=PAGE_SIZE))
+        keyset_ms = median_ms(lambda: db_service.get_alerts_page(limit=PAGE_SIZE, cursor=cursor))
+
+        print(f"📄 page {page:,}")
+        print(f"   OFFSET: {offset_ms:9.2f} ms")
+        print(f"   keyset: {keyset_ms:9.2f} ms")
+
+    print("\n🔢 total")
+    print(f"   unfiltered (counter):   {median_ms(db_service.count_alerts):9.2f} ms")
+    print(f"   filtered (index COUNT): "
+          f"{median_ms(lambda: db_service.count_alerts(wallet_address=f'0x{7:040x}')):9.2f} ms")
+
+    db_service.close()
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
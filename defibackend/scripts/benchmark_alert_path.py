@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Alert Path Benchmark
+/predict latency against a local uvicorn server with alerts firing on
+10% of requests (Telegram mappings for half the alerting wallets, mock
+Bot API), plus the per-alert DB work removed from the request path:
+uncached chat-id query + alert read-back vs cache + in-memory record
+Requires trained models (see scripts/train_model.py)
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmark_streaming import start_server
+
+ALERT_TX = {"amount_usd": 5_000_000, "tx_count_user": 2, "rolling_volume_user": 1e7, "relative_amount": 50}
+NORMAL_TX = {"amount_usd": 100, "tx_count_user": 50, "rolling_volume_user": 1_000, "relative_amount": 1}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def make_requests(n: int, alert_ratio: float, wallets: int) -> list:
+    rng = random.Random(7)
+    requests = []
+    for i in range(n):
+        is_alert = rng.random() < alert_ratio
+        tx = dict(ALERT_TX if is_alert else NORMAL_TX)
+        tx["tx_hash"] = f"0x{i:064x}"
+        tx["wallet_address"] = f"0x{rng.randrange(wallets):040x}"
+        requests.append((is_alert, tx))
+    return requests
+
+
+async def run_load(base_url: str, requests: list, concurrency: int) -> list:
+    import httpx
+
+    latencies = []
+    queue = list(reversed(requests))
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        async def worker():
+            while queue:
+                is_alert, tx = queue.pop()
+                start = time.perf_counter()
+                response = await client.post("/api/v1/predict", json=tx)
+                response.raise_for_status()
+                latencies.append((response.json()["is_alert"], time.perf_counter() - start))
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def percentiles(values: list) -> str:
+    if not values:
+        return "n/a"
+    p50, p95, p99 = np.percentile(np.array(values) * 1000, [50, 95, 99])
+    return f"p50 {p50:6.2f} ms   p95 {p95:6.2f} ms   p99 {p99:6.2f} ms"
+
+
+def bench_db_work(db_service, alerts: int, wallets: int):
+    """
+    What the alert path used to do after store_alert vs what it does now
+    """
+    from app.db.database import TelegramMapping
+    from app.schemas.models import PredictRequest, PredictResponse, RiskLevel
+
+    request = PredictRequest(**ALERT_TX, tx_hash="0x1", wallet_address="0x0")
+    response = PredictResponse(
+        risk_score=0.85, risk_level=RiskLevel.HIGH, is_alert=True,
+        threshold=0.7, confidence=0.9, timestamp=datetime.utcnow(),
+    )
+    alert_id = db_service.store_alert(request, response)
+    addresses = [f"0x{i % wallets:040x}" for i in range(alerts)]
+
+    def uncached_chat_id(wallet_address):
+        session = db_service.SessionLocal()
+        try:
+            row = (
+                session.query(TelegramMapping.telegram_chat_id)
+                .filter(TelegramMapping.wallet_address == wallet_address)
+                .first()
+            )
+            return row[0] if row else None
+        finally:
+            session.close()
+
+    old, new = [], []
+    for wallet_address in addresses:
+        start = time.perf_counter()
+        if uncached_chat_id(wallet_address):
+            db_service.get_alert_by_id(alert_id)
+        old.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        if db_service.get_telegram_chat_id(wallet_address):
+            db_service.build_alert_record(request, response, alert_id)
+        new.append(time.perf_counter() - start)
+
+    print(f"   {'query + read-back':22s} {percentiles(old)}")
+    print(f"   {'cache + in-memory':22s} {percentiles(new)}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--alert-ratio", type=float, default=0.10)
+    parser.add_argument("--wallets", type=int, default=200)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("  DeFi Risk Engine - Alert Path Benchmark")
+    print("=" * 60 + "\n")
+
+    tmp = tempfile.mkdtemp()
+    telegram_port = free_port()
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{tmp}/alert_path_bench.db",
+        FEATURE_STORE_SNAPSHOT_PATH="",
+        INGEST_ENABLED="false",
+        TELEGRAM_BOT_TOKEN=os.environ.get("TELEGRAM_BOT_TOKEN", "benchmark"),
+        TELEGRAM_API_URL=f"http://127.0.0.1:{telegram_port}",
+    )
+    os.environ.update(env)
+
+    from app.db.database import DatabaseService
+
+    # Half the wallets have a Telegram chat
+    db_service = DatabaseService()
+    for i in range(0, args.wallets, 2):
+        db_service.save_telegram_chat_id(f"0x{i:040x}", str(100_000 + i))
+
+    mock = subprocess.Popen(
+        [sys.executable, str(Path(__file__).with_name("mock_telegram.py")),
+         "--port", str(telegram_port), "--latency-ms", "20"],
+        stdout=subprocess.DEVNULL,
+    )
+    port = free_port()
+    server = start_server(port, env)
+    try:
+        requests = make_requests(args.requests, args.alert_ratio, args.wallets)
+        print(f"📨 {len(requests):,} /predict requests, {args.concurrency} concurrent, "
+              f"{args.alert_ratio:.0%} alerting over {args.wallets} wallets\n")
+
+        latencies = asyncio.run(run_load(f"http://127.0.0.1:{port}", requests, args.concurrency))
+        print(f"   {'all':10s} {percentiles([t for _, t in latencies])}")
+        print(f"   {'alerts':10s} {percentiles([t for alert, t in latencies if alert])}")
+        print(f"   {'no alert':10s} {percentiles([t for alert, t in latencies if not alert])}")
+
+        import httpx
+        metrics = httpx.get(f"http://127.0.0.1:{port}/api/v1/predict/metrics").json()
+        print(f"\n📊 chat cache {metrics['telegram_chat_cache']}")
+
+        print("\n🗄️ Per-alert DB work after store_alert\n")
+        bench_db_work(db_service, alerts=2_000, wallets=args.wallets)
+    finally:
+        server.terminate()
+        server.wait()
+        mock.terminate()
+        mock.wait()
+        db_service.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
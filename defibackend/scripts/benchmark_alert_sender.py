@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Alert Sender Benchmark
+createAlert submission against a local dev chain (hardhat node / anvil):
+old per-alert build + sign + send with the "latest" nonce, run concurrently
+the way background tasks did, vs AlertTransactionSender
+    npx hardhat node                       # in contracts/
+    npx hardhat run scripts/deployAlertRegistry.js --network localhost
+    python scripts/benchmark_alert_sender.py --contract 0x...
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from web3 import Web3
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.web3.alert_registry import ALERT_REGISTRY_ABI
+from app.web3.sender import AlertTransactionSender
+
+# Hardhat / anvil default account #0 (dev chains only)
+DEV_PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+THREADPOOL_SIZE = 40  # Starlette's default threadpool for sync background tasks
+
+
+def old_create_alert(w3: Web3, contract, account, tx_hash: str, risk_score: float):
+    """
+    What AlertRegistry.create_alert used to do
+    """
+    try:
+        transaction = contract.functions.createAlert(
+            Web3.keccak(text=tx_hash), int(risk_score * 100)
+        ).build_transaction({
+            "from": account.address,
+            "nonce": w3.eth.get_transaction_count(account.address),
+            "gas": 150000,
+            "gasPrice": w3.eth.gas_price,
+        })
+        signed = account.sign_transaction(transaction)
+        return w3.eth.send_raw_transaction(signed.rawTransaction).hex()
+    except Exception:
+        return None
+
+
+def wait_mined(w3: Web3, hashes: list, timeout: float) -> int:
+    deadline = time.monotonic() + timeout
+    mined = 0
+    for h in hashes:
+        while time.monotonic() < deadline:
+            try:
+                w3.eth.get_transaction_receipt(h)
+                mined += 1
+                break
+            except Exception:
+                time.sleep(0.2)
+    return mined
+
+
+def report(name: str, elapsed: float, hashes: list, mined: int):
+    sent = sum(1 for h in hashes if h)
+    print(f"   {name:22s} {elapsed:6.2f} s   {sent:4d} sent / {len(hashes) - sent:4d} failed   "
+          f"{mined:4d} mined   {len(hashes) / elapsed:7.1f} alerts/s")
+
+
+async def run_sender(args, tx_hashes: list):
+    sender = AlertTransactionSender(
+        rpc_url=args.rpc_url,
+        contract_address=args.contract,
+        abi=ALERT_REGISTRY_ABI,
+        private_key=args.private_key,
+        poll_interval=0.2,
+    )
+    await sender.start()
+    hashes = await asyncio.gather(*(sender.submit(None, h, 0.9) for h in tx_hashes))
+    metrics = sender.get_metrics()
+    await sender.stop()
+    return hashes, metrics
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rpc-url", default="http://127.0.0.1:8545")
+    parser.add_argument("--contract", required=True)
+    parser.add_argument("--private-key", default=DEV_PRIVATE_KEY)
+    parser.add_argument("--alerts", type=int, default=200)
+    parser.add_argument("--mine-timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("  DeFi Risk Engine - Alert Sender Benchmark")
+    print("=" * 60 + "\n")
+
+    w3 = Web3(Web3.HTTPProvider(args.rpc_url))
+    if not w3.is_connected():
+        sys.exit(f"❌ No node at {args.rpc_url}")
+    account = w3.eth.account.from_key(args.private_key)
+    contract = w3.eth.contract(address=Web3.to_checksum_address(args.contract), abi=ALERT_REGISTRY_ABI)
+    print(f"⛓️ chain {w3.eth.chain_id}, {args.alerts} alerts per run\n")
+
+    # Fresh alert hashes per run - the contract rejects duplicates
+    run = uuid.uuid4().hex[:8]
+    old_hashes = [f"old-{run}-{i}" for i in range(args.alerts)]
+    new_hashes = [f"new-{run}-{i}" for i in range(args.alerts)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(THREADPOOL_SIZE) as pool:
+        hashes = list(pool.map(lambda h: old_create_alert(w3, contract, account, h, 0.9), old_hashes))
+    elapsed = time.perf_counter() - start
+    report("per-alert (old)", elapsed, hashes, wait_mined(w3, [h for h in hashes if h], args.mine_timeout))
+
+    start = time.perf_counter()
+    hashes, metrics = asyncio.run(run_sender(args, new_hashes))
+    elapsed = time.perf_counter() - start
+    report("AlertTransactionSender", elapsed, hashes, wait_mined(w3, [h for h in hashes if h], args.mine_timeout))
+    print(f"\n📊 {metrics}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Attribution Benchmark
+Cost of ?explain=true: CompiledForest.risk_scores vs CompiledForest.explain
+(scores + per-feature contributions) on the served model, and a check that
+the contributions reproduce every score (risk_score = 0.5 * 2 ** sum)
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("ETHERSCAN_API_KEY", "benchmark")
+
+from app.ml.model_loader import FEATURES, ModelLoader
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10_000])
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("  DeFi Risk Engine - Attribution Benchmark")
+    print("=" * 60 + "\n")
+
+    engine = ModelLoader().engine
+    if engine.native_trees is None:
+        ModelLoader.attach_native_trees(engine)
+    print(f"   {engine.n_trees} trees, {len(FEATURES)} features\n")
+
+    rng = np.random.default_rng(42)
+    print(f"   {'rows':>7s}   {'risk_scores':>11s}   {'explain':>11s}   {'overhead':>8s}   {'identity err':>12s}")
+    for size in args.sizes:
+        X = np.column_stack([
+            rng.lognormal(8, 2, size),
+            rng.poisson(50, size),
+            rng.lognormal(10, 1.5, size),
+            rng.lognormal(0, 0.5, size),
+        ])
+        scores, contributions = engine.explain(X)
+        assert np.allclose(scores, engine.risk_scores(X))
+        error = np.abs(scores - 0.5 * 2.0 ** contributions.sum(axis=1)).max()
+
+        repeat = max(5, 10_000 // size)
+        plain = best_of(lambda: engine.risk_scores(X), repeat)
+        explained = best_of(lambda: engine.explain(X), repeat)
+        print(f"   {size:>7,}   {plain * 1e3:8.2f} ms   {explained * 1e3:8.2f} ms   "
+              f"{explained / plain:7.1f}x   {error:12.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Micro-batching Benchmark
+Fires bursts of concurrent single predictions and compares
+per-request inference against the InferenceBatcher
+Requires trained models (see scripts/train_model.py)
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.schemas.models import PredictRequest
+from app.services.inference import InferenceService
+from app.services.batcher import InferenceBatcher
+
+
+def make_requests(n: int, seed: int = 7) -> list[PredictRequest]:
+    rng = np.random.default_rng(seed)
+    return [
+        PredictRequest(
+            amount_usd=float(rng.lognormal(8, 2)),
+            tx_count_user=int(rng.poisson(50)),
+            rolling_volume_user=float(rng.lognormal(10, 1.5)),
+            relative_amount=float(rng.lognormal(0, 1)),
+        )
+        for _ in range(n)
+    ]
+
+
+async def run_burst(score_fn, requests: list[PredictRequest]) -> np.ndarray:
+    """
+    Submit all requests concurrently, return per-request latency (ms)
+    All requests arrive at the same instant, so latency includes queueing
+    """
+    latencies = np.empty(len(requests))
+    start = time.perf_counter()
+
+    async def one(i, request):
+        await score_fn(request)
+        latencies[i] = (time.perf_counter() - start) * 1000
+
+    await asyncio.gather(*(one(i, r) for i, r in enumerate(requests)))
+    return latencies
+
+
+async def main():
+    print("\n" + "=" * 60)
+    print("  DeFi Risk Engine - Micro-batching Benchmark")
+    print("=" * 60 + "\n")
+
+    inference_service = InferenceService()
+
+    async def unbatched(request):
+        return inference_service.run_inference(request)
+
+    for concurrency in [1, 64, 1024]:
+        requests = make_requests(concurrency)
+        batcher = InferenceBatcher(inference_service, max_batch_size=256, max_wait_ms=2.0)
+
+        for name, fn in [("per-request", unbatched), ("batched", batcher.submit)]:
+            start = time.perf_counter()
+            latencies = await run_burst(fn, requests)
+            elapsed = time.perf_counter() - start
+
+            print(f"📊 {concurrency:>5} concurrent | {name:<11} | "
+                  f"{concurrency / elapsed:>10,.0f} req/s | "
+                  f"p50 {np.percentile(latencies, 50):7.2f} ms | "
+                  f"p99 {np.percentile(latencies, 99):7.2f} ms")
+
+        metrics = batcher.get_metrics()
+        print(f"   batches: {metrics['batches_total']}, "
+              f"avg size: {metrics['avg_batch_size']:.1f}, "
+              f"max wait: {metrics['max_wait_seen_ms']:.2f} ms\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
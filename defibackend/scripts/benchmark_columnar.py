@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Columnar Batch Benchmark
+/predict/batch throughput: JSON (100 rows per request) vs an
+application/x-npy feature matrix (up to PREDICT_BATCH_BINARY_MAX_ROWS)
+plus the body decode cost on its own
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("ETHERSCAN_API_KEY", "benchmark")
+
+from benchmark_streaming import BATCH_LIMIT, make_records, run_batch, start_server
+
+from app.api.columnar import NPY_CONTENT_TYPE, decode_feature_matrix
+from app.ml.model_loader import FEATURES
+from app.schemas.models import BatchPredictRequest
+
+
+def to_npy(records: list) -> bytes:
+    X = np.array([[r[name] for name in FEATURES] for r in records], dtype=np.float64)
+    buffer = io.BytesIO()
+    np.save(buffer, X)
+    return buffer.getvalue()
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def run_columnar(base_url: str, bodies: list) -> int:
+    import httpx
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=600) as client:
+        scored = 0
+        for body in bodies:
+            response = await client.post(
+                "/api/v1/predict/batch",
+                content=body,
+                headers={"content-type": NPY_CONTENT_TYPE},
+            )
+            response.raise_for_status()
+            with np.load(io.BytesIO(response.content)) as columns:
+                scored += int(columns["total_processed"])
+        return scored
+
+
+def decode_costs(records: list):
+    """
+    Rows -> what the handler works on: JSON as 100-row bodies (its limit)
+    vs one .npy body
+    """
+    print(f"   {'rows':>7s}   {'JSON parse + validate':>22s}   {'.npy decode':>12s}")
+    for size in (100, 10_000, 100_000):
+        rows = records[:size]
+        json_bodies = [
+            json.dumps({"transactions": rows[i:i + BATCH_LIMIT]}).encode()
+            for i in range(0, size, BATCH_LIMIT)
+        ]
+        npy_body = to_npy(rows)
+
+        def parse_json():
+            for body in json_bodies:
+                BatchPredictRequest.model_validate(json.loads(body))
+
+        json_s = best_of(parse_json, 3)
+        npy_s = best_of(lambda: decode_feature_matrix(npy_body, size), 20)
+        json_kb = sum(len(body) for body in json_bodies) / 1024
+        print(f"   {size:>7,}   {json_s * 1e3:19.2f} ms   {npy_s * 1e3:9.2f} ms   "
+              f"({json_kb:,.0f} KB vs {len(npy_body) / 1024:,.0f} KB)")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 10_000, 100_000])
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("  DeFi Risk Engine - Columnar Batch Benchmark")
+    print("=" * 60 + "\n")
+
+    records = make_records(args.records)
+    print(f"📦 {len(records):,} transactions\n")
+    decode_costs(records)
+    print()
+
+    tmp = tempfile.mkdtemp()
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{tmp}/columnar_bench.db",
+        FEATURE_STORE_SNAPSHOT_PATH="",
+    )
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = start_server(port, env)
+    base_url = f"http://127.0.0.1:{port}"
+
+    runs = [("JSON (100/req)", lambda: run_batch(base_url, records))]
+    for rows in args.rows:
+        bodies = [to_npy(records[i:i + rows]) for i in range(0, len(records), rows)]
+        runs.append((f".npy ({rows:,}/req)", lambda bodies=bodies: run_columnar(base_url, bodies)))
+
+    # Request -> response only: the DB write runs after the response is sent
+    for name, run in runs:
+        start = time.perf_counter()
+        scored = await run()
+        elapsed = time.perf_counter() - start
+        print(f"   {name:20s} {scored:8,} scored  {elapsed:6.2f} s  "
+              f"{scored / elapsed:10,.0f} tx/s")
+
+    server.terminate()
+    server.wait()
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Etherscan Client Benchmark
+Wallet activity lookups against the local mock Etherscan:
+old per-call requests.get (full history, no session) vs EtherscanClient
+"""
+import argparse
+import asyncio
+import random
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.etherscan import EtherscanClient, EtherscanError
+
+LIMIT = 20
+THREADPOOL_SIZE = 40  # Starlette's default threadpool for sync routes
+
+
+def start_mock(port: int, args) -> subprocess.Popen:
+    mock = subprocess.Popen(
+        [sys.executable, str(Path(__file__).with_name("mock_etherscan.py")),
+         "--port", str(port),
+         "--history", str(args.history),
+         "--latency-ms", str(args.latency_ms),
+         "--rate-limit", str(args.rate_limit)],
+        stdout=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/stats")
+            return mock
+        except httpx.TransportError:
+            time.sleep(0.1)
+    mock.kill()
+    raise RuntimeError("mock Etherscan did not start")
+
+
+def old_lookup(url: str, address: str) -> list:
+    """
+    What get_wallet_transactions used to do
+    """
+    params = {
+        "chainid": 11155111,
+        "module": "account",
+        "action": "txlist",
+        "address": address,
+        "startblock": 0,
+        "endblock": 99999999,
+        "sort": "desc",
+        "apikey": "x",
+    }
+    data = requests.get(url, params=params).json()
+    if data.get("status") != "1":
+        return []
+    return data["result"][:LIMIT]
+
+
+def reset_stats(port: int) -> dict:
+    return httpx.get(f"http://127.0.0.1:{port}/stats").json()
+
+
+def delta(before: dict, after: dict) -> dict:
+    return {k: after[k] - before[k] for k in after}
+
+
+def report(name: str, elapsed: float, results: list, upstream: dict):
+    failed = sum(1 for r in results if not r)
+    print(f"   {name:16s} {elapsed:6.2f} s   {len(results) - failed:4d} ok / {failed:4d} empty   "
+          f"{upstream['requests']:4d} upstream calls ({upstream['rate_limited']} throttled)   "
+          f"{upstream['bytes_sent'] / 2**20:7.1f} MB")
+
+
+async def run_new(url: str, waves: list, wave_gap: float, cache_ttl: float, rate: float):
+    client = EtherscanClient(
+        api_key="x", base_url=url, rate_limit_per_sec=rate, cache_ttl_seconds=cache_ttl,
+    )
+
+    async def lookup(address):
+        try:
+            return await client.get_transactions(address, LIMIT)
+        except EtherscanError:
+            return []
+
+    results = []
+    for i, wave in enumerate(waves):
+        if i:
+            await asyncio.sleep(wave_gap)
+        results += await asyncio.gather(*(lookup(a) for a in wave))
+
+    metrics = client.get_metrics()
+    await client.close()
+    return results, metrics
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--wallets", type=int, default=20)
+    parser.add_argument("--lookups-per-wave", type=int, default=200)
+    parser.add_argument("--waves", type=int, default=3)
+    parser.add_argument("--wave-gap", type=float, default=2.0)
+    parser.add_argument("--history", type=int, default=5_000)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--rate-limit", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("  DeFi Risk Engine - Etherscan Client Benchmark")
+    print("=" * 60 + "\n")
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    mock = start_mock(port, args)
+    url = f"http://127.0.0.1:{port}/api"
+
+    rng = random.Random(7)
+    wallets = [f"0x{i:040x}" for i in range(args.wallets)]
+    waves = [
+        [rng.choice(wallets) for _ in range(args.lookups_per_wave)]
+        for _ in range(args.waves)
+    ]
+    print(f"🔎 {args.waves} waves x {args.lookups_per_wave} lookups over {args.wallets} wallets "
+          f"({args.history:,} tx each, {args.latency_ms:.0f} ms latency, "
+          f"{args.rate_limit:.0f} req/s limit)\n")
+
+    try:
+        # Let the mock's rate-limit window reset between runs
+        time.sleep(1.1)
+        before = reset_stats(port)
+        start = time.perf_counter()
+        results = []
+        with ThreadPoolExecutor(THREADPOOL_SIZE) as pool:
+            for i, wave in enumerate(waves):
+                if i:
+                    time.sleep(args.wave_gap)
+                results += pool.map(lambda a: old_lookup(url, a), wave)
+        report("requests.get", time.perf_counter() - start, results, delta(before, reset_stats(port)))
+
+        time.sleep(1.1)
+        before = reset_stats(port)
+        start = time.perf_counter()
+        results, metrics = asyncio.run(
+            run_new(url, waves, args.wave_gap, cache_ttl=args.wave_gap / 2, rate=args.rate_limit)
+        )
+        report("EtherscanClient", time.perf_counter() - start, results, delta(before, reset_stats(port)))
+        print(f"\n📊 {metrics}")
+    finally:
+        mock.terminate()
+        mock.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Inference Executor Load Test
+Runs concurrent clients against InferenceService in inline, thread and
+process mode, and measures scoring latency plus event-loop responsiveness
+(what a /health check would see while scoring is under way)
+Requires trained models (see scripts/train_model.py)
+"""
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.schemas.models import PredictRequest
+from app.services.inference import InferenceService
+
+CLIENTS = 32
+REQUESTS_PER_CLIENT = 50
+BATCH_SIZE = 256
+
+
+def make_batch(n: int, seed: int) -> list[PredictRequest]:
+    rng = np.random.default_rng(seed)
+    return [
+        PredictRequest(
+            amount_usd=float(rng.lognormal(8, 2)),
+            tx_count_user=int(rng.poisson(50)),
+            rolling_volume_user=float(rng.lognormal(10, 1.5)),
+            relative_amount=float(rng.lognormal(0, 1)),
+        )
+        for _ in range(n)
+    ]
+
+
+async def load_test(service: InferenceService, batch: list[PredictRequest]):
+    latencies = []
+    loop_lags = []
+    done = asyncio.Event()
+
+    async def client():
+        for _ in range(REQUESTS_PER_CLIENT):
+            start = time.perf_counter()
+            await service.batch_inference_async(batch)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    async def health_probe():
+        # How late does a 1 ms sleep wake up? (= event loop blocking)
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            loop_lags.append((time.perf_counter() - start) * 1000 - 1)
+
+    probe = asyncio.create_task(health_probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(CLIENTS)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probe
+
+    return np.array(latencies), np.array(loop_lags), elapsed
+
+
+async def main():
+    print("\n" + "=" * 60)
+    print("  DeFi Risk Engine - Inference Executor Load Test")
+    print("=" * 60 + "\n")
+    print(f"CPU cores: {os.cpu_count()}, clients: {CLIENTS}, "
+          f"batch size: {BATCH_SIZE}\n")
+
+    batch = make_batch(BATCH_SIZE, seed=7)
+
+    for mode in ["inline", "thread", "process"]:
+        service = InferenceService(executor_mode=mode)
+        try:
+            # Warm up (process workers attach to shared memory on first use)
+            await asyncio.gather(*(service.batch_inference_async(batch) for _ in range(8)))
+
+            latencies, lags, elapsed = await load_test(service, batch)
+            rows = CLIENTS * REQUESTS_PER_CLIENT * BATCH_SIZE
+
+            print(f"⚙️ {mode}")
+            print(f"   throughput: {rows / elapsed:12,.0f} rows/s")
+            print(f"   batch p50:  {np.percentile(latencies, 50):9.2f} ms")
+            print(f"   batch p99:  {np.percentile(latencies, 99):9.2f} ms")
+            print(f"   loop lag p99 (health check delay): "
+                  f"{np.percentile(lags, 99) if len(lags) else float('nan'):.2f} ms\n")
+        finally:
+            service.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Wallet Feature Store Benchmark
+Records and looks up transactions for 1M distinct wallets, then
+measures snapshot / restore time and memory use
+"""
+import argparse
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.feature_store import WalletFeatureStore
+
+
+def rss_mb() -> float:
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--wallets", type=int, default=1_000_000)
+    parser.add_argument("--tx-per-wallet", type=int, default=3)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("  DeFi Risk Engine - Wallet Feature Store Benchmark")
+    print("=" * 60 + "\n")
+
+    n_wallets = args.wallets
+    n_tx = n_wallets * args.tx_per_wallet
+    rng = np.random.default_rng(42)
+
+    wallets = [f"0x{i:040x}" for i in range(n_wallets)]
+    wallet_ids = rng.integers(0, n_wallets, n_tx)
+    wallet_ids[:n_wallets] = np.arange(n_wallets)  # every wallet seen at least once
+    amounts = rng.lognormal(8, 2, n_tx).tolist()
+    # Spread over two days so buckets roll and the window expires
+    timestamps = np.sort(rng.uniform(0, 2 * 86_400, n_tx)).tolist()
+
+    store = WalletFeatureStore(max_wallets=n_wallets)
+    rss_before = rss_mb()
+
+    start = time.perf_counter()
+    for wallet_id, amount, ts in zip(wallet_ids.tolist(), amounts, timestamps):
+        store.record(wallets[wallet_id], amount, ts)
+    record_s = time.perf_counter() - start
+
+    lookups = rng.integers(0, n_wallets, 200_000).tolist()
+    now = timestamps[-1]
+    start = time.perf_counter()
+    for wallet_id in lookups:
+        store.features(wallets[wallet_id], 1000.0, now)
+    lookup_s = time.perf_counter() - start
+
+    metrics = store.get_metrics()
+    print(f"👛 {metrics['wallets']:,} wallets, {n_tx:,} transactions")
+    print(f"   record:   {n_tx / record_s:12,.0f} tx/s  ({record_s / n_tx * 1e6:.2f} µs/tx)")
+    print(f"   features: {len(lookups) / lookup_s:12,.0f} lookups/s  "
+          f"({lookup_s / len(lookups) * 1e6:.2f} µs/lookup)")
+    print(f"   tables:   {metrics['table_bytes'] / 2**20:12,.1f} MB")
+    print(f"   peak RSS growth: {rss_mb() - rss_before:,.1f} MB")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "wallet_features.npz"
+
+        start = time.perf_counter()
+        store.snapshot(path)
+        snapshot_s = time.perf_counter() - start
+
+        restored = WalletFeatureStore(max_wallets=n_wallets)
+        start = time.perf_counter()
+        n_restored = restored.restore(path)
+        restore_s = time.perf_counter() - start
+
+        same = all(
+            restored.features(wallets[i], 1000.0, now) == store.features(wallets[i], 1000.0, now)
+            for i in lookups[:1000]
+        )
+
+        print(f"\n💾 snapshot: {snapshot_s:.2f} s ({path.stat().st_size / 2**20:.1f} MB)")
+        print(f"   restore:  {restore_s:.2f} s ({n_restored:,} wallets, "
+              f"{'✅ identical' if same else '❌ mismatch'})")
+
+    # Bounded memory: a store capped at 10% of the wallets evicts LRU
+    capped = WalletFeatureStore(max_wallets=max(n_wallets // 10, 1))
+    for wallet_id, amount, ts in zip(wallet_ids[:n_wallets].tolist(), amounts, timestamps):
+        capped.record(wallets[wallet_id], amount, ts)
+    capped_metrics = capped.get_metrics()
+    print(f"\n🧹 capped store: {capped_metrics['wallets']:,} wallets kept, "
+          f"{capped_metrics['evictions_lru']:,} LRU evictions")
+
+
+if __name__ == "__main__":
+    main()
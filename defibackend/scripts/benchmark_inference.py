@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Inference Benchmark
+Compares the sklearn path (scaler.transform + score_samples)
+against the compiled forest engine used by InferenceService
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sklearn.ensemble import IsolationForest
+from sklearn.preprocessing import StandardScaler
+
+from app.ml.compiled_forest import CompiledForest
+
+
+def make_data(n_rows: int, seed: int = 42) -> np.ndarray:
+    """
+    Synthetic rows in model feature order
+    (amount_usd, tx_count_user, rolling_volume_user, relative_amount)
+    """
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.lognormal(8, 2, n_rows),
+        rng.poisson(50, n_rows),
+        rng.lognormal(10, 1.5, n_rows),
+        rng.lognormal(0, 1, n_rows),
+    ])
+
+
+def fit_models():
+    """
+    Fit scaler + forest with the same settings as scripts/train_model.py
+    """
+    X = make_data(1000)
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X)
+    model = IsolationForest(
+        n_estimators=100,
+        contamination=0.1,
+        random_state=42,
+        max_samples="auto",
+    )
+    model.fit(X_scaled)
+    return model, scaler
+
+
+def time_call(fn, repeats: int) -> float:
+    """
+    Median wall time of fn() in milliseconds
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("  DeFi Risk Engine - Inference Benchmark")
+    print("=" * 60 + "\n")
+
+    model, scaler = fit_models()
+    engine = CompiledForest.from_sklearn(model, scaler)
+
+    def sklearn_path(X):
+        return -model.score_samples(scaler.transform(X))
+
+    for n_rows, repeats in [(1, 500), (10_000, 10)]:
+        X = make_data(n_rows, seed=7)
+
+        expected = sklearn_path(X)
+        actual = engine.risk_scores(X)
+        identical = np.array_equal(expected, actual)
+
+        sklearn_ms = time_call(lambda: sklearn_path(X), repeats)
+        engine_ms = time_call(lambda: engine.risk_scores(X), repeats)
+
+        print(f"📊 {n_rows:,} row(s)")
+        print(f"   sklearn:  {sklearn_ms:9.3f} ms")
+        print(f"   compiled: {engine_ms:9.3f} ms")
+        print(f"   speedup:  {sklearn_ms / engine_ms:9.1f}x")
+        print(f"   bit-identical: {'✅' if identical else '❌'}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Model Load Benchmark
+Cold start and memory of N worker processes loading the model:
+pickles (joblib + sklearn) vs the mmap artifact, with and without the
+background rebuild of sklearn's native trees
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# One worker: load, score a batch, report, then wait to be measured
+WORKER = """
+import json, os, sys, time
+spawned = float(os.environ["SPAWNED_AT"])
+import numpy as np
+from app.ml.model_loader import ModelLoader
+loader = ModelLoader()
+ready = time.time() - spawned
+if os.environ["MODEL_NATIVE_TREES"] == "true":
+    while loader.engine.native_trees is None:
+        time.sleep(0.01)
+loader.engine.risk_scores(np.random.default_rng(0).lognormal(8, 2, (1000, 4)))
+print(json.dumps({"ready_s": ready, "load_ms": loader.load_seconds * 1000}), flush=True)
+sys.stdin.read()
+"""
+
+CONFIGS = [
+    ("pickle", {"MODEL_FORMAT": "pickle", "MODEL_NATIVE_TREES": "false"}),
+    ("mmap", {"MODEL_FORMAT": "mmap", "MODEL_NATIVE_TREES": "false"}),
+    ("mmap + native trees", {"MODEL_FORMAT": "mmap", "MODEL_NATIVE_TREES": "true"}),
+]
+
+
+def memory_kb(pid: int) -> dict:
+    """
+    Rss and Pss (shared pages split between the processes mapping them)
+    """
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                values[key] = int(rest.split()[0])
+    return values
+
+
+def read_report(proc) -> dict:
+    # Skip the loader's own log lines
+    for line in proc.stdout:
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError("worker exited before reporting")
+
+
+def run(workers: int, overrides: dict) -> dict:
+    env = dict(os.environ, PYTHONPATH=str(ROOT), **overrides)
+    env.setdefault("ETHERSCAN_API_KEY", "benchmark")
+    env["SPAWNED_AT"] = repr(time.time())
+
+    start = time.perf_counter()
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-c", WORKER],
+            cwd=ROOT, env=env, text=True,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        )
+        for _ in range(workers)
+    ]
+    reports = [read_report(proc) for proc in procs]
+    all_ready_s = time.perf_counter() - start
+
+    memory = [memory_kb(proc.pid) for proc in procs]
+    for proc in procs:
+        proc.stdin.close()
+        proc.wait()
+
+    return {
+        # Last worker able to serve (native trees may still be building)
+        "serving_s": max(r["ready_s"] for r in reports),
+        # Last worker done, native trees included
+        "settled_s": all_ready_s,
+        "load_ms": sum(r["load_ms"] for r in reports) / workers,
+        "rss_mb": sum(m["Rss"] for m in memory) / 1024,
+        "pss_mb": sum(m["Pss"] for m in memory) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    if not (ROOT / "app" / "models" / "forest" / "manifest.json").exists():
+        sys.exit("No mmap artifact - run scripts/train_model.py (or --export-only) first")
+
+    print("\n" + "=" * 60)
+    print("  DeFi Risk Engine - Model Load Benchmark")
+    print("=" * 60 + "\n")
+    print(f"   {os.cpu_count()} CPU(s); memory summed over workers after scoring a batch\n")
+
+    print(f"   {'workers':>7s}  {'format':20s} {'model load':>10s} {'serving':>9s} "
+          f"{'settled':>9s} {'RSS':>9s} {'PSS':>9s}")
+    for workers in args.workers:
+        for name, overrides in CONFIGS:
+            result = run(workers, overrides)
+            print(f"   {workers:>7}  {name:20s} {result['load_ms']:7.1f} ms "
+                  f"{result['serving_s']:7.2f} s {result['settled_s']:7.2f} s "
+                  f"{result['rss_mb']:6.0f} MB "
+                  f"{result['pss_mb']:6.0f} MB")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Model Reload Benchmark
+/predict/batch under load while the registry's CURRENT flips between two
+versions: failed requests, latency vs steady state, and whether every
+batch was scored by exactly one model. Then the cost of shadow scoring.
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("ETHERSCAN_API_KEY", "benchmark")
+
+from benchmark_streaming import BATCH_LIMIT, make_records, start_server
+
+from app.ml.compiled_forest import CompiledForest
+from app.ml.model_loader import FEATURE_SCHEMA, FEATURES, MODEL_PATH, SCALER_PATH
+from app.ml.registry import ModelRegistry
+
+
+def publish_versions(registry: ModelRegistry) -> dict:
+    """
+    v1 = the trained pickles, v2 = the same recipe with another seed
+    """
+    import joblib
+    from sklearn.ensemble import IsolationForest
+
+    model, scaler = joblib.load(MODEL_PATH), joblib.load(SCALER_PATH)
+    rng = np.random.default_rng(1)
+    X = scaler.inverse_transform(rng.standard_normal((1000, len(FEATURES))))
+    retrained = IsolationForest(n_estimators=100, random_state=7).fit(scaler.transform(X))
+
+    engines = {
+        "v1": CompiledForest.from_sklearn(model, scaler),
+        "v2": CompiledForest.from_sklearn(retrained, scaler),
+    }
+    for version, engine in engines.items():
+        registry.publish(version, engine, FEATURE_SCHEMA)
+    return engines
+
+
+async def load(base_url: str, batches: list, expected: dict, seconds: float, clients: int) -> dict:
+    import httpx
+
+    latencies, failures = [], 0
+    answered_by = {version: 0 for version in expected}
+    mixed = 0
+    deadline = time.perf_counter() + seconds
+
+    async def client(offset: int):
+        nonlocal failures, mixed
+        async with httpx.AsyncClient(base_url=base_url, timeout=30) as http:
+            i = offset
+            while time.perf_counter() < deadline:
+                index = i % len(batches)
+                start = time.perf_counter()
+                try:
+                    response = await http.post(
+                        "/api/v1/predict/batch", json={"transactions": batches[index]}
+                    )
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    failures += 1
+                    continue
+                finally:
+                    i += clients
+                latencies.append(time.perf_counter() - start)
+
+                scores = np.array([p["risk_score"] for p in response.json()["predictions"]])
+                matches = [v for v, s in expected.items() if np.array_equal(scores, s[index])]
+                if matches:
+                    answered_by[matches[0]] += 1
+                else:
+                    mixed += 1
+
+    await asyncio.gather(*(client(c) for c in range(clients)))
+    ms = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "failures": failures,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "answered_by": answered_by,
+        "mixed": mixed,
+    }
+
+
+async def flip(registry: ModelRegistry, seconds: float, every: float) -> int:
+    flips = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(every)
+        flips += 1
+        registry.activate("v2" if flips % 2 else "v1")
+    return flips
+
+
+def report(name: str, result: dict):
+    served = ", ".join(f"{v} {n}" for v, n in result["answered_by"].items())
+    print(f"   {name:24s} {result['requests']:6,} req  {result['failures']} failed  "
+          f"p50 {result['p50_ms']:6.1f} ms  p99 {result['p99_ms']:6.1f} ms  "
+          f"[{served}, mixed {result['mixed']}]")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--flip-every", type=float, default=0.5)
+    args = parser.parse_args()
+
+    import httpx
+
+    print("\n" + "=" * 60)
+    print("  DeFi Risk Engine - Model Reload Benchmark")
+    print("=" * 60 + "\n")
+
+    tmp = tempfile.mkdtemp()
+    registry = ModelRegistry(Path(tmp) / "registry")
+    engines = publish_versions(registry)
+    registry.activate("v1")
+
+    records = make_records(BATCH_LIMIT * 50)
+    batches = [records[i:i + BATCH_LIMIT] for i in range(0, len(records), BATCH_LIMIT)]
+    expected = {
+        version: [
+            engine.risk_scores(np.array([[r[name] for name in FEATURES] for r in batch]))
+            for batch in batches
+        ]
+        for version, engine in engines.items()
+    }
+
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{tmp}/reload_bench.db",
+        FEATURE_STORE_SNAPSHOT_PATH="",
+        MODEL_REGISTRY_DIR=str(registry.root),
+        MODEL_REGISTRY_POLL_SECONDS="0.1",
+    )
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = start_server(port, env)
+    base_url = f"http://127.0.0.1:{port}"
+
+    print(f"📦 {args.clients} clients x {BATCH_LIMIT}-row batches, {args.seconds:.0f} s per run\n")
+
+    # Warm-up (native trees, connection pools, DB file)
+    await load(base_url, batches, expected, 2.0, args.clients)
+
+    steady = await load(base_url, batches, expected, args.seconds, args.clients)
+    report("steady (v1)", steady)
+
+    swapping, flips = await asyncio.gather(
+        load(base_url, batches, expected, args.seconds, args.clients),
+        flip(registry, args.seconds, args.flip_every),
+    )
+    report(f"{flips} version flips", swapping)
+
+    registry.activate("v1")
+    registry.set_candidate("v2")
+    await asyncio.sleep(0.5)
+    shadowed = await load(base_url, batches, expected, args.seconds, args.clients)
+    report("v1 + v2 in shadow", shadowed)
+
+    shadow = httpx.get(f"{base_url}/api/v1/predict/models").json()["shadow"]
+    print(f"\n   shadow: {shadow['sampled']:,} rows sampled, {shadow['dropped']:,} dropped, "
+          f"KS {shadow['ks_statistic']:.3f}, mean |diff| {shadow['mean_abs_diff']:.4f}, "
+          f"alerts {shadow['alerts']}")
+
+    server.terminate()
+    server.wait()
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Notification Benchmark
+An alert burst against the local mock Bot API:
+old one-client-per-message notify_telegram vs NotificationDispatcher
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def start_mock(port: int, args) -> subprocess.Popen:
+    mock = subprocess.Popen(
+        [sys.executable, str(Path(__file__).with_name("mock_telegram.py")),
+         "--port", str(port),
+         "--latency-ms", str(args.latency_ms)],
+        stdout=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/stats")
+            return mock
+        except httpx.TransportError:
+            time.sleep(0.1)
+    mock.kill()
+    raise RuntimeError("mock Telegram did not start")
+
+
+def make_burst(args) -> list:
+    """
+    (arrival offset, chat_id, alert): a few chats hit by many alerts
+    (the attacked protocols) plus many chats with a single one
+    """
+    from app.schemas.models import AlertRecord, RiskLevel
+
+    rng = random.Random(7)
+    burst = []
+    for chat in range(args.hot_chats):
+        for _ in range(args.alerts_per_hot_chat):
+            burst.append((f"hot-{chat}", rng.random() * args.burst_seconds))
+    for chat in range(args.single_chats):
+        burst.append((f"single-{chat}", rng.random() * args.burst_seconds))
+    burst.sort(key=lambda item: item[1])
+
+    return [
+        (offset, chat_id, AlertRecord(
+            id=i, tx_hash=f"0x{i:064x}", wallet_address=f"0x{i:040x}",
+            risk_score=0.9, risk_level=RiskLevel.HIGH, amount_usd=1_000_000.0,
+            timestamp=datetime.utcnow(),
+        ))
+        for i, (chat_id, offset) in enumerate(burst)
+    ]
+
+
+async def replay(burst: list, notify):
+    start = time.perf_counter()
+    tasks = []
+    for offset, chat_id, alert in burst:
+        delay = offset - (time.perf_counter() - start)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(notify(chat_id, alert)))
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def run_old(base_url: str, burst: list) -> int:
+    """
+    What notify_telegram used to do: a fresh AsyncClient per message,
+    no rate limiting, status ignored
+    """
+    from app.notifications.telegram_service import format_alert
+
+    async def notify(chat_id, alert):
+        async with httpx.AsyncClient(timeout=10) as client:
+            await client.post(
+                f"{base_url}/sendMessage",
+                json={"chat_id": chat_id, "text": format_alert(alert), "parse_mode": "Markdown"},
+            )
+
+    await replay(burst, notify)
+
+
+async def run_new(burst: list, settle_timeout: float) -> dict:
+    from app.notifications.dispatcher import NotificationDispatcher
+    from app.notifications.telegram_client import TelegramClient
+    from app.notifications.telegram_service import format_digest
+
+    dispatcher = NotificationDispatcher(TelegramClient(), format_digest)
+    await dispatcher.start()
+
+    async def notify(chat_id, alert):
+        dispatcher.notify(chat_id, alert)
+
+    await replay(burst, notify)
+    # Hot chats are limited to 1 message/s: wait for their last digests
+    await dispatcher.stop(drain_timeout=settle_timeout)
+    return dispatcher.get_metrics()
+
+
+def stats(port: int) -> dict:
+    return httpx.get(f"http://127.0.0.1:{port}/stats").json()
+
+
+def report(name: str, elapsed: float, alerts: int, delivered: int, upstream: dict):
+    print(f"   {name:22s} {elapsed:6.2f} s   {delivered:4d}/{alerts} alerts delivered   "
+          f"{upstream['messages']:4d} messages   {upstream['rate_limited']:4d} x 429   "
+          f"{upstream['connections']:4d} connections")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hot-chats", type=int, default=5)
+    parser.add_argument("--alerts-per-hot-chat", type=int, default=60)
+    parser.add_argument("--single-chats", type=int, default=100)
+    parser.add_argument("--burst-seconds", type=float, default=3.0)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    os.environ["TELEGRAM_API_URL"] = f"http://127.0.0.1:{port}"
+    os.environ.setdefault("TELEGRAM_BOT_TOKEN", "benchmark")
+
+    print("\n" + "=" * 60)
+    print("  DeFi Risk Engine - Notification Benchmark")
+    print("=" * 60 + "\n")
+
+    burst = make_burst(args)
+    print(f"📨 {len(burst)} alerts over {args.burst_seconds:.0f} s: {args.hot_chats} chats x "
+          f"{args.alerts_per_hot_chat} alerts + {args.single_chats} single-alert chats\n")
+
+    mock = start_mock(port, args)
+    try:
+        base_url = f"http://127.0.0.1:{port}/botbenchmark"
+        before = stats(port)
+        start = time.perf_counter()
+        asyncio.run(run_old(base_url, burst))
+        after = stats(port)
+        upstream = {k: after[k] - before[k] for k in after}
+        # One message per alert: only the accepted ones reached anybody
+        report("per-message client", time.perf_counter() - start, len(burst),
+               upstream["messages"], upstream)
+
+        time.sleep(1.1)
+        before = stats(port)
+        start = time.perf_counter()
+        metrics = asyncio.run(run_new(burst, settle_timeout=30.0))
+        after = stats(port)
+        report("NotificationDispatcher", time.perf_counter() - start, len(burst),
+               metrics["alerts_delivered"], {k: after[k] - before[k] for k in after})
+        print(f"\n📊 {metrics}")
+    finally:
+        mock.terminate()
+        mock.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Prediction Cache Benchmark
+/predict under retry-heavy traffic (every tx_hash sent several times, part
+of them concurrently) with the result cache off and on: throughput,
+latency, hit rate and Prediction rows written
+"""
+import argparse
+import asyncio
+import os
+import socket
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("ETHERSCAN_API_KEY", "benchmark")
+
+from benchmark_streaming import make_records, start_server
+
+WARMUP_REQUESTS = 200  # Unique tx hashes, one Prediction row each
+
+
+def make_requests(unique: int, repeats: int, seed: int = 7) -> list:
+    """
+    Each transaction `repeats` times; shuffled, so some copies are in flight
+    together (re-submissions) and others come later (retries)
+    """
+    records = [
+        {**record, "tx_hash": f"0x{i:064x}"}
+        for i, record in enumerate(make_records(unique, seed))
+    ]
+    requests = records * repeats
+    order = np.random.default_rng(seed).permutation(len(requests))
+    return [requests[i] for i in order]
+
+
+async def load(base_url: str, requests: list, clients: int) -> dict:
+    import httpx
+
+    latencies, failures = [], 0
+    queue = iter(requests)
+
+    async def client():
+        nonlocal failures
+        async with httpx.AsyncClient(base_url=base_url, timeout=30) as http:
+            for body in queue:
+                start = time.perf_counter()
+                response = await http.post("/api/v1/predict", json=body)
+                if response.status_code != 200:
+                    failures += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    wall = time.perf_counter() - start
+    ms = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "failures": failures,
+        "rps": len(latencies) / wall,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p99_ms": float(np.percentile(ms, 99)),
+    }
+
+
+def cache_metrics(base_url: str) -> dict:
+    import httpx
+
+    return httpx.get(f"{base_url}/api/v1/predict/metrics").json()["prediction_cache"]
+
+
+def cpu_seconds(pid: int) -> float:
+    """
+    utime + stime of a process (Linux), the server's share of a shared CPU
+    """
+    fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def count_predictions(db_path: Path) -> int:
+    with sqlite3.connect(db_path) as connection:
+        return connection.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+
+async def run(cache: bool, requests: list, clients: int, tmp: Path) -> dict:
+    db_path = tmp / f"cache_{cache}.db"
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{db_path}",
+        FEATURE_STORE_SNAPSHOT_PATH="",
+        INGEST_ENABLED="false",
+        PREDICT_CACHE_ENABLED=str(cache).lower(),
+    )
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = start_server(port, env)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        # Warm-up on other tx hashes (native trees, connection pools, DB file)
+        await load(base_url, make_requests(WARMUP_REQUESTS, 1, seed=1), clients)
+        before = cache_metrics(base_url)
+        cpu_before = cpu_seconds(server.pid)
+
+        result = await load(base_url, requests, clients)
+        result["server_cpu_ms"] = (cpu_seconds(server.pid) - cpu_before) * 1000 / len(requests)
+        after = cache_metrics(base_url)
+        result["cache"] = {
+            name: after[name] - before[name] for name in ("hits", "misses", "coalesced")
+        }
+    finally:
+        server.terminate()
+        server.wait()
+    # Buffered writes are flushed on shutdown
+    result["rows"] = count_predictions(db_path) - WARMUP_REQUESTS
+    return result
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--unique", type=int, default=2_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--clients", type=int, default=16)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("  DeFi Risk Engine - Prediction Cache Benchmark")
+    print("=" * 60 + "\n")
+
+    requests = make_requests(args.unique, args.repeats)
+    print(f"📦 {args.unique:,} transactions x {args.repeats} submissions, "
+          f"{args.clients} clients\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for cache in (False, True):
+            result = await run(cache, requests, args.clients, Path(tmp))
+            stats = result["cache"]
+            lookups = stats["hits"] + stats["misses"]
+            hit_rate = (stats["hits"] + stats["coalesced"]) / lookups if lookups else 0.0
+            print(f"   cache {'on ' if cache else 'off'}  {result['requests']:6,} req  "
+                  f"{result['failures']} failed  {result['rps']:6.0f} req/s  "
+                  f"p50 {result['p50_ms']:5.1f} ms  p99 {result['p99_ms']:6.1f} ms  "
+                  f"server CPU {result['server_cpu_ms']:4.2f} ms/req  "
+                  f"rows {result['rows']:6,}  hit rate {hit_rate:.0%} "
+                  f"({stats['hits']:,} hits, {stats['coalesced']:,} coalesced)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
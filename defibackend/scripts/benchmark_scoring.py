@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Scoring Benchmark
+Turning raw scores into PredictResponses for batches of 100 / 10k / 1M:
+old per-score Python loop vs ScoringService.score_batch, plus analyze_batch
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("ETHERSCAN_API_KEY", "benchmark")
+
+from app.schemas.models import PredictResponse
+from app.services.scoring import ScoringService
+
+
+def old_predictions(scoring: ScoringService, risk_scores: list) -> list:
+    """
+    What predict_batch used to do: three scalar calls + a validated model per score
+    """
+    return [
+        PredictResponse(
+            risk_score=risk_score,
+            risk_level=scoring.classify_risk_level(risk_score),
+            is_alert=scoring.should_alert(risk_score),
+            threshold=scoring.alert_threshold(),
+            confidence=float(np.clip(0.5 + abs(risk_score - 0.5), 0, 1)),
+            timestamp=datetime.utcnow(),
+        )
+        for risk_score in risk_scores
+    ]
+
+
+def old_analyze(scoring: ScoringService, risk_scores: list) -> dict:
+    scores_array = np.array(risk_scores)
+    threshold = scoring.alert_threshold()
+    return {
+        "mean_risk": float(np.mean(scores_array)),
+        "median_risk": float(np.median(scores_array)),
+        "max_risk": float(np.max(scores_array)),
+        "min_risk": float(np.min(scores_array)),
+        "std_risk": float(np.std(scores_array)),
+        "alerts_count": sum(1 for score in risk_scores if score >= threshold),
+        "alert_rate": sum(1 for score in risk_scores if score >= threshold) / len(risk_scores),
+    }
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 1_000_000])
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("  DeFi Risk Engine - Scoring Benchmark")
+    print("=" * 60 + "\n")
+
+    scoring = ScoringService()
+    rng = np.random.default_rng(42)
+
+    print(f"   {'batch':>9s}   {'per-score loop':>14s}   {'score_batch':>11s}   "
+          f"{'+ responses':>11s}   {'analyze old':>11s}   {'analyze new':>11s}")
+    for size in args.sizes:
+        scores = rng.uniform(0.3, 1.0, size)
+        score_list = scores.tolist()
+
+        # Same decisions either way
+        old = old_predictions(scoring, score_list[:1000])
+        new = scoring.score_batch(scores[:1000]).to_responses()
+        assert [(p.risk_level, p.is_alert, p.confidence) for p in old] == \
+               [(p.risk_level, p.is_alert, p.confidence) for p in new]
+        old_stats, new_stats = old_analyze(scoring, score_list), scoring.analyze_batch(scores)
+        assert all(np.isclose(old_stats[k], new_stats[k]) for k in old_stats)
+
+        loop_s = timed(lambda: old_predictions(scoring, score_list))
+        arrays_s = timed(lambda: scoring.score_batch(scores))
+        edge_s = timed(lambda: scoring.score_batch(scores).to_responses())
+        old_analyze_s = timed(lambda: old_analyze(scoring, score_list))
+        new_analyze_s = timed(lambda: scoring.analyze_batch(scores))
+
+        print(f"   {size:>9,}   {loop_s * 1e3:11.2f} ms   {arrays_s * 1e3:8.2f} ms   "
+              f"{edge_s * 1e3:8.2f} ms   {old_analyze_s * 1e3:8.2f} ms   {new_analyze_s * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Serialization Benchmark
+Scores -> response bytes for /predict/batch and /predict:
+pydantic models + FastAPI response_model (what the endpoints did)
+vs app.api.encoding (PREDICT_FAST_JSON)
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("ETHERSCAN_API_KEY", "benchmark")
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api import encoding
+from app.schemas.models import BatchPredictResponse, PredictResponse
+from app.services.scoring import ScoringService
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 1_000, 10_000])
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("  DeFi Risk Engine - Serialization Benchmark")
+    print("=" * 60 + "\n")
+    print(f"   JSON library: {'orjson' if encoding.orjson is not None else 'json (orjson not installed)'}\n")
+
+    scoring = ScoringService()
+    batch_field = create_response_field("response", BatchPredictResponse)
+    single_field = create_response_field("response", PredictResponse)
+    rng = np.random.default_rng(42)
+
+    def render(field, content) -> bytes:
+        # What FastAPI does with a response_model: validate, dump, JSONResponse
+        data = asyncio.run(serialize_response(field=field, response_content=content))
+        return JSONResponse(data).body
+
+    print(f"   {'batch':>7s}   {'pydantic + response_model':>26s}   {'fast JSON':>16s}   {'speedup':>7s}")
+    for size in args.sizes:
+        scores = rng.uniform(0.3, 1.0, size)
+        batch = scoring.score_batch(scores)
+        timestamp = datetime.utcnow()
+
+        def current():
+            predictions = batch.to_responses()
+            if size == 1:
+                return render(single_field, predictions[0])
+            return render(batch_field, BatchPredictResponse(
+                predictions=predictions,
+                total_processed=len(predictions),
+                alerts_triggered=batch.alerts_count,
+                processing_time_ms=1.0,
+            ))
+
+        def fast():
+            if size == 1:
+                return encoding.encode_prediction(batch.to_responses()[0])
+            return encoding.encode_batch_response(batch, timestamp, 1.0)
+
+        # Same document (timestamps aside)
+        a, b = json.loads(current()), json.loads(fast())
+        for doc in (a, b):
+            for row in doc.get("predictions", [doc]):
+                row.pop("timestamp")
+        assert a == b
+
+        repeat = max(3, min(200, 20_000 // size))
+        current_s = best_of(current, repeat)
+        fast_s = best_of(fast, repeat)
+        print(f"   {size:>7,}   {current_s * 1e3:23.3f} ms   {fast_s * 1e3:13.3f} ms   {current_s / fast_s:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
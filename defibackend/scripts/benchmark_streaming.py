@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Streaming Benchmark
+Pushes the same transactions through /predict/batch (100 per request),
+one chunked NDJSON stream and one WebSocket against a local uvicorn server
+Requires trained models (see scripts/train_model.py)
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import subprocess
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+BATCH_LIMIT = 100  # BatchPredictRequest max_length
+CHUNK_LINES = 500  # NDJSON lines per upload chunk / WebSocket frame
+
+
+def make_records(n: int, seed: int = 7) -> list:
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "amount_usd": float(rng.lognormal(8, 2)),
+            "tx_count_user": int(rng.poisson(50)),
+            "rolling_volume_user": float(rng.lognormal(10, 1.5)),
+            "relative_amount": float(rng.lognormal(0, 1)),
+        }
+        for _ in range(n)
+    ]
+
+
+def start_server(port: int, env: dict) -> subprocess.Popen:
+    """
+    uvicorn in its own process so client and server don't share a GIL
+    """
+    import httpx
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=Path(__file__).resolve().parent.parent,
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    for _ in range(600):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/api/v1/health")
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("server did not start")
+
+
+async def run_batch(base_url: str, records: list) -> int:
+    import httpx
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        scored = 0
+        for i in range(0, len(records), BATCH_LIMIT):
+            response = await client.post(
+                "/api/v1/predict/batch",
+                json={"transactions": records[i:i + BATCH_LIMIT]},
+            )
+            scored += response.json()["total_processed"]
+        return scored
+
+
+async def run_ndjson(base_url: str, records: list) -> int:
+    import httpx
+
+    async def body():
+        for i in range(0, len(records), CHUNK_LINES):
+            yield "".join(
+                json.dumps(r) + "\n" for r in records[i:i + CHUNK_LINES]
+            ).encode()
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        scored = 0
+        async with client.stream(
+            "POST", "/api/v1/predict/stream", content=body(),
+            headers={"content-type": "application/x-ndjson"},
+        ) as response:
+            async for line in response.aiter_lines():
+                if line:
+                    scored += 1
+        return scored
+
+
+async def run_websocket(ws_url: str, records: list) -> int:
+    import websockets
+
+    async with websockets.connect(ws_url, max_size=None) as ws:
+        async def send():
+            for i in range(0, len(records), CHUNK_LINES):
+                await ws.send("\n".join(json.dumps(r) for r in records[i:i + CHUNK_LINES]))
+            await ws.send("")
+
+        sender = asyncio.ensure_future(send())
+        scored = 0
+        async for frame in ws:
+            scored += frame.count("\n")
+        await sender
+        return scored
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("  DeFi Risk Engine - Streaming Benchmark")
+    print("=" * 60 + "\n")
+
+    tmp = tempfile.mkdtemp()
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{tmp}/stream_bench.db",
+        FEATURE_STORE_SNAPSHOT_PATH="",
+    )
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = start_server(port, env)
+    base_url = f"http://127.0.0.1:{port}"
+
+    records = make_records(args.records)
+    print(f"📦 {len(records):,} transactions\n")
+
+    runs = [
+        ("batch (100/req)", lambda: run_batch(base_url, records)),
+        ("NDJSON stream", lambda: run_ndjson(base_url, records)),
+        ("WebSocket", lambda: run_websocket(f"ws://127.0.0.1:{port}/api/v1/predict/stream", records)),
+    ]
+    for name, run in runs:
+        start = time.perf_counter()
+        scored = await run()
+        elapsed = time.perf_counter() - start
+        print(f"   {name:16s} {scored:8,} scored  {elapsed:6.2f} s  "
+              f"{scored / elapsed:10,.0f} tx/s")
+
+    server.terminate()
+    server.wait()
+    shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
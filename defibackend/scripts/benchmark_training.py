@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Training Benchmark
+Wall time and peak RSS of fitting the model on N rows of .npy shards:
+everything loaded + IsolationForest.fit vs the streaming pipeline in
+train_model.py, each in a fresh process. Both models score the same
+holdout, to check the streamed one flags the same transactions
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+os.environ.setdefault("ETHERSCAN_API_KEY", "benchmark")
+
+from train_model import synthetic_chunks
+
+SHARD_ROWS = 1_000_000
+
+# One fit per process, so ru_maxrss is that fit's peak
+WORKER = """
+import json, os, resource, sys, time
+sys.path.insert(0, "scripts")
+import numpy as np
+from train_model import fit_streaming, npy_chunks
+
+shards, holdout = json.loads(os.environ["SHARDS"]), np.load(os.environ["HOLDOUT"])
+start = time.perf_counter()
+if os.environ["MODE"] == "in-memory":
+    from sklearn.ensemble import IsolationForest
+    from sklearn.preprocessing import StandardScaler
+    X = np.concatenate([np.load(path) for path in shards])
+    scaler = StandardScaler()
+    model = IsolationForest(n_estimators=100, contamination=0.1, random_state=42, n_jobs=-1)
+    model.fit(scaler.fit_transform(X))
+else:
+    model, scaler, _, _ = fit_streaming(npy_chunks(shards, int(os.environ["CHUNK_ROWS"])))
+wall = time.perf_counter() - start
+
+X_holdout = scaler.transform(holdout)
+np.save(os.environ["OUTPUT"], np.stack([-model.score_samples(X_holdout), model.predict(X_holdout)]))
+print(json.dumps({
+    "wall_s": wall,
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}), flush=True)
+"""
+
+
+def write_shards(directory: Path, rows: int) -> list:
+    paths = []
+    for i, chunk in enumerate(synthetic_chunks(rows, SHARD_ROWS, seed=1)):
+        path = directory / f"shard-{i:04d}.npy"
+        np.save(path, chunk)
+        paths.append(str(path))
+    return paths
+
+
+def run(mode: str, shards: list, holdout: Path, output: Path, chunk_rows: int) -> dict:
+    env = dict(
+        os.environ,
+        PYTHONPATH=str(ROOT),
+        MODE=mode,
+        SHARDS=json.dumps(shards),
+        HOLDOUT=str(holdout),
+        OUTPUT=str(output),
+        CHUNK_ROWS=str(chunk_rows),
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", WORKER],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        # Typically the OOM killer on the in-memory fit
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip()
+                else f"exit code {result.returncode}"}
+    for line in result.stdout.splitlines():
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError("worker exited before reporting")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000, 50_000_000])
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("  DeFi Risk Engine - Training Benchmark")
+    print("=" * 60 + "\n")
+    print(f"   {os.cpu_count()} CPU(s), 100 trees, {args.chunk_rows:,}-row chunks\n")
+
+    print(f"   {'rows':>12s}  {'pipeline':10s} {'wall':>9s} {'peak RSS':>10s}  "
+          f"{'holdout: score corr':>20s} {'same decision':>14s}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        holdout = tmp / "holdout.npy"
+        np.save(holdout, next(synthetic_chunks(100_000, 100_000, seed=7)))
+
+        for rows in args.rows:
+            shard_dir = tmp / f"rows-{rows}"
+            shard_dir.mkdir()
+            shards = write_shards(shard_dir, rows)
+
+            outputs = {}
+            for mode in ("in-memory", "streaming"):
+                output = tmp / f"{mode}.npy"
+                result = run(mode, shards, holdout, output, args.chunk_rows)
+                if "error" in result:
+                    print(f"   {rows:>12,}  {mode:10s} failed: {result['error']}")
+                    continue
+                outputs[mode] = np.load(output)
+
+                comparison = ""
+                if mode == "streaming" and "in-memory" in outputs:
+                    reference, streamed = outputs["in-memory"], outputs["streaming"]
+                    correlation = np.corrcoef(reference[0], streamed[0])[0, 1]
+                    agreement = (reference[1] == streamed[1]).mean()
+                    comparison = f"{correlation:20.4f} {agreement:13.1%}"
+                print(f"   {rows:>12,}  {mode:10s} {result['wall_s']:7.1f} s "
+                      f"{result['peak_rss_mb']:7.0f} MB  {comparison}")
+
+            for path in shards:
+                os.remove(path)
+            print()
+
+
+if __name__ == "__main__":
+    main()
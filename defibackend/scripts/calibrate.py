@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Calibrate
+Builds the score -> percentile calibration table from stored prediction
+history and writes it next to the model artifacts; running servers
+hot-swap it on their next reload poll
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.db.database import DatabaseService
+from app.ml.model_loader import CALIBRATION_PATH, REGISTRY_DIR
+from app.ml.registry import ModelRegistry
+from app.services.calibration import CalibrationTable
+from config.settings import settings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=1_000_000, help="Most recent predictions to use")
+    parser.add_argument("--knots", type=int, default=settings.CALIBRATION_KNOTS)
+    parser.add_argument("--output", default=str(CALIBRATION_PATH))
+    parser.add_argument("--model-version", default=None, help="Default: the serving model")
+    args = parser.parse_args()
+
+    # Calibrate the serving model (registry CURRENT when there is one)
+    # on its own scores only
+    model_version = args.model_version or (
+        ModelRegistry(REGISTRY_DIR).current() or settings.MODEL_VERSION
+    )
+
+    db_service = DatabaseService()
+    print(f"📥 Loading up to {args.limit:,} stored risk scores of model {model_version}...")
+    scores = db_service.load_risk_scores(args.limit, model_version)
+    db_service.close()
+
+    if len(scores) < settings.CALIBRATION_MIN_SAMPLES:
+        print(f"❌ Only {len(scores)} predictions of model {model_version} stored, "
+              f"need {settings.CALIBRATION_MIN_SAMPLES} to calibrate")
+        sys.exit(1)
+
+    table = CalibrationTable.from_scores(scores, args.knots, model_version)
+    table.save(args.output)
+
+    print(f"   {json.dumps(table.get_info(), indent=2)}")
+    for percentile in (settings.RISK_MEDIUM_PERCENTILE,
+                       settings.RISK_THRESHOLD_PERCENTILE,
+                       settings.RISK_CRITICAL_PERCENTILE):
+        print(f"   p{percentile:<5} -> score {table.score_at(percentile):.4f}")
+    print(f"✅ Calibration table saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Mock Etherscan
+Local stand-in for the Etherscan account txlist API, for testing and benchmarks
+Deterministic per-wallet histories that keep growing, simulated latency
+and Etherscan-style rate limiting
+    python scripts/mock_etherscan.py --port 8900 --latency-ms 150 --rate-limit 5
+    ETHERSCAN_URL=http://127.0.0.1:8900/api uvicorn main:app
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+
+from fastapi import FastAPI, Request, Response
+
+FIRST_BLOCK = 5_000_000
+
+
+def create_app(
+    history: int = 5_000,
+    new_tx_interval: float = 1.0,
+    latency_ms: float = 150.0,
+    rate_limit: float = 5.0,
+) -> FastAPI:
+    """
+    history          transactions every wallet starts with
+    new_tx_interval  every wallet gains one transaction this often (seconds)
+    rate_limit       requests per second before "Max rate limit reached" (0 = off)
+    """
+    app = FastAPI(title="Mock Etherscan")
+    started = time.monotonic()
+    stats = {"requests": 0, "rate_limited": 0, "transactions_sent": 0, "bytes_sent": 0}
+    window = {"second": 0, "count": 0}
+
+    def wallet_tx(address: str, i: int) -> dict:
+        digest = hashlib.sha256(f"{address}:{i}".encode()).hexdigest()
+        return {
+            "blockNumber": str(FIRST_BLOCK + i * 2),
+            "timeStamp": str(1_700_000_000 + i * 24),
+            "hash": "0x" + digest,
+            "from": address,
+            "to": "0x" + digest[:40],
+            "value": str(int(digest[:12], 16) * 10 ** 6),
+            "gas": "21000",
+            "gasPrice": str(int(digest[12:16], 16) * 10 ** 7),
+            "isError": "1" if digest[16] == "f" else "0",
+            "input": "0x",
+        }
+
+    def envelope(status: str, message: str, result) -> Response:
+        body = json.dumps({"status": status, "message": message, "result": result})
+        stats["bytes_sent"] += len(body)
+        return Response(body, media_type="application/json")
+
+    @app.get("/api")
+    async def api(request: Request):
+        q = request.query_params
+        stats["requests"] += 1
+
+        if rate_limit > 0:
+            second = int(time.monotonic())
+            if window["second"] != second:
+                window.update(second=second, count=0)
+            window["count"] += 1
+            if window["count"] > rate_limit:
+                stats["rate_limited"] += 1
+                return envelope("0", "NOTOK", "Max rate limit reached")
+
+        await asyncio.sleep(latency_ms / 1000)
+
+        if q.get("module") != "account" or q.get("action") != "txlist":
+            return envelope("0", "NOTOK", "Error! Invalid action")
+
+        address = q.get("address", "").lower()
+        total = history + int((time.monotonic() - started) / new_tx_interval)
+        start_block = int(q.get("startblock", 0))
+        end_block = int(q.get("endblock", 99_999_999))
+
+        # Transactions in [start_block, end_block], newest first
+        first = max(0, -(-(start_block - FIRST_BLOCK) // 2))
+        last = min(total - 1, (end_block - FIRST_BLOCK) // 2)
+        indices = range(last, first - 1, -1)
+        if q.get("sort", "asc") == "asc":
+            indices = indices[::-1]
+
+        offset = int(q.get("offset", 0))
+        if offset > 0:
+            page = int(q.get("page", 1))
+            indices = indices[(page - 1) * offset: page * offset]
+
+        result = [wallet_tx(address, i) for i in indices]
+        stats["transactions_sent"] += len(result)
+        if not result:
+            return envelope("0", "No transactions found", [])
+        return envelope("1", "OK", result)
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--history", type=int, default=5_000)
+    parser.add_argument("--new-tx-interval", type=float, default=1.0)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--rate-limit", type=float, default=5.0)
+    args = parser.parse_args()
+
+    app = create_app(args.history, args.new_tx_interval, args.latency_ms, args.rate_limit)
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
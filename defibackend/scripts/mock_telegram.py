@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Mock Telegram Bot API
+Local stand-in for sendMessage, for testing and benchmarks
+Simulated latency and Telegram-style flood limits (429 + retry_after)
+    python scripts/mock_telegram.py --port 8901
+    TELEGRAM_API_URL=http://127.0.0.1:8901 uvicorn main:app
+"""
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import deque
+
+from fastapi import FastAPI, Request, Response
+
+# Telegram tolerates a little jitter around 1 message/s per chat
+CHAT_INTERVAL_SLACK = 0.9
+
+
+def create_app(
+    latency_ms: float = 50.0,
+    global_rate: float = 30.0,
+    chat_rate: float = 1.0,
+) -> FastAPI:
+    """
+    global_rate  messages per second per bot before 429 (0 = off)
+    chat_rate    messages per second per chat before 429 (0 = off)
+    """
+    app = FastAPI(title="Mock Telegram Bot API")
+    stats = {"requests": 0, "messages": 0, "rate_limited": 0, "connections": 0}
+    recent = deque()
+    last_by_chat = {}
+    messages_by_chat = {}
+    peers = set()
+
+    def too_many(retry_after: float) -> Response:
+        stats["rate_limited"] += 1
+        retry_after = max(1, math.ceil(retry_after))
+        body = {
+            "ok": False,
+            "error_code": 429,
+            "description": f"Too Many Requests: retry after {retry_after}",
+            "parameters": {"retry_after": retry_after},
+        }
+        return Response(json.dumps(body), status_code=429, media_type="application/json")
+
+    @app.post("/bot{token}/sendMessage")
+    async def send_message(token: str, request: Request):
+        stats["requests"] += 1
+        peer = (request.client.host, request.client.port)
+        if peer not in peers:
+            peers.add(peer)
+            stats["connections"] += 1
+
+        payload = await request.json()
+        chat_id = str(payload.get("chat_id"))
+        now = time.monotonic()
+
+        if global_rate > 0:
+            while recent and now - recent[0] > 1.0:
+                recent.popleft()
+            if len(recent) >= global_rate:
+                return too_many(1.0 - (now - recent[0]))
+
+        if chat_rate > 0 and chat_id in last_by_chat:
+            since = now - last_by_chat[chat_id]
+            if since < CHAT_INTERVAL_SLACK / chat_rate:
+                return too_many(1.0 / chat_rate - since)
+
+        recent.append(now)
+        last_by_chat[chat_id] = now
+        await asyncio.sleep(latency_ms / 1000)
+
+        stats["messages"] += 1
+        messages_by_chat.setdefault(chat_id, []).append(payload.get("text", ""))
+        body = {"ok": True, "result": {"message_id": stats["messages"], "chat": {"id": chat_id}}}
+        return Response(json.dumps(body), media_type="application/json")
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    @app.get("/messages/{chat_id}")
+    async def get_messages(chat_id: str):
+        return messages_by_chat.get(chat_id, [])
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--global-rate", type=float, default=30.0)
+    parser.add_argument("--chat-rate", type=float, default=1.0)
+    args = parser.parse_args()
+
+    app = create_app(args.latency_ms, args.global_rate, args.chat_rate)
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Model Registry
+Publish trained models as versions, pick the one serving traffic and the
+one scored in shadow; running servers follow within MODEL_REGISTRY_POLL_SECONDS
+
+    python scripts/model_registry.py publish v2            # from app/models/*.pkl
+    python scripts/model_registry.py shadow v2             # compare on live traffic
+    python scripts/model_registry.py activate v2           # serve it
+    python scripts/model_registry.py shadow --off
+    python scripts/model_registry.py list
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("ETHERSCAN_API_KEY", "registry")
+
+from app.ml.artifact import ModelArtifact
+from app.ml.compiled_forest import CompiledForest
+from app.ml.model_loader import FEATURE_SCHEMA, MODEL_PATH, REGISTRY_DIR, SCALER_PATH, ModelLoader
+from app.ml.registry import ModelRegistry
+
+
+def load_engine(args) -> CompiledForest:
+    if args.artifact:
+        return ModelArtifact(args.artifact, FEATURE_SCHEMA).engine
+
+    import joblib
+
+    ModelLoader.check_pickle_schema()
+    return CompiledForest.from_sklearn(joblib.load(MODEL_PATH), joblib.load(SCALER_PATH))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--registry", default=str(REGISTRY_DIR))
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    publish = commands.add_parser("publish", help="Store the trained model as a new version")
+    publish.add_argument("version")
+    publish.add_argument("--artifact", help="Exported artifact directory (default: the pickles)")
+    publish.add_argument("--activate", action="store_true")
+
+    activate = commands.add_parser("activate", help="Serve a version")
+    activate.add_argument("version")
+
+    shadow = commands.add_parser("shadow", help="Score a sample of traffic with a version")
+    shadow.add_argument("version", nargs="?")
+    shadow.add_argument("--off", action="store_true")
+
+    commands.add_parser("list")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.registry)
+    try:
+        run(args, parser, registry)
+    except (KeyError, ValueError) as e:
+        sys.exit(f"❌ {e.args[0]}")
+
+
+def run(args, parser, registry: ModelRegistry):
+    if args.command == "publish":
+        path = registry.publish(args.version, load_engine(args), FEATURE_SCHEMA)
+        print(f"✅ Published {args.version} -> {path}")
+        if args.activate:
+            registry.activate(args.version)
+            print(f"✅ {args.version} is now CURRENT")
+    elif args.command == "activate":
+        registry.activate(args.version)
+        print(f"✅ {args.version} is now CURRENT")
+    elif args.command == "shadow":
+        if args.off == bool(args.version):
+            parser.error("shadow takes a version or --off")
+        registry.set_candidate(None if args.off else args.version)
+        print("✅ Shadow scoring off" if args.off else f"✅ {args.version} is now CANDIDATE")
+
+    print(json.dumps(registry.versions(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Reconcile Stats
+Rebuilds the maintained /alerts/stats aggregates from the raw
+predictions and alerts tables (e.g. after manual DB edits or imports)
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.db.database import DatabaseService
+
+
+def main():
+    db_service = DatabaseService()
+
+    print("🔄 Rebuilding statistics from raw tables...")
+    before = db_service.get_statistics()
+    after = db_service.reconcile_statistics()
+    db_service.close()
+
+    print(f"   Before: {json.dumps(before, indent=2)}")
+    print(f"   After:  {json.dumps(after, indent=2)}")
+    print("✅ Statistics reconciled")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,109 +1,419 @@
 #!/usr/bin/env python3
 """
-Mock Model Training Script
-Creates dummy trained models for demo purposes
-In production, this would be a separate training pipeline
+Model Training Script
+Streams training rows in chunks (synthetic, the predictions table, or
+.npy / Parquet shards) so history larger than RAM can be used:
+    - StandardScaler fitted incrementally (partial_fit)
+    - One reservoir sample of max_samples rows per tree, same single pass
+    - Trees built in parallel from their samples
+Columns are always model_loader.FEATURE_SCHEMA, saved with the model
 """
+import argparse
+import glob
+import os
+import resource
+import sys
+import time
 import numpy as np
 import joblib
+from joblib import Parallel, delayed
 from sklearn.ensemble import IsolationForest
+from sklearn.ensemble._iforest import _average_path_length
 from sklearn.preprocessing import StandardScaler
+from sklearn.tree import ExtraTreeRegressor
 from pathlib import Path
+from typing import Iterable, Iterator, List
 
-def create_mock_training_data():
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("ETHERSCAN_API_KEY", "training")
+
+from app.ml.artifact import ModelArtifact, export_artifact
+from app.ml.compiled_forest import CompiledForest
+from app.ml.model_loader import (
+    ARTIFACT_DIR,
+    FEATURE_SCHEMA,
+    FEATURE_SCHEMA_PATH,
+    FEATURES,
+    MODEL_DIR,
+    MODEL_PATH,
+    SCALER_PATH,
+    ModelLoader,
+)
+
+SOURCES = ("synthetic", "db", "npy", "parquet")
+
+# Rows kept (uniformly) to set the contamination offset and report scores
+VALIDATION_ROWS = 100_000
+
+
+# ----------------------------
+# SOURCES
+# ----------------------------
+
+def synthetic_chunks(rows: int, chunk_rows: int, seed: int = 42) -> Iterator[np.ndarray]:
     """
-    Create synthetic training data mimicking normal DeFi behavior
+    Synthetic data mimicking normal DeFi behavior, 10% anomalies
     """
-    np.random.seed(42)
-    
-    # Normal transactions (90% of data)
-    n_normal = 900
-    normal_data = np.column_stack([
-        np.random.lognormal(8, 2, n_normal),  # amount_usd: $3k-$30k typical
-        np.random.binomial(1, 0.1, n_normal),  # whale_tx: 10% are whales
-        np.random.poisson(50, n_normal),  # tx_count_user: ~50 transactions
-        np.random.lognormal(10, 1.5, n_normal)  # rolling_volume: normal activity
-    ])
-    
-    # Anomalous transactions (10% of data)
-    n_anomaly = 100
-    anomaly_data = np.column_stack([
-        np.random.lognormal(13, 1, n_anomaly),  # amount_usd: $400k+ (whales)
-        np.random.binomial(1, 0.9, n_anomaly),  # whale_tx: 90% are whales
-        np.random.poisson(5, n_anomaly),  # tx_count_user: very few txs (new wallet)
-        np.random.lognormal(14, 1, n_anomaly)  # rolling_volume: huge volume spike
-    ])
-    
-    # Combine
-    X = np.vstack([normal_data, anomaly_data])
-    
-    return X
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - start)
+        anomaly = rng.random(n) < 0.1
+
+        columns = {
+            # Normal: $3k-$30k typical / anomalous: $400k+ (whales)
+            "amount_usd": np.where(anomaly, rng.lognormal(13, 1, n), rng.lognormal(8, 2, n)),
+            # ~50 transactions / very few txs (new wallet)
+            "tx_count_user": np.where(anomaly, rng.poisson(5, n), rng.poisson(50, n)),
+            # Normal activity / huge volume spike
+            "rolling_volume_user": np.where(anomaly, rng.lognormal(14, 1, n), rng.lognormal(10, 1.5, n)),
+            # Around the wallet's usual size / far above it
+            "relative_amount": np.where(anomaly, rng.lognormal(3, 1, n), rng.lognormal(0, 0.5, n)),
+        }
+        yield FEATURE_SCHEMA.from_columns(columns)
 
-def train_model():
+
+def database_chunks(chunk_rows: int, limit: int = None) -> Iterator[np.ndarray]:
     """
-    Train Isolation Forest model
+    Stored predictions (DATABASE_URL), keyset scan - one chunk in memory
+    """
+    from app.db.database import DatabaseService
+
+    db_service = DatabaseService()
+    try:
+        yield from db_service.iter_feature_rows(FEATURES, chunk_rows, limit)
+    finally:
+        db_service.close()
+
+
+def npy_chunks(paths: List[str], chunk_rows: int) -> Iterator[np.ndarray]:
+    """
+    (rows, len(FEATURES)) .npy shards, memory-mapped and read chunk by chunk
+    """
+    for path in paths:
+        shard = np.load(path, mmap_mode="r")
+        if shard.ndim != 2 or shard.shape[1] != len(FEATURES):
+            raise ValueError(
+                f"{path}: expected (rows, {len(FEATURES)}) in FEATURES order "
+                f"{FEATURES}, got {shard.shape}"
+            )
+        for start in range(0, len(shard), chunk_rows):
+            yield np.array(shard[start:start + chunk_rows], dtype=np.float64)
+
+
+def parquet_chunks(paths: List[str], chunk_rows: int) -> Iterator[np.ndarray]:
+    """
+    Parquet shards, feature columns read by name (any column order / extra columns)
+    Rows with nulls are skipped
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        sys.exit("❌ Parquet shards need pyarrow (pip install pyarrow)")
+
+    for path in paths:
+        parquet = pq.ParquetFile(path)
+        missing = [name for name in FEATURES if name not in parquet.schema_arrow.names]
+        if missing:
+            raise ValueError(f"{path}: missing feature columns {missing}")
+
+        for batch in parquet.iter_batches(batch_size=chunk_rows, columns=FEATURES):
+            chunk = FEATURE_SCHEMA.from_columns({
+                name: batch.column(name).to_numpy(zero_copy_only=False) for name in FEATURES
+            })
+            yield chunk[~np.isnan(chunk).any(axis=1)]
+
+
+def expand_paths(patterns: List[str]) -> List[str]:
+    paths = sorted(path for pattern in patterns for path in glob.glob(pattern))
+    if not paths:
+        sys.exit(f"❌ No shards match {patterns}")
+    return paths
+
+
+def open_source(args) -> Iterable[np.ndarray]:
+    if args.source == "synthetic":
+        return synthetic_chunks(args.rows, args.chunk_rows, args.seed)
+    if args.source == "db":
+        return database_chunks(args.chunk_rows, args.rows)
+    if args.source == "npy":
+        return npy_chunks(expand_paths(args.path), args.chunk_rows)
+    return parquet_chunks(expand_paths(args.path), args.chunk_rows)
+
+
+# ----------------------------
+# STREAMING FIT
+# ----------------------------
+
+class Reservoirs:
+    """
+    `n` independent uniform samples of up to `size` rows from one stream
+
+    Li's Algorithm L: each reservoir draws how many rows to skip before its
+    next replacement, so after the first `size` rows the cost is per
+    replacement (~size * ln(rows / size) in total), not per row. Skips are
+    generated in blocks for all reservoirs at once and applied with one
+    scatter per block.
+    """
+
+    # Most replacements generated per reservoir and block
+    MAX_BLOCK = 1024
+
+    def __init__(self, n: int, size: int, n_features: int, rng: np.random.Generator):
+        self.size = size
+        self.rng = rng
+        self.samples = np.empty((n, size, n_features))
+        self.seen = 0
+        # Per reservoir: weight W and stream position of the next replacement
+        self._weight = None
+        self._next = None
+
+    def _skips(self, weight: np.ndarray) -> np.ndarray:
+        u = self.rng.random(weight.shape)
+        skip = np.floor(np.log(u) / np.log1p(-weight)) + 1
+        return np.minimum(skip, 2 ** 40).astype(np.int64)
+
+    def add(self, chunk: np.ndarray):
+        start = self.seen
+        self.seen += len(chunk)
+
+        if start < self.size:
+            # Filling: every reservoir takes the first `size` rows
+            take = min(self.size - start, len(chunk))
+            self.samples[:, start:start + take] = chunk[:take]
+            if start + take < self.size:
+                return
+            n = len(self.samples)
+            self._weight = np.exp(np.log(self.rng.random(n)) / self.size)
+            self._next = self.size - 1 + self._skips(self._weight)
+
+        # Expected replacements per reservoir in this chunk: size * ln(end / start)
+        expected = self.size * np.log(self.seen / max(start, self.size))
+        block = int(min(self.MAX_BLOCK, 16 + 2 * expected))
+        while True:
+            due = np.flatnonzero(self._next < self.seen)
+            if len(due) == 0:
+                return
+            self._replace_block(due, chunk, start, block)
+
+    def _replace_block(self, due: np.ndarray, chunk: np.ndarray, start: int, block: int):
+        """
+        Up to `block` replacements for each due reservoir, in stream order
+        """
+        # weights[:, j] = W after j + 1 replacements
+        steps = np.exp(np.log(self.rng.random((len(due), block))) / self.size)
+        weights = self._weight[due, None] * np.cumprod(steps, axis=1)
+        offsets = np.cumsum(self._skips(weights), axis=1)
+
+        # positions[:, j] = row replaced by the j-th event
+        positions = self._next[due, None] + np.concatenate(
+            [np.zeros((len(due), 1), dtype=np.int64), offsets[:, :-1]], axis=1
+        )
+        applied = positions < self.seen
+        counts = applied.sum(axis=1)
+
+        # Later replacements of the same slot win: keep the last one per slot
+        slots = self.rng.integers(0, self.size, positions.shape)
+        flat = (due[:, None] * self.size + slots)[applied][::-1]
+        rows = (positions[applied] - start)[::-1]
+        flat, last = np.unique(flat, return_index=True)
+        self.samples.reshape(-1, self.samples.shape[2])[flat] = chunk[rows[last]]
+
+        # Resume at the first event past this chunk (or after the block)
+        done = counts == block
+        pending = np.minimum(counts, block - 1)[:, None]
+        self._next[due] = np.where(
+            done,
+            self._next[due] + offsets[:, -1],
+            np.take_along_axis(positions, pending, axis=1)[:, 0],
+        )
+        previous = np.take_along_axis(weights, np.maximum(pending - 1, 0), axis=1)[:, 0]
+        self._weight[due] = np.where(
+            done, weights[:, -1], np.where(counts == 0, self._weight[due], previous)
+        )
+
+    def sample(self, i: int) -> np.ndarray:
+        return self.samples[i, :min(self.seen, self.size)]
+
+
+def fit_tree(X: np.ndarray, max_depth: int, seed: int) -> ExtraTreeRegressor:
+    """
+    One isolation tree, as IsolationForest builds it on its subsample
     """
-    print("🔬 Generating synthetic training data...")
-    X = create_mock_training_data()
-    
-    print(f"📊 Training set size: {X.shape[0]} samples, {X.shape[1]} features")
-    
-    # Step 1: Fit scaler
-    print("⚙️ Fitting StandardScaler...")
+    tree = ExtraTreeRegressor(
+        max_features=1, splitter="random", max_depth=max_depth, random_state=seed
+    )
+    tree.fit(X.astype(np.float32), np.random.default_rng(seed).uniform(size=len(X)))
+    return tree
+
+
+def fit_streaming(
+    chunks: Iterable[np.ndarray],
+    n_estimators: int = 100,
+    max_samples: int = 256,
+    contamination: float = 0.1,
+    n_jobs: int = -1,
+    seed: int = 42,
+):
+    """
+    One pass over the chunks, then the trees in parallel
+    Returns a regular fitted IsolationForest + StandardScaler
+    """
+    rng = np.random.default_rng(seed)
+    n_features = len(FEATURES)
     scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
-    
-    # Step 2: Train Isolation Forest
-    print("🌲 Training Isolation Forest...")
+    trees = Reservoirs(n_estimators, max_samples, n_features, rng)
+    validation = Reservoirs(1, VALIDATION_ROWS, n_features, rng)
+
+    timings = {}
+    start = time.perf_counter()
+    n_chunks = 0
+    for chunk in chunks:
+        if len(chunk) == 0:
+            continue
+        scaler.partial_fit(chunk)
+        trees.add(chunk)
+        validation.add(chunk)
+        n_chunks += 1
+    timings["stream_s"] = time.perf_counter() - start
+
+    if trees.seen < 2:
+        raise ValueError(f"Need at least 2 training rows, got {trees.seen}")
+
+    # Same subsample size / depth limit as IsolationForest(max_samples=...)
+    subsample = min(max_samples, trees.seen)
+    max_depth = int(np.ceil(np.log2(max(subsample, 2))))
+    seeds = rng.integers(np.iinfo(np.int32).max, size=n_estimators)
+
+    start = time.perf_counter()
+    estimators = Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(fit_tree)(scaler.transform(trees.sample(i)), max_depth, int(seeds[i]))
+        for i in range(n_estimators)
+    )
+    timings["trees_s"] = time.perf_counter() - start
+
     model = IsolationForest(
-        n_estimators=100,
-        contamination=0.1,  # Expect 10% anomalies
-        random_state=42,
-        max_samples='auto'
+        n_estimators=n_estimators,
+        max_samples=subsample,
+        contamination=contamination,
+        random_state=seed,
+    )
+    assemble_forest(model, estimators, seeds, subsample, n_features)
+
+    # Contamination offset from the validation sample (IsolationForest uses all rows)
+    X_validation = scaler.transform(validation.sample(0))
+    model.offset_ = np.percentile(model.score_samples(X_validation), 100.0 * contamination)
+
+    timings.update(rows=trees.seen, chunks=n_chunks)
+    return model, scaler, X_validation, timings
+
+
+def assemble_forest(model: IsolationForest, estimators: list, seeds, subsample: int, n_features: int):
+    """
+    Fitted attributes IsolationForest.fit() would set, for trees built outside it
+    """
+    model.estimator_ = ExtraTreeRegressor(
+        max_features=1, splitter="random", max_depth=estimators[0].max_depth
     )
-    model.fit(X_scaled)
-    
-    # Step 3: Validate
+    model.estimators_ = list(estimators)
+    model.estimators_features_ = [np.arange(n_features)] * len(estimators)
+    model._seeds = np.asarray(seeds)
+    model._n_samples = subsample
+    model._max_samples = subsample
+    model.max_samples_ = subsample
+    model._max_features = n_features
+    model.n_features_in_ = n_features
+    model._average_path_length_per_tree, model._decision_path_lengths = zip(*[
+        (_average_path_length(tree.tree_.n_node_samples), tree.tree_.compute_node_depths())
+        for tree in estimators
+    ])
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def train_model(args):
+    """
+    Train Isolation Forest model
+    """
+    print(f"🔬 Streaming training rows ({args.source}, {args.chunk_rows:,}-row chunks)...")
+    start = time.perf_counter()
+    model, scaler, X_validation, timings = fit_streaming(
+        open_source(args),
+        n_estimators=args.n_estimators,
+        max_samples=args.max_samples,
+        contamination=args.contamination,
+        n_jobs=args.jobs,
+        seed=args.seed,
+    )
+    timings["total_s"] = time.perf_counter() - start
+
+    print(f"📊 Training set size: {timings['rows']:,} samples in {timings['chunks']:,} chunks, "
+          f"{len(FEATURES)} features {FEATURES}")
+    print(f"⚙️ Scaler + {args.n_estimators} reservoirs of {model.max_samples_} rows: "
+          f"{timings['stream_s']:.2f} s")
+    print(f"🌲 {args.n_estimators} trees (jobs={args.jobs}): {timings['trees_s']:.2f} s")
+
+    # Validate
     print("✅ Model training complete")
-    scores = -model.score_samples(X_scaled)
-    print(f"   Mean anomaly score: {scores.mean():.3f}")
+    scores = -model.score_samples(X_validation)
+    print(f"   Mean anomaly score: {scores.mean():.3f} ({len(scores):,} sampled rows)")
     print(f"   Score range: [{scores.min():.3f}, {scores.max():.3f}]")
-    
+    print(f"   Wall time: {timings['total_s']:.2f} s, peak RSS: {peak_rss_mb():.0f} MB")
+
     return model, scaler
 
 def save_models(model, scaler):
     """
     Save trained models to disk
     """
-    models_dir = Path("models")
-    models_dir.mkdir(exist_ok=True)
-    
-    model_path = models_dir / "isolation_forest.pkl"
-    scaler_path = models_dir / "scaler.pkl"
-    
+    # Where ModelLoader reads them
+    MODEL_DIR.mkdir(exist_ok=True)
+
     print(f"\n💾 Saving models...")
-    joblib.dump(model, model_path)
-    joblib.dump(scaler, scaler_path)
-    
-    print(f"   ✅ Model saved to {model_path}")
-    print(f"   ✅ Scaler saved to {scaler_path}")
+    joblib.dump(model, MODEL_PATH)
+    joblib.dump(scaler, SCALER_PATH)
+    FEATURE_SCHEMA.save(FEATURE_SCHEMA_PATH)
+
+    print(f"   ✅ Model saved to {MODEL_PATH}")
+    print(f"   ✅ Scaler saved to {SCALER_PATH}")
+    print(f"   ✅ Feature schema saved to {FEATURE_SCHEMA_PATH} ({FEATURE_SCHEMA.fingerprint})")
+
+def export_model(model, scaler):
+    """
+    Write the compiled forest + scaler as flat arrays (mmap artifact)
+    Checked against sklearn before the manifest is trusted
+    """
+    engine = CompiledForest.from_sklearn(model, scaler)
+    manifest = export_artifact(engine, ARTIFACT_DIR, FEATURE_SCHEMA)
+
+    artifact = ModelArtifact(ARTIFACT_DIR, FEATURE_SCHEMA)
+    X = np.random.default_rng(0).lognormal(8, 2, (1000, model.n_features_in_))
+    expected = -model.score_samples(scaler.transform(X))
+    if not np.array_equal(artifact.engine.risk_scores(X), expected):
+        raise RuntimeError("Exported artifact does not reproduce the model's scores")
+
+    print(f"   ✅ Artifact exported to {manifest} "
+          f"({artifact.nbytes / 1024:.0f} KB, {artifact.fingerprint}, "
+          f"opens in {artifact.open_seconds * 1000:.2f} ms)")
 
 def test_model(model, scaler):
     """
     Test the trained model
     """
     print("\n🧪 Testing model...")
-    
-    # Normal transaction
-    normal_tx = np.array([[5000, 0, 50, 10000]])
+
+    # Normal transaction (FEATURES order)
+    normal_tx = np.array([[5000, 50, 10000, 1.0]])
     normal_scaled = scaler.transform(normal_tx)
     normal_score = -model.score_samples(normal_scaled)[0]
-    
+
     # Suspicious transaction
-    suspicious_tx = np.array([[5000000, 1, 2, 10000000]])
+    suspicious_tx = np.array([[5000000, 2, 10000000, 50.0]])
     suspicious_scaled = scaler.transform(suspicious_tx)
     suspicious_score = -model.score_samples(suspicious_scaled)[0]
-    
+
     print(f"   Normal TX score: {normal_score:.3f}")
     print(f"   Suspicious TX score: {suspicious_score:.3f}")
     print(f"   Ratio: {suspicious_score / normal_score:.2f}x")
@@ -112,26 +422,48 @@ def main():
     """
     Main training pipeline
     """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--source", choices=SOURCES, default="synthetic")
+    parser.add_argument("--path", nargs="+", default=[],
+                        help="Shard files or globs (npy / parquet sources)")
+    parser.add_argument("--rows", type=int, default=None,
+                        help="Synthetic rows (default 1000) / most rows read from the db")
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--max-samples", type=int, default=256, help="Rows per tree")
+    parser.add_argument("--contamination", type=float, default=0.1)
+    parser.add_argument("--jobs", type=int, default=-1, help="Tree-building threads (-1: all cores)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--export-only", action="store_true",
+                        help="Export the saved pickles as an mmap artifact, no training")
+    args = parser.parse_args()
+
+    if args.source in ("npy", "parquet") and not args.path:
+        parser.error(f"--source {args.source} needs --path")
+    if args.source == "synthetic" and args.rows is None:
+        args.rows = 1000
+
     print("\n" + "="*60)
     print("  DeFi Risk Engine - Model Training")
     print("="*60 + "\n")
-    
+
+    if args.export_only:
+        print("📦 Exporting saved models...")
+        ModelLoader.check_pickle_schema()
+        export_model(joblib.load(MODEL_PATH), joblib.load(SCALER_PATH))
+        return
+
     # Train
-    model, scaler = train_model()
-    
+    model, scaler = train_model(args)
+
     # Test
     test_model(model, scaler)
-    
+
     # Save
     save_models(model, scaler)
-    
+    export_model(model, scaler)
+
     print("\n✅ Training pipeline complete!")
-    print("\nℹ️ In production, this would:")
-    print("   1. Use real historical transaction data")
-    print("   2. Perform extensive feature engineering")
-    print("   3. Validate on held-out test set")
-    print("   4. Track model performance metrics")
-    print("   5. Version models for reproducibility")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()